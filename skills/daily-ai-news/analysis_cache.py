@@ -0,0 +1,116 @@
+"""分析结果缓存 - 按文章内容哈希和分析器版本记住每篇文章的分类、标签等结果，只分析新的或改动过的文章"""
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional
+
+import config
+
+# 内存中保存的结果数（超出后清空）
+MEMORY_CACHE_SIZE = 16384
+
+# 每次查询的哈希个数（SQLite 单条语句的参数个数有上限）
+_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS analysis (
+    digest TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    result TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class AnalysisCache:
+    """
+    每篇文章的分析结果
+
+    键为正文内容哈希，每条结果记录产生它的分析器版本（见 ArticleAnalyzer.version），
+    版本不一致的结果视为未命中，修改分类关键词或打分规则后旧结果自动失效。
+    默认只保存在内存中；用 AnalysisCache.load() 创建时同时持久化到 state/analysis.db，
+    跨运行、跨进程复用。
+    """
+
+    CACHE_FILE = "analysis.db"
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._memory: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._pruned_version = None
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    @classmethod
+    def load(cls) -> "AnalysisCache":
+        """数据目录下的持久化缓存；无法打开（包括数据目录不存在或只读）时退回只用内存"""
+        try:
+            return cls(config.state_path(cls.CACHE_FILE))
+        except (sqlite3.Error, OSError) as e:
+            print(f"   ⚠️  打开分析缓存失败，本次只缓存在内存中: {e}")
+            return cls()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get_many(self, version: str, digests: Iterable[str]) -> Dict[str, Dict]:
+        """查询一批内容哈希在该版本下的结果，只返回命中的"""
+        found = {}
+        missing = []
+        for digest in set(digests):
+            entry = self._memory.get(digest)
+            if entry is not None and entry[0] == version:
+                found[digest] = entry[1]
+            else:
+                missing.append(digest)
+
+        if missing and self._conn is not None:
+            loaded = {}
+            try:
+                with self._lock:
+                    for start in range(0, len(missing), _BATCH):
+                        chunk = missing[start:start + _BATCH]
+                        rows = self._conn.execute(
+                            f"SELECT digest, result FROM analysis WHERE version = ? "
+                            f"AND digest IN ({','.join('?' * len(chunk))})",
+                            [version, *chunk]
+                        ).fetchall()
+                        for digest, result in rows:
+                            loaded[digest] = json.loads(result)
+            except sqlite3.Error as e:
+                print(f"   ⚠️  读取分析缓存失败: {e}")
+            self._remember(version, loaded)
+            found.update(loaded)
+        return found
+
+    def put_many(self, version: str, results: Dict[str, Dict]):
+        """保存一批结果（同一版本）；首次写入某个版本时顺带删除其他版本的旧结果"""
+        if not results:
+            return
+        self._remember(version, results)
+        if self._conn is None:
+            return
+        try:
+            with self._lock, self._conn:
+                if self._pruned_version != version:
+                    self._conn.execute("DELETE FROM analysis WHERE version != ?", (version,))
+                    self._pruned_version = version
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO analysis (digest, version, result) VALUES (?, ?, ?)",
+                    ((digest, version, json.dumps(result, ensure_ascii=False)) for digest, result in results.items())
+                )
+        except sqlite3.Error as e:
+            print(f"   ⚠️  写入分析缓存失败: {e}")
+
+    def _remember(self, version: str, results: Dict[str, Dict]):
+        with self._lock:
+            if len(self._memory) + len(results) > MEMORY_CACHE_SIZE:
+                self._memory.clear()
+            for digest, result in results.items():
+                self._memory[digest] = (version, result)
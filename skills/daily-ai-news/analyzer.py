@@ -1,7 +1,16 @@
 """内容分析和分类模块"""
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from collections import Counter
-import re
+import metrics
+from analysis_cache import AnalysisCache
+from classifier import CategoryClassifier
+from features import HASHTAG_PATTERN, MENTION_PATTERN, URL_PATTERN, content_digest, get_extractor
+from identity import article_id
+from ranking import RankedIndex, RankingEngine
+
+# 分析规则版本；分类、置信度或标签提取的逻辑变化时递增，使缓存的分析结果失效
+# （词表和分类器权重的变化已由特征版本和分类器指纹反映）
+ANALYSIS_VERSION = 3
 
 
 class ArticleAnalyzer:
@@ -31,82 +40,121 @@ class ArticleAnalyzer:
         ]
     }
 
-    def __init__(self):
-        pass
+    # 英文词表及权重（与 CATEGORY_KEYWORDS 一起构成双语词表，CATEGORY_KEYWORDS 中的词权重为 1）
+    CATEGORY_KEYWORDS_EN = {
+        "大模型": {
+            "LLMs": 1.0, "language model": 1.0, "language models": 1.0, "foundation model": 1.0,
+            "frontier model": 1.0, "reasoning model": 1.0, "context window": 1.0, "Llama": 1.0,
+            "Mistral": 1.0, "Grok": 1.0, "OpenAI": 0.5, "Anthropic": 0.5, "chatbot": 0.5
+        },
+        "AI 绘画": {
+            "image generation": 1.0, "image generator": 1.0, "text to image": 1.0, "Imagen": 1.0,
+            "video generation": 1.0, "diffusion model": 1.0, "Sora": 0.5, "Flux": 0.5
+        },
+        "工具推荐": {
+            "tool": 1.0, "tools": 1.0, "plugin": 1.0, "extension": 1.0, "assistant": 1.0,
+            "productivity": 1.0, "Copilot": 0.5, "automation": 0.5, "app": 0.5
+        },
+        "技术分享": {
+            "tutorial": 1.0, "paper": 1.0, "research": 1.0, "researchers": 1.0, "algorithm": 1.0,
+            "architecture": 1.0, "open source": 1.0, "source code": 1.0, "fine tuning": 1.0,
+            "benchmark": 1.0, "dataset": 1.0, "training": 0.5, "deployment": 0.5
+        },
+        "行业新闻": {
+            "funding": 1.0, "raises": 1.0, "acquisition": 1.0, "acquires": 1.0, "partnership": 1.0,
+            "launches": 1.0, "announces": 1.0, "earnings": 1.0, "revenue": 1.0, "valuation": 1.0,
+            "IPO": 1.0, "layoffs": 1.0, "startup": 1.0, "stock": 0.5, "company": 0.5
+        }
+    }
 
-    def calculate_hot_score(self, tweet: Dict) -> float:
+    # 标签、提及和链接的匹配模式
+    HASHTAG_PATTERN = HASHTAG_PATTERN
+    MENTION_PATTERN = MENTION_PATTERN
+    URL_PATTERN = URL_PATTERN
+
+    def __init__(
+        self,
+        cache: Optional[AnalysisCache] = None,
+        classifier: Optional[CategoryClassifier] = None,
+        ranking: Optional[RankingEngine] = None
+    ):
         """
-        计算热度分数
-
-        热度 = 点赞数 * 1 + 转发数 * 2 + 评论数 * 1.5
+        Args:
+            cache: 分析结果缓存，默认只保存在内存中；
+                   用 AnalysisCache.load() 传入时跨运行复用，只分析新的或改动过的文章
+            classifier: 分类器，默认只用双语词表（未训练）
+            ranking: 热度计算，默认半衰期 24 小时（见 ranking.RankingEngine）
         """
-        metrics = tweet.get("metrics", {})
-        likes = metrics.get("like_count", 0)
-        retweets = metrics.get("retweet_count", 0)
-        replies = metrics.get("reply_count", 0)
-        views = metrics.get("impression_count", 0)
-
-        # 基础热度
-        score = likes * 1 + retweets * 2 + replies * 1.5
+        # 命中的词、标签等都从文章特征中读取（见 features.FeatureExtractor），
+        # 每篇文章只扫描一次，已保存的文章直接复用保存的特征
+        self.features = get_extractor()
+        self.classifier = classifier or CategoryClassifier(self.category_terms())
+        self.cache = cache if cache is not None else AnalysisCache()
+        self.ranking = ranking or RankingEngine()
+        # 热门文章的排序索引，在热进程中跨批次复用（见 get_top_n）
+        self.ranked = RankedIndex(self.ranking)
+        self.version = f"{ANALYSIS_VERSION}-{self.features.version}-{self.classifier.fingerprint()}"
+
+    @classmethod
+    def load(cls) -> "ArticleAnalyzer":
+        """使用数据目录中的持久化分析缓存和训练好的分类器（命令行和 API 使用）"""
+        return cls(AnalysisCache.load(), CategoryClassifier.load(cls.category_terms()))
+
+    @classmethod
+    def category_terms(cls) -> Dict[str, Dict[str, float]]:
+        """双语分类词表: 分类 → {词: 权重}"""
+        return {
+            category: {**dict.fromkeys(keywords, 1.0), **cls.CATEGORY_KEYWORDS_EN.get(category, {})}
+            for category, keywords in cls.CATEGORY_KEYWORDS.items()
+        }
 
-        # 如果有浏览量，加入计算（可选）
-        if views > 0:
-            score += (views * 0.001)
+    def calculate_hot_score(self, tweet: Dict) -> float:
+        """
+        计算热度分数（以文章自身的发布时间为参考时间，即未衰减的热度；批量计算见 analyze_batch）
 
-        return score
+        信号: 同时报道的来源数、分类置信度、AI 相关强度、互动数、来源权重，见 ranking.RankingEngine
+        """
+        return self.ranking.score_batch([tweet])[0]
 
     def categorize(self, tweet: Dict) -> Tuple[str, float]:
         """
-        对博文进行分类
+        对博文进行分类（批量分类见 categorize_batch）
 
         Returns:
             (分类名称, 置信度)
         """
-        text = tweet.get("text", "").lower()
-        scores = {}
-
-        for category, keywords in self.CATEGORY_KEYWORDS.items():
-            score = 0
-            for kw in keywords:
-                if kw.lower() in text:
-                    score += 1
-            scores[category] = score
-
-        # 找到分数最高的分类
-        max_score = max(scores.values())
-        if max_score > 0:
-            for category, score in scores.items():
-                if score == max_score:
-                    # 简单的置信度计算
-                    confidence = min(score / len(self.CATEGORY_KEYWORDS[category]) * 2, 1)
-                    return category, confidence
-
-        # 默认分类
-        return "其他", 0
+        category, confidence, _ = self.categorize_batch([tweet])[0]
+        return category, confidence
+
+    def categorize_batch(self, tweets: List[Dict]) -> List[Tuple[str, float, List[str]]]:
+        """
+        批量分类：所有文章一次打分（见 classifier.CategoryClassifier）
+
+        Returns:
+            每篇的 (主分类, 置信度, 所有达到阈值的分类)；置信度为校准后的概率
+        """
+        return self.classifier.classify([self.features.for_article(tweet).terms for tweet in tweets])
 
     def extract_tags(self, tweet: Dict) -> List[str]:
         """提取话题标签"""
-        text = tweet.get("text", "")
-        # 匹配 #hashtag 格式
-        hashtags = re.findall(r'#(\w+)', text)
-        return hashtags
+        # #hashtag 格式
+        return list(self.features.for_article(tweet).tags)
 
     def extract_mentions(self, tweet: Dict) -> List[str]:
         """提取 @提及"""
-        text = tweet.get("text", "")
-        mentions = re.findall(r'@(\w+)', text)
-        return mentions
+        return list(self.features.for_article(tweet).mentions)
 
     def extract_urls(self, tweet: Dict) -> List[str]:
         """提取链接"""
-        text = tweet.get("text", "")
-        urls = re.findall(r'https?://[^\s]+', text)
-        return urls
+        return list(self.features.for_article(tweet).urls)
 
-    def analyze_batch(self, tweets: List[Dict]) -> Dict:
+    def analyze_batch(self, tweets: List[Dict], now: Optional[float] = None) -> Dict:
         """
         批量分析博文
 
+        Args:
+            now: 热度的参考时间（Unix 时间戳），默认为这批文章中最新的发布时间
+
         Returns:
             {
                 "tweets": 分析后的博文列表,
@@ -114,29 +162,63 @@ class ArticleAnalyzer:
                 "top_tweets": 热门博文
             }
         """
+        with metrics.span("analyze", count=len(tweets)):
+            return self._analyze_batch(tweets, now)
+
+    def _analyze_batch(self, tweets: List[Dict], now: Optional[float] = None) -> Dict:
+        """批量分析博文（实际实现）"""
         analyzed_tweets = []
         category_count = Counter()
         total_hot_score = 0
 
-        for tweet in tweets:
-            # 计算热度
-            hot_score = self.calculate_hot_score(tweet)
-            tweet["hot_score"] = hot_score
-            total_hot_score += hot_score
+        # 分类和标签只取决于正文，按内容哈希取缓存的结果，只分析新的或改动过的文章
+        digests = [content_digest(tweet.get("text", "")) for tweet in tweets]
+        cached = self.cache.get_many(self.version, digests)
+        metrics.incr("analysis_cached", len(cached))
+
+        # 未命中的文章一次批量分类
+        pending = {}
+        for tweet, digest in zip(tweets, digests):
+            if digest not in cached:
+                pending.setdefault(digest, tweet)
+        fresh = {}
+        for (digest, tweet), (category, confidence, labels) in zip(
+                pending.items(), self.categorize_batch(list(pending.values()))):
+            fresh[digest] = {
+                "category": category,
+                "category_confidence": confidence,
+                "categories": labels,
+                "relevance": self.features.for_article(tweet).relevance,
+                "tags": self.extract_tags(tweet),
+                "mentions": self.extract_mentions(tweet),
+                "urls": self.extract_urls(tweet)
+            }
 
-            # 分类
-            category, confidence = self.categorize(tweet)
-            tweet["category"] = category
-            tweet["category_confidence"] = confidence
-            category_count[category] += 1
+        for tweet, digest in zip(tweets, digests):
+            result = cached.get(digest) or fresh[digest]
 
-            # 提取标签等
-            tweet["tags"] = self.extract_tags(tweet)
-            tweet["mentions"] = self.extract_mentions(tweet)
-            tweet["urls"] = self.extract_urls(tweet)
+            # 分类（主分类和所有达到阈值的分类）及 AI 相关强度
+            tweet["category"] = result["category"]
+            tweet["category_confidence"] = result["category_confidence"]
+            tweet["categories"] = list(result["categories"])
+            tweet["relevance"] = result["relevance"]
+            category_count[result["category"]] += 1
+
+            # 标签等（复制一份，同一正文的文章不共用列表）
+            tweet["tags"] = list(result["tags"])
+            tweet["mentions"] = list(result["mentions"])
+            tweet["urls"] = list(result["urls"])
 
             analyzed_tweets.append(tweet)
 
+        metrics.incr("analysis_missed", len(fresh))
+        self.cache.put_many(self.version, fresh)
+
+        # 热度取决于发布时间、同一报道的来源数和来源权重等，每次整批重新计算
+        for tweet, hot_score in zip(analyzed_tweets, self.ranking.score_batch(analyzed_tweets, now)):
+            tweet["hot_score"] = hot_score
+            total_hot_score += hot_score
+
         # 按热度排序
         analyzed_tweets.sort(key=lambda x: x.get("hot_score", 0), reverse=True)
 
@@ -169,8 +251,21 @@ class ArticleAnalyzer:
         }
 
     def get_top_n(self, analyzed: Dict, n: int = 50) -> List[Dict]:
-        """获取前 N 条热门博文"""
-        return analyzed["tweets"][:n]
+        """
+        获取前 N 条热门博文
+
+        经 ranking.RankedIndex 取前 N 篇：同一分析器再次处理同一批文章（如热进程中重复生成页面）时，
+        只有新增或排序信号变化的文章重新计算排序键。没有 ID 的文章按链接补上 ID（与 store.ArticleStore 相同）。
+        """
+        tweets = analyzed["tweets"]
+        for tweet in tweets:
+            if not tweet.get("id") and tweet.get("url"):
+                tweet["id"] = article_id(tweet["url"])
+        batch = {tweet.get("id"): tweet for tweet in tweets}
+        self.ranked.update(tweets)
+        top = self.ranked.top(n, predicate=lambda article: article["id"] in batch)
+        # 返回本批的文章（索引中可能是之前批次里排序信号相同的旧对象）
+        return [batch[article["id"]] for article, _ in top]
 
 
 if __name__ == "__main__":
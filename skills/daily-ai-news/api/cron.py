@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Vercel 定时任务 - 每日更新数据
+Vercel 定时任务 - 每小时触发，只抓取到期的源
 """
 import os
 import json
@@ -11,39 +11,125 @@ from datetime import datetime
 # 添加项目根目录到 Python 路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.fetcher import TechNewsFetcher
-from utils.analyzer import ArticleAnalyzer
+# 冷启动只加载轻量模块；没有到期的源时不需要导入抓取和分析相关模块
+import metrics
+import profiling
+from components import shared
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def handler(request):
-    """定时任务处理函数"""
+    """
+    定时任务处理函数
+
+    ?force=1 时忽略调度，抓取全部源；
+    ?profile=1 或 DAILY_AI_NEWS_PROFILE=1 时开启剖析
+    """
+    query = getattr(request, 'query', None) or {}
+    force = query.get('force', '') in ('1', 'true')
+    with metrics.run() as run_metrics:
+        if profiling.is_enabled(query):
+            from utils.fetcher import TechNewsFetcher
+            from utils.analyzer import ArticleAnalyzer
+
+            with profiling.profile_run('cron', stages=[TechNewsFetcher, ArticleAnalyzer]) as profile:
+                response = _run(run_metrics, force)
+            response.setdefault('headers', {})['X-Profile-Path'] = profile.summary_path
+            logger.info(f"剖析结果已写入: {profile.prof_path}")
+            return response
+        return _run(run_metrics, force)
+
+
+def _run(run_metrics, force=False):
+    """执行更新任务，响应中附带本次运行的指标报告"""
     try:
-        logger.info("开始执行每日更新任务")
+        logger.info("开始执行定时更新任务")
+
+        from utils.fetcher import TechNewsFetcher
+        from scheduler import PollScheduler
+        from resilience import SourceHealth
+
+        # 抓取器（含 HTTP 连接池和熔断状态）在热进程中复用，见 components.Components
+        components = shared()
+        fetcher = components.get('fetcher.persistent', lambda: TechNewsFetcher(health=SourceHealth.load()))
+        scheduler = PollScheduler.load(fetcher.rss_sources)
+        sources = fetcher.rss_sources if force else scheduler.due()
+
+        if not sources:
+            next_due = scheduler.next_due()
+            logger.info("没有到期的源")
+            return {
+                'statusCode': 200,
+                'body': json.dumps({
+                    'success': True,
+                    'message': 'No sources due',
+                    'next_due': next_due.isoformat() if next_due else None,
+                    'metrics': run_metrics.to_dict(),
+                    'timestamp': datetime.utcnow().isoformat()
+                }, ensure_ascii=False)
+            }
+
+        from utils.analyzer import ArticleAnalyzer
+        from dedup import StoryDeduplicator
+        from enrichment import EngagementEnricher
+        from ingest import IngestIndex
+
+        # 增量抓取：已摄取的条目按 GUID 一次查找即可跳过，未更新的源直接返回 304
+        index = IngestIndex.load()
+        results = {}
+        articles = fetcher.fetch(use_rss=True, index=index, sources=sources, results=results)
+        scheduler.record(results)
+        polled = [s['name'] for s in sources]
+        metrics.incr('sources_polled', len(polled))
+
+        # 合并多个来源的同一报道：新文章与当天已保存的文章一起去重，之前保存的报道被其他来源再次报道时
+        # 并入已保存的那篇；只写回新的报道和来源有变化的已保存文章
+        saved = fetcher.load_from_file() or []
+        saved_sizes = {a.get('id'): a.get('cluster_size', 1) for a in saved}
+        merged = components.get('deduplicator', StoryDeduplicator).dedupe(saved + articles) if articles else saved
+        articles = [
+            a for a in merged
+            if a.get('id') not in saved_sizes or a.get('cluster_size', 1) != saved_sizes[a.get('id')]
+        ]
 
-        # 抓取最新数据
-        fetcher = TechNewsFetcher()
-        articles = fetcher.fetch(use_rss=True)
+        # 补全讨论站点的互动数据（限时，超出预算的留到下次）：新的和有变化的文章排在前面先查询，
+        # 当天其余已保存的文章也重新查询（结果缓存 CACHE_TTL，每篇约每小时一次），只写回互动数据有变化的
+        changed_ids = {a.get('id') for a in articles}
+        rest = [a for a in merged if a.get('id') not in changed_ids]
+        previous = [dict(a.get('metrics') or {}) for a in rest]
+        enricher = components.get('enricher', EngagementEnricher.load)
+        enricher.enrich(articles + rest)
+        refreshed = [a for a, before in zip(rest, previous) if a.get('id') and (a.get('metrics') or {}) != before]
+        metrics.incr('articles_refreshed', len(refreshed))
+        articles += refreshed
 
         if not articles:
+            index.save()
+            scheduler.save()
+            enricher.save()
             logger.warning("未抓取到新文章")
             return {
                 'statusCode': 200,
                 'body': json.dumps({
                     'success': False,
                     'message': 'No articles fetched',
+                    'sources': polled,
+                    'metrics': run_metrics.to_dict(),
                     'timestamp': datetime.utcnow().isoformat()
-                })
+                }, ensure_ascii=False)
             }
 
         # 分析数据
-        analyzer = ArticleAnalyzer()
+        analyzer = components.get('analyzer', ArticleAnalyzer.load)
         result = analyzer.analyze_batch(articles)
 
-        # 保存数据到缓存（如果需要）
-        # 这里可以添加缓存逻辑
+        # 保存新文章后再写回摄取索引，避免中途失败时丢失未保存的条目
+        fetcher.save_to_file(result['tweets'])
+        index.save()
+        scheduler.save()
+        enricher.save()
 
         logger.info(f"成功更新 {len(result['tweets'])} 篇文章")
 
@@ -51,11 +137,14 @@ def handler(request):
             'statusCode': 200,
             'body': json.dumps({
                 'success': True,
-                'message': 'Daily update completed',
+                'message': 'Update completed',
                 'count': len(result['tweets']),
+                'refreshed': len(refreshed),
+                'sources': polled,
                 'stats': result['stats'],
+                'metrics': run_metrics.to_dict(),
                 'timestamp': datetime.utcnow().isoformat()
-            })
+            }, ensure_ascii=False)
         }
 
     except Exception as e:
@@ -65,6 +154,7 @@ def handler(request):
             'body': json.dumps({
                 'success': False,
                 'error': str(e),
+                'metrics': run_metrics.to_dict(),
                 'timestamp': datetime.utcnow().isoformat()
-            })
+            }, ensure_ascii=False)
         }
\ No newline at end of file
@@ -6,65 +6,247 @@ import os
 import json
 import sys
 import logging
-from datetime import datetime
-from urllib.parse import unquote
 
 # 添加项目根目录到 Python 路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.fetcher import TechNewsFetcher
-from utils.analyzer import ArticleAnalyzer
+# 冷启动只加载轻量模块，抓取/分析相关模块在处理请求时按需导入
+import profiling
+from components import shared
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def handler(request):
-    """Vercel 请求处理函数"""
+    """Vercel 请求处理函数（?profile=1 或 DAILY_AI_NEWS_PROFILE=1 时开启剖析）"""
+    if profiling.is_enabled(getattr(request, 'query', None)):
+        from utils.fetcher import TechNewsFetcher
+        from utils.analyzer import ArticleAnalyzer
+
+        with profiling.profile_run('fetch-data', stages=[TechNewsFetcher, ArticleAnalyzer]) as profile:
+            response = _handle(request)
+        response.setdefault('headers', {})['X-Profile-Path'] = profile.summary_path
+        logger.info(f"剖析结果已写入: {profile.prof_path}")
+        return response
+    return _handle(request)
+
+
+def _fetch_live(components, use_rss):
+    """实时抓取，合并多个来源的同一报道，并补全讨论站点的互动数据（限时，见 enrichment.EngagementEnricher）"""
+    from utils.fetcher import TechNewsFetcher
+    from dedup import StoryDeduplicator
+
+    articles = components.get('fetcher', TechNewsFetcher).fetch(use_rss=use_rss)
+    if not articles:
+        return articles
+    articles = components.get('deduplicator', StoryDeduplicator).dedupe(articles)
+    if use_rss:
+        from enrichment import EngagementEnricher
+
+        enricher = components.get('enricher', EngagementEnricher.load)
+        enricher.enrich(articles)
+        enricher.save()
+    return articles
+
+
+def _header(request, name):
+    """读取请求头（不区分大小写）"""
+    headers = getattr(request, 'headers', None) or {}
+    value = headers.get(name)
+    if value is None:
+        lowered = name.lower()
+        value = next((v for k, v in headers.items() if k.lower() == lowered), '')
+    return value or ''
+
+
+# 出现任一参数时按条件查询已保存的全部文章（而不是返回当天的快照）
+QUERY_PARAMS = ('fields', 'since', 'until', 'source', 'category', 'cursor', 'sort')
+
+
+def _split(value):
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+def _query_articles(request, query, store):
+    """
+    按条件查询已保存的文章（跨日期索引，见 store.ArticleIndex）
+
+    参数: fields=id,title,... / since=2026-02-01 / until=2026-02-11 / source=A,B /
+          category=大模型 / cursor=上一页返回的 next_cursor / limit=50 /
+          sort=time（按发布时间，默认）或 hot（按当前热度取前 limit 篇，不分页）
+    """
+    import hashlib
+    import time
+    from dates import parse_query_time
+    from records import json_default
+    from ranking import BUCKET_SECONDS
+    from store import public_article
+
+    try:
+        since = parse_query_time(query['since']) if query.get('since') else None
+        until = parse_query_time(query['until'], end_of_day=True) if query.get('until') else None
+        limit = int(query.get('limit', 50))
+    except ValueError as e:
+        return _bad_request(f'参数无效: {e}')
+    fields = _split(query.get('fields'))
+    sources = _split(query.get('source'))
+    categories = _split(query.get('category'))
+    cursor = query.get('cursor') or None
+    sort = query.get('sort') or 'time'
+    if sort not in ('time', 'hot'):
+        return _bad_request(f'sort 只能是 time 或 hot: {sort}')
+    if sort == 'hot' and cursor:
+        return _bad_request('sort=hot 不支持 cursor')
+
+    index = store.index()
+    now = None
+    if sort == 'hot':
+        # 热度以当前时间桶的起点为参考时间，同一小时内的响应（及 ETag）保持不变；
+        # 数据都早于此时（如只有存档）以最新文章的发布时间为准，与快照中的热度一致
+        now = (time.time() // BUCKET_SECONDS) * BUCKET_SECONDS
+        latest = store.ranked().latest()
+        if latest is not None:
+            now = min(now, latest)
+    canonical = json.dumps([
+        query.get('since', ''), query.get('until', ''), sorted(sources), sorted(categories),
+        sorted(fields), cursor, limit, sort, now
+    ], ensure_ascii=False)
+    etag = f'"{index.version}-{hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).hexdigest()}"'
+    headers = {
+        'Content-Type': 'application/json',
+        'Access-Control-Allow-Origin': '*',
+        'Access-Control-Allow-Methods': 'GET, POST',
+        'Cache-Control': 'public, max-age=3600',
+        'ETag': etag,
+        'X-Data-Source': 'index'
+    }
+    if etag in [tag.strip() for tag in _header(request, 'If-None-Match').split(',')]:
+        return {'statusCode': 304, 'headers': headers, 'body': ''}
+
+    if sort == 'hot':
+        articles, next_cursor = _top_articles(store, now, since, until, sources, categories, limit), None
+    else:
+        try:
+            articles, next_cursor = index.query(since, until, sources, categories, cursor, limit)
+        except ValueError as e:
+            return _bad_request(str(e))
+        articles = [public_article(article) for article in articles]
+    if fields:
+        keep = set(fields) | {'id'}
+        articles = [{k: v for k, v in article.items() if k in keep} for article in articles]
+
+    logger.info(f"查询返回 {len(articles)} 篇文章（索引共 {len(index)} 篇）")
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': json.dumps({
+            'success': True,
+            'data': {'articles': articles, 'next_cursor': next_cursor},
+            'count': len(articles)
+        }, ensure_ascii=False, default=json_default)
+    }
+
+
+def _top_articles(store, now, since, until, sources, categories, limit):
+    """时间窗口内当前热度最高的文章（按时间分桶的排序索引，见 ranking.RankedIndex）"""
+    from store import MAX_PAGE_SIZE, public_article
+
+    sources, categories = set(sources), set(categories)
+
+    def matches(article):
+        return (not sources or article.get('source') in sources) and \
+            (not categories or article.get('category') in categories)
+
+    top = store.ranked().top(
+        max(1, min(limit, MAX_PAGE_SIZE)), now=now,
+        since=since.timestamp() if since else None, until=until.timestamp() if until else None,
+        predicate=matches if sources or categories else None
+    )
+    return [{**public_article(article), 'hot_score': score} for article, score in top]
+
+
+def _bad_request(message):
+    return {
+        'statusCode': 400,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps({'success': False, 'error': message}, ensure_ascii=False)
+    }
+
+
+def _handle(request):
+    """处理数据抓取请求"""
     try:
         # 解析查询参数
         query = request.query
         use_rss = query.get('use_rss', 'true').lower() == 'true'
-        limit = int(query.get('limit', 50))
+        refresh = query.get('refresh', '') in ('1', 'true')
+        try:
+            limit = int(query.get('limit', 50))
+        except ValueError:
+            return _bad_request(f"limit 必须是整数: {query.get('limit')}")
+        if limit < 1:
+            return _bad_request(f"limit 必须是正整数: {limit}")
+
+        logger.info(f"开始抓取数据，use_rss={use_rss}, refresh={refresh}, limit={limit}")
 
-        logger.info(f"开始抓取数据，use_rss={use_rss}, limit={limit}")
+        from utils.analyzer import ArticleAnalyzer
+        from store import ArticleStore, Snapshot
 
-        # 抓取数据
-        fetcher = TechNewsFetcher()
-        articles = fetcher.fetch(use_rss=(use_rss == 'true'))
+        # 抓取器、分析器、快照存储等在热进程中复用，见 components.Components
+        components = shared()
+        analyzer = components.get('analyzer', ArticleAnalyzer.load)
+        store = components.get('store', lambda: ArticleStore(analyzer))
 
-        if not articles:
+        if any(name in query for name in QUERY_PARAMS):
+            return _query_articles(request, query, store)
+
+        # 优先使用定时任务保存的当天数据的快照；没有数据或 ?refresh=1 时才实时抓取（此时才导入 requests/bs4）
+        snapshot = store.snapshot() if use_rss and not refresh else None
+        data_source = 'saved'
+        if snapshot is None:
+            articles = _fetch_live(components, use_rss)
+            data_source = 'live'
+            if not articles:
+                return {
+                    'statusCode': 404,
+                    'headers': {'Content-Type': 'application/json'},
+                    'body': json.dumps({'error': 'No articles found'})
+                }
+            snapshot = Snapshot.from_articles(articles, analyzer)
+        elif not snapshot.articles:
             return {
                 'statusCode': 404,
                 'headers': {'Content-Type': 'application/json'},
                 'body': json.dumps({'error': 'No articles found'})
             }
 
-        # 分析数据
-        analyzer = ArticleAnalyzer()
-        result = analyzer.analyze_batch(articles)
+        compressed = 'gzip' in _header(request, 'Accept-Encoding').lower()
+        headers = {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'GET, POST',
+            'Cache-Control': 'public, max-age=3600',
+            'ETag': snapshot.etag(limit, compressed),
+            'Vary': 'Accept-Encoding',
+            'X-Data-Source': data_source
+        }
+
+        # 数据未变化：客户端缓存仍然有效
+        if snapshot.matches(_header(request, 'If-None-Match'), limit):
+            return {'statusCode': 304, 'headers': headers, 'body': ''}
 
-        # 返回结果
+        # 返回结果（序列化和压缩结果按 limit 缓存在快照中）
         response = {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET, POST',
-                'Cache-Control': 'public, max-age=3600'
-            },
-            'body': json.dumps({
-                'success': True,
-                'data': {
-                    'articles': result['tweets'][:limit],
-                    'stats': result['stats'],
-                    'timestamp': datetime.utcnow().isoformat()
-                },
-                'count': len(result['tweets'])
-            }, ensure_ascii=False)
+            'headers': headers,
+            'body': snapshot.body(limit, compressed)
         }
+        if compressed:
+            headers['Content-Encoding'] = 'gzip'
+            response['isBase64Encoded'] = True
 
-        logger.info(f"成功抓取 {len(response['body'])} 篇文章")
+        logger.info(f"成功返回 {min(limit, len(snapshot.articles))} 篇文章（{data_source}）")
         return response
 
     except Exception as e:
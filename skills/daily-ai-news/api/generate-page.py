@@ -3,7 +3,6 @@
 Vercel API - 页面生成端点
 """
 import os
-import json
 import sys
 import logging
 from datetime import datetime
@@ -11,61 +10,100 @@ from datetime import datetime
 # 添加项目根目录到 Python 路径
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.fetcher import TechNewsFetcher
-from utils.analyzer import ArticleAnalyzer
-from utils.renderer import WebRenderer
+# 冷启动只加载轻量模块，抓取/分析/渲染相关模块（含 Jinja2）在处理请求时按需导入
+import profiling
+from components import shared
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def handler(request):
-    """Vercel 请求处理函数"""
+    """Vercel 请求处理函数（?profile=1 或 DAILY_AI_NEWS_PROFILE=1 时开启剖析）"""
+    if profiling.is_enabled(getattr(request, 'query', None)):
+        from utils.fetcher import TechNewsFetcher
+        from utils.analyzer import ArticleAnalyzer
+        from utils.renderer import WebRenderer
+
+        with profiling.profile_run('generate-page', stages=[TechNewsFetcher, ArticleAnalyzer, WebRenderer]) as profile:
+            response = _handle(request)
+        response.setdefault('headers', {})['X-Profile-Path'] = profile.summary_path
+        logger.info(f"剖析结果已写入: {profile.prof_path}")
+        return response
+    return _handle(request)
+
+
+def _fetch_live(components, date, use_rss):
+    """实时抓取，合并多个来源的同一报道，并补全讨论站点的互动数据（限时，见 enrichment.EngagementEnricher）"""
+    from utils.fetcher import TechNewsFetcher
+    from dedup import StoryDeduplicator
+
+    articles = components.get('fetcher', TechNewsFetcher).fetch(date=date, use_rss=use_rss)
+    if not articles:
+        return articles
+    articles = components.get('deduplicator', StoryDeduplicator).dedupe(articles)
+    if use_rss:
+        from enrichment import EngagementEnricher
+
+        enricher = components.get('enricher', EngagementEnricher.load)
+        enricher.enrich(articles)
+        enricher.save()
+    return articles
+
+
+def _handle(request):
+    """处理页面生成请求"""
     try:
         # 解析查询参数
         query = request.query
         use_rss = query.get('use_rss', 'true').lower() == 'true'
+        refresh = query.get('refresh', '') in ('1', 'true')
         limit = int(query.get('limit', 50))
         date = query.get('date')
 
-        logger.info(f"开始生成页面，use_rss={use_rss}, limit={limit}")
+        logger.info(f"开始生成页面，use_rss={use_rss}, refresh={refresh}, limit={limit}")
 
         # 处理日期
         if date:
-            from datetime import datetime
             target_date = datetime.strptime(date, '%Y-%m-%d')
         else:
             target_date = datetime.now()
 
-        # 抓取数据
-        fetcher = TechNewsFetcher()
-        articles = fetcher.fetch(date=target_date, use_rss=(use_rss == 'true'))
+        from utils.fetcher import TechNewsFetcher
+        from utils.analyzer import ArticleAnalyzer
+        from utils.renderer import WebRenderer
+
+        # 优先读取定时任务保存的数据；没有数据或 ?refresh=1 时才实时抓取（此时才导入 requests/bs4）
+        # 抓取器、分析器、渲染器（含 Jinja2 模板缓存）在热进程中复用，见 components.Components
+        components = shared()
+
+        articles = TechNewsFetcher.load_from_file(target_date) if use_rss and not refresh else None
+        if articles is None:
+            articles = _fetch_live(components, target_date, use_rss)
+        elif articles:
+            # 已保存的数据可能来自多次增量抓取，再合并一次同一报道（已合并的来源保留）
+            from dedup import StoryDeduplicator
+
+            articles = components.get('deduplicator', StoryDeduplicator).dedupe(articles)
 
         if not articles:
             # 返回默认页面
             return generate_error_page()
 
         # 分析数据
-        analyzer = ArticleAnalyzer()
+        analyzer = components.get('analyzer', ArticleAnalyzer.load)
         result = analyzer.analyze_batch(articles)
         top_articles = analyzer.get_top_n(result, limit)
 
         # 渲染页面
-        renderer = WebRenderer()
-        output_path = f"/tmp/output-{datetime.now().strftime('%Y%m%d-%H%M%S')}.html"
-
-        renderer.render(
+        renderer = components.get('renderer', WebRenderer)
+        html_content = renderer.render_html(
             tweets=top_articles,
             stats=result["stats"],
-            output_path=output_path,
             date=target_date,
             title="每日 AI 速递"
         )
 
-        # 读取生成的 HTML
-        with open(output_path, 'r', encoding='utf-8') as f:
-            html_content = f.read()
-
         # 返回 HTML
         response = {
             'statusCode': 200,
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Vercel API - 全文检索端点
+"""
+import os
+import json
+import sys
+import time
+import logging
+
+# 添加项目根目录到 Python 路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 冷启动只加载轻量模块，检索索引在处理请求时按需打开
+import profiling
+from components import shared
+
+# 配置日志
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def handler(request):
+    """Vercel 请求处理函数（?profile=1 或 DAILY_AI_NEWS_PROFILE=1 时开启剖析）"""
+    if profiling.is_enabled(getattr(request, 'query', None)):
+        with profiling.profile_run('search') as profile:
+            response = _handle(request)
+        response.setdefault('headers', {})['X-Profile-Path'] = profile.summary_path
+        logger.info(f"剖析结果已写入: {profile.prof_path}")
+        return response
+    return _handle(request)
+
+
+def _open_index():
+    """打开检索索引；数据目录中已有存档但还没有索引时先建立一次"""
+    from fulltext import SearchIndex
+
+    index = SearchIndex.open()
+    if not len(index):
+        count = index.rebuild()
+        logger.info(f"已从存档建立检索索引，共 {count} 篇文章")
+    return index
+
+
+def _handle(request):
+    """
+    处理检索请求
+
+    参数: q=查询文本（必填）/ limit=20 / source=A,B
+    """
+    try:
+        query = request.query
+        text = query.get('q', '').strip()
+        if not text:
+            return _error(400, '缺少查询参数 q')
+        try:
+            limit = int(query.get('limit', 20))
+        except ValueError:
+            return _error(400, f"limit 必须是整数: {query.get('limit')}")
+        sources = [s.strip() for s in query.get('source', '').split(',') if s.strip()]
+
+        # 索引连接在热进程中复用，见 components.Components
+        index = shared().get('search', _open_index)
+
+        started = time.perf_counter()
+        results = index.search(text, limit=limit, sources=sources)
+        took_ms = round((time.perf_counter() - started) * 1000, 2)
+        logger.info(f"检索 {text!r} 命中 {len(results)} 篇，耗时 {took_ms} ms")
+
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'GET',
+                'Cache-Control': 'public, max-age=300'
+            },
+            'body': json.dumps({
+                'success': True,
+                'data': {
+                    'query': text,
+                    'results': results,
+                    'took_ms': took_ms
+                },
+                'count': len(results)
+            }, ensure_ascii=False)
+        }
+
+    except Exception as e:
+        logger.error(f"检索失败: {str(e)}")
+        return _error(500, str(e))
+
+
+def _error(status, message):
+    return {
+        'statusCode': status,
+        'headers': {'Content-Type': 'application/json'},
+        'body': json.dumps({'success': False, 'error': message}, ensure_ascii=False)
+    }
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""相关性基准 - 对比旧的子串匹配与 relevance.RelevanceScorer 的准确率和单条耗时"""
+import argparse
+import glob
+import json
+import os
+import sys
+from typing import Callable, Dict, List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from bs4 import BeautifulSoup
+
+from corpus import CorpusGenerator, CorpusProfile
+from fetcher import TechNewsFetcher
+from relevance import RelevanceScorer
+from run_bench import measure
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+# 录制源中的非 AI 条目（其余条目都来自 AI 频道，视为 AI 相关）
+FIXTURE_NON_AI = {
+    "The Download: helping cancer survivors to give birth, and cleaning up Bangladesh’s garment industry",
+    "How one city is rethinking its flood defenses",
+    "The race to build a cheaper battery for grid storage",
+    "Inside the effort to map every tree in the Amazon",
+    "Why measles cases keep rising",
+}
+
+# 改为分词打分之前 _is_ai_related 使用的关键词（小写后做子串匹配）
+LEGACY_KEYWORDS = [
+    "ai", "artificial intelligence", "人工智能", "machine learning", "机器学习",
+    "deep learning", "深度学习", "neural network", "神经网络", "llm", "gpt",
+    "claude", "chatgpt", "openai", "google deepmind", "gemini", "copilot",
+    "midjourney", "stable diffusion", "diffusion model", "transformer",
+    "generative", "生成式", "reinforcement learning", "强化学习",
+    "computer vision", "nlp", "natural language processing", "robotics",
+    "autonomous", "automation", "智能", "大模型", "agentic", "多模态"
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="每日 AI 速递 - AI 相关性过滤基准")
+    parser.add_argument("--repeat", type=int, default=5, help="计时重复次数，默认: 5")
+    parser.add_argument("--synthetic", type=int, default=5000, help="合成条目数，0 表示跳过，默认: 5000")
+    parser.add_argument("--output", type=str, default=None, help="结果 JSON 输出路径")
+    return parser.parse_args()
+
+
+def legacy_is_ai(text: str) -> bool:
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in LEGACY_KEYWORDS)
+
+
+def labeled_cases(fetcher: TechNewsFetcher) -> List[Tuple[str, bool]]:
+    """人工标注的难例（fixtures/relevance.json）加上录制源中的条目"""
+    with open(os.path.join(FIXTURES_DIR, "relevance.json"), "r", encoding="utf-8") as f:
+        cases = [(case["text"], case["ai"]) for case in json.load(f)]
+
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.xml"))):
+        with open(path, "rb") as f:
+            soup = BeautifulSoup(f.read(), "xml")
+        for item in fetcher._find_items(soup):
+            title = item.find("title").get_text(strip=True)
+            description = item.find("description") or item.find("summary") or item.find("content")
+            text = fetcher._clean_description(description.get_text()) if description else ""
+            cases.append((f"{title} {text}", title not in FIXTURE_NON_AI))
+    return cases
+
+
+def synthetic_cases(count: int) -> List[Tuple[str, bool]]:
+    """合成语料（约 30% 非 AI，非 AI 条目只使用不含 AI 相关词的词汇）"""
+    generator = CorpusGenerator(CorpusProfile.from_data_dir())
+    return [(f"{a['title']} {a['description']}", a["ai"]) for a in generator.articles(count)]
+
+
+def evaluate(predict: Callable[[str], bool], cases: List[Tuple[str, bool]], repeat: int) -> Dict:
+    predictions = [predict(text) for text, _ in cases]
+    tp = sum(1 for p, (_, label) in zip(predictions, cases) if p and label)
+    fp = sum(1 for p, (_, label) in zip(predictions, cases) if p and not label)
+    fn = sum(1 for p, (_, label) in zip(predictions, cases) if not p and label)
+    timing = measure(lambda: [predict(text) for text, _ in cases], repeat, items=len(cases))
+    return {
+        "precision": round(tp / (tp + fp), 3) if tp + fp else 0.0,
+        "recall": round(tp / (tp + fn), 3) if tp + fn else 0.0,
+        "passed": tp + fp,
+        "false_positives": fp,
+        "per_item_us": timing["per_item_us"]
+    }
+
+
+def downstream_cost(cases: List[Tuple[str, bool]], predict: Callable[[str], bool], repeat: int) -> float:
+    """通过过滤的条目在翻译阶段的耗时（毫秒，每次使用新的抓取器，不命中翻译缓存）"""
+    passed = [text for text, _ in cases if predict(text)]
+    timing = measure(
+        lambda fetcher: [fetcher._translate(text[:80], text) for text in passed], repeat,
+        setup=TechNewsFetcher
+    )
+    return timing["median_ms"]
+
+
+def main():
+    args = parse_args()
+    scorer = RelevanceScorer()
+    filters = {"substring": legacy_is_ai, "scorer": scorer.is_relevant}
+
+    print("🎯 AI 相关性过滤基准")
+    print("=" * 50)
+
+    datasets = {"labeled": labeled_cases(TechNewsFetcher())}
+    if args.synthetic:
+        datasets["synthetic"] = synthetic_cases(args.synthetic)
+
+    results = {}
+    for name, cases in datasets.items():
+        print(f"\n📊 {name}（{len(cases)} 条，其中 AI 相关 {sum(1 for _, label in cases if label)} 条）")
+        results[name] = {}
+        for filter_name, predict in filters.items():
+            result = evaluate(predict, cases, args.repeat)
+            result["downstream_translate_ms"] = downstream_cost(cases, predict, args.repeat)
+            results[name][filter_name] = result
+            print(f"   {filter_name:<10} 精确率 {result['precision']:.3f}  召回率 {result['recall']:.3f}"
+                  f"  通过 {result['passed']:>5}（误报 {result['false_positives']}）"
+                  f"  {result['per_item_us']:>7.2f} µs/条  下游翻译 {result['downstream_translate_ms']:.1f} ms")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 结果已写入: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
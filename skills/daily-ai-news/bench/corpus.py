@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""合成语料生成器 - 按真实数据的分布生成任意规模的 RSS 源和文章 JSON"""
+import argparse
+import html
+import json
+import os
+import random
+import re
+import sys
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from analyzer import ArticleAnalyzer
+from journal import ArticleJournal, dates
+from relevance import RelevanceScorer, tokenize
+
+# 当前每日文章量（data/articles_2026-02-11.json）
+BASELINE_DAILY = 16
+
+# 原始数据被截断为 500 字符，真实描述更长；按该倍数放大描述长度
+DESCRIPTION_EXPANSION = 3
+
+# 综合源中非 AI 条目的比例
+NON_AI_RATIO = 0.3
+
+# HTML 结构出现的概率（参照录制源）
+HTML_PATTERNS = {
+    "link": 0.35,        # 专有名词包在 <a> 中
+    "figure": 0.5,       # 段首配图
+    "entity": 0.6,       # 撇号、引号写成 &#8217; / &#8220;
+    "footer": 0.3,       # "The post ... appeared first on ..." 尾注
+}
+
+NON_AI_TOPICS = [
+    "city council", "flood defenses", "battery storage", "vaccination rates", "rainforest",
+    "housing market", "shipping routes", "solar farms", "public transit", "wildfire season"
+]
+
+
+class CorpusProfile:
+    """从已保存的文章中统计的分布"""
+
+    def __init__(self, articles: List[Dict]):
+        if not articles:
+            raise ValueError("没有可用于统计分布的文章，请先在 data/ 中保存至少一天的数据")
+
+        self.title_words = [len(a["title"].split()) for a in articles]
+        self.description_chars = [
+            len(a["text"].split("\n\n", 1)[-1]) * DESCRIPTION_EXPANSION for a in articles
+        ]
+        self.sources = Counter(a.get("source", "Unknown") for a in articles)
+        self.authors = {}
+        for a in articles:
+            self.authors.setdefault(a.get("source", "Unknown"), []).append(a["author"]["name"])
+        self.categories_text = [a.get("category_text", "") for a in articles]
+
+        words = re.findall(r"[A-Za-z][A-Za-z'\-]+", " ".join(a["text"] for a in articles))
+        self.vocabulary = [w for w in words if len(w) > 1]
+        self.capitalized = sorted({w for w in self.vocabulary if w[0].isupper() and len(w) > 3})
+        # 非 AI 条目只用不含 AI 相关词的词汇，使条目的标签与内容一致
+        scorer = RelevanceScorer()
+        self.neutral_vocabulary = [w for w in self.vocabulary if not scorer.hits(tokenize(w))]
+
+        # 每个分类的关键词命中数分布
+        analyzer = ArticleAnalyzer()
+        self.keyword_hits = {}
+        for category, keywords in analyzer.CATEGORY_KEYWORDS.items():
+            hits = []
+            for a in articles:
+                text = a["text"].lower()
+                hits.append(sum(1 for kw in keywords if kw.lower() in text))
+            self.keyword_hits[category] = hits
+        self.category_keywords = analyzer.CATEGORY_KEYWORDS
+
+    @classmethod
+    def from_data_dir(cls) -> "CorpusProfile":
+        """数据目录（config.data_dir()）中每一天的全部文章：快照和追加日志中的都计入"""
+        articles = []
+        for date_str in dates():
+            articles.extend(ArticleJournal(date_str))
+        return cls(articles)
+
+    def describe(self) -> Dict:
+        def avg(values):
+            return round(sum(values) / len(values), 2) if values else 0
+        return {
+            "articles": len(self.title_words),
+            "title_words_avg": avg(self.title_words),
+            "description_chars_avg": avg(self.description_chars),
+            "sources": dict(self.sources),
+            "keyword_hits_avg": {c: avg(h) for c, h in self.keyword_hits.items()}
+        }
+
+
+class CorpusGenerator:
+    """按 CorpusProfile 的分布生成合成文章"""
+
+    def __init__(self, profile: CorpusProfile, seed: int = 42):
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self.start = datetime(2026, 2, 11, 23, 0, tzinfo=timezone.utc)
+
+    def _sentence(self, words: int, ai: bool = True) -> str:
+        vocabulary = self.profile.vocabulary if ai else self.profile.neutral_vocabulary
+        tokens = [self.rng.choice(vocabulary) for _ in range(words)]
+        tokens[0] = tokens[0][:1].upper() + tokens[0][1:]
+        return " ".join(tokens) + "."
+
+    def _inject_keywords(self, text: str, ai: bool) -> str:
+        """按各分类的真实命中数分布插入关键词"""
+        if not ai:
+            return text
+        words = text.split(" ")
+        for category, hits in self.profile.keyword_hits.items():
+            for _ in range(self.rng.choice(hits)):
+                keyword = self.rng.choice(self.profile.category_keywords[category])
+                words.insert(self.rng.randrange(len(words) + 1), keyword)
+        return " ".join(words)
+
+    def _title(self, ai: bool) -> str:
+        words = max(3, self.rng.choice(self.profile.title_words) + self.rng.randint(-2, 2))
+        title = self._sentence(words, ai).rstrip(".")
+        if ai:
+            title = self._inject_keywords(title, True) if self.rng.random() < 0.5 else f"{title} with AI"
+        else:
+            title = f"{title} {self.rng.choice(NON_AI_TOPICS)}"
+        return title
+
+    def _plain_description(self, ai: bool) -> str:
+        target = self.rng.choice(self.profile.description_chars)
+        sentences = []
+        length = 0
+        while length < target:
+            sentence = self._sentence(self.rng.randint(8, 24), ai)
+            sentences.append(sentence)
+            length += len(sentence) + 1
+        text = " ".join(sentences)
+        if not ai:
+            text = f"{text} The {self.rng.choice(NON_AI_TOPICS)} report is due next month."
+        return self._inject_keywords(text, ai)
+
+    def _to_html(self, text: str) -> str:
+        """按录制源中观察到的 HTML 结构包装描述"""
+        sentences = re.split(r"(?<=\.) ", text)
+        paragraphs = []
+        for i in range(0, len(sentences), 3):
+            paragraph = html.escape(" ".join(sentences[i:i + 3]), quote=False)
+            if self.rng.random() < HTML_PATTERNS["entity"]:
+                paragraph = paragraph.replace("'", "&#8217;")
+                paragraph = f"&#8220;{paragraph}&#8221;" if self.rng.random() < 0.2 else paragraph
+            if self.rng.random() < HTML_PATTERNS["link"] and self.profile.capitalized:
+                name = self.rng.choice(self.profile.capitalized)
+                paragraph = f'<a href="https://example.com/{name.lower()}" rel="noopener">{name}</a> {paragraph}'
+            paragraphs.append(f"<p>{paragraph}</p>")
+
+        body = "\n".join(paragraphs)
+        if self.rng.random() < HTML_PATTERNS["figure"]:
+            body = ('<figure class="wp-block-image"><img src="https://example.com/img.jpg" alt="" '
+                    'width="1200" height="675" /></figure>\n' + body)
+        if self.rng.random() < HTML_PATTERNS["footer"]:
+            body += '\n<p>The post <a href="https://example.com">appeared first</a> on the site.</p>'
+        return body
+
+    def article(self, index: int) -> Dict:
+        """生成一篇文章（包含原始描述 HTML）"""
+        source = self.rng.choices(list(self.profile.sources), weights=list(self.profile.sources.values()))[0]
+        ai = self.rng.random() >= NON_AI_RATIO
+        title = self._title(ai)
+        description = self._plain_description(ai)
+        slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")[:80]
+        published = self.start - timedelta(minutes=self.rng.randint(0, 60 * 24))
+        return {
+            "index": index,
+            "ai": ai,
+            "source": source,
+            "title": title,
+            "description": description,
+            "description_html": self._to_html(description),
+            "author": self.rng.choice(self.profile.authors[source]),
+            "category_text": self.rng.choice(self.profile.categories_text),
+            "url": f"https://{source.lower().replace(' ', '')}.example.com/2026/02/11/{index}-{slug}/",
+            "published": published
+        }
+
+    def articles(self, count: int) -> List[Dict]:
+        return [self.article(i) for i in range(count)]
+
+
+def to_rss(items: List[Dict], channel: str) -> str:
+    """把合成文章写成 RSS 2.0"""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">\n<channel>\n'
+        f"<title>{html.escape(channel)}</title>\n<link>https://synthetic.example.com</link>\n"
+        "<description>Synthetic corpus</description>\n"
+    ]
+    for item in items:
+        parts.append(
+            "<item>\n"
+            f"<title><![CDATA[{item['title']}]]></title>\n"
+            f"<link>{item['url']}</link>\n"
+            f"<dc:creator><![CDATA[{item['author']}]]></dc:creator>\n"
+            f"<pubDate>{format_datetime(item['published'])}</pubDate>\n"
+            f"<category><![CDATA[{item['category_text']}]]></category>\n"
+            f'<guid isPermaLink="false">synthetic-{item["index"]}</guid>\n'
+            f"<description><![CDATA[{item['description_html']}]]></description>\n"
+            "</item>\n"
+        )
+    parts.append("</channel>\n</rss>\n")
+    return "".join(parts)
+
+
+def to_article_json(item: Dict) -> Dict:
+    """转换为 fetcher 输出的文章结构（与 data/articles_*.json 一致）"""
+    return {
+        "id": f"synthetic-{item['index']}",
+        "title": item["title"],
+        "title_cn": f"中文翻译：{item['title']}",
+        "text": f"{item['title']}\n\n{item['description'][:500]}",
+        "text_cn": "这是 AI 领域的重要进展，展示了人工智能技术的最新突破和发展方向。",
+        "author": {
+            "id": item["source"],
+            "username": item["source"].lower().replace(" ", "_"),
+            "name": item["author"],
+            "avatar": ""
+        },
+        "metrics": {"like_count": 0, "retweet_count": 0, "reply_count": 0},
+        "created_at": item["published"].strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "url": item["url"],
+        "source": item["source"],
+        "category_text": item["category_text"]
+    }
+
+
+def build_feed(count: int, seed: int = 42) -> str:
+    """生成包含 count 个条目的单个 RSS 源（供基准测试的桩服务使用）"""
+    generator = CorpusGenerator(CorpusProfile.from_data_dir(), seed=seed)
+    return to_rss(generator.articles(count), "Synthetic")
+
+
+def write_corpus(scale: int, output_dir: str, seed: int = 42) -> Dict:
+    """
+    生成 scale 倍于当前日量的语料
+
+    输出:
+        output_dir/feeds/<source>.xml   每个来源一个 RSS 源
+        output_dir/articles.json        同一批文章的 JSON（与 data/ 中格式一致）
+    """
+    generator = CorpusGenerator(CorpusProfile.from_data_dir(), seed=seed)
+    items = generator.articles(BASELINE_DAILY * scale)
+
+    feeds_dir = os.path.join(output_dir, "feeds")
+    os.makedirs(feeds_dir, exist_ok=True)
+
+    by_source = {}
+    for item in items:
+        by_source.setdefault(item["source"], []).append(item)
+
+    feeds = {}
+    for source, source_items in by_source.items():
+        filename = re.sub(r"[^a-z0-9]+", "-", source.lower()).strip("-") + ".xml"
+        with open(os.path.join(feeds_dir, filename), "w", encoding="utf-8") as f:
+            f.write(to_rss(source_items, source))
+        feeds[source] = filename
+
+    with open(os.path.join(output_dir, "articles.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "date": generator.start.strftime("%Y-%m-%d"),
+            "count": len(items),
+            "articles": [to_article_json(item) for item in items]
+        }, f, ensure_ascii=False)
+
+    return {"scale": scale, "count": len(items), "feeds": feeds, "output_dir": output_dir}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="每日 AI 速递 - 合成语料生成器")
+    parser.add_argument("--scale", type=int, default=10, help="相对当前日量的倍数，默认: 10")
+    parser.add_argument("--output", type=str, default=None, help="输出目录")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--profile", action="store_true", help="只打印从 data/ 统计出的分布")
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(CorpusProfile.from_data_dir().describe(), ensure_ascii=False, indent=2))
+        return
+    if not args.output:
+        parser.error("需要指定 --output")
+
+    result = write_corpus(args.scale, args.output, args.seed)
+    print(f"✅ 生成 {result['count']} 篇文章，{len(result['feeds'])} 个源: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""去重质量基准 - 在标注的跨来源报道对上检查 dedup.StoryDeduplicator 的合并精确率和召回率"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from dedup import StoryDeduplicator, idf_weights, weigh
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+# 调整前的参数（3 词 shingle，签名估计的 Jaccard 达到 0.5 才合并），作为对照
+LEGACY = {"num_bins": 64, "bands": 16, "threshold": 0.5, "shingle_size": 3, "same_source_threshold": 0.5}
+
+# 规模测试的背景文章：词按 Zipf 分布从大词表中抽取（与真实文本的词频分布相近），彼此不是同一报道
+ZIPF_VOCABULARY = 50000
+ZIPF_EXPONENT = 1.1
+# 背景文章中话题词的比例：真实的一天里 OpenAI、模型、推理等词很常见，IDF 权重低；
+# 背景与标注文章没有共同词汇时这些词的权重虚高，同一话题下的不同新闻会被误合并。
+# 话题词为出现在至少 TOPIC_MIN_STORIES 个不同报道（标注的同一报道对连成的组）中的词，报道特有的词不混入背景
+ZIPF_TOPIC_SHARE = 0.2
+TOPIC_MIN_STORIES = 3
+ZIPF_SOURCES = ["TechCrunch", "The Verge", "VentureBeat", "MIT Technology Review", "AI News", "Wired", "Ars Technica"]
+
+# 规模测试中每条耗时的允许增长倍数（最大规模相对最小规模）
+MAX_COST_GROWTH = 2.0
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="每日 AI 速递 - 去重质量基准")
+    parser.add_argument("--fail-on-error", action="store_true", help="当前参数有误合并或漏合并时以非零状态退出")
+    parser.add_argument("--output", type=str, default=None, help="结果 JSON 输出路径")
+    parser.add_argument("--scales", type=str, default="",
+                        help="规模测试的背景文章数（逗号分隔，如 2000,5000,10000,20000），标注的文章混入其中聚类")
+    return parser.parse_args()
+
+
+def to_article(entry: Dict, url: str) -> Dict:
+    """转换为抓取器输出的文章结构（text 为标题 + 描述）"""
+    return {"title": entry["title"], "text": f"{entry['title']}\n\n{entry['text']}", "source": entry["source"], "url": url}
+
+
+def load_pairs() -> List[Dict]:
+    """人工标注的报道对（fixtures/duplicates.json）：same 为 True 的是不同媒体对同一新闻的改写或转载，
+    False 的是同一公司、同一话题下的不同新闻，以及同一媒体共用模板文字的栏目"""
+    with open(os.path.join(FIXTURES_DIR, "duplicates.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def evaluate(deduplicator: StoryDeduplicator, pairs: List[Dict]) -> Dict:
+    """
+    逐对聚类（走完整的 LSH + 确认流程），再把所有文章放在一起聚类，检查是否有跨对的误合并
+    """
+    errors = []
+    tp = fp = fn = 0
+    for i, pair in enumerate(pairs):
+        articles = [to_article(pair["a"], f"https://a/{i}"), to_article(pair["b"], f"https://b/{i}")]
+        merged = len(deduplicator.cluster(articles)) == 1
+        if merged and pair["same"]:
+            tp += 1
+        elif merged:
+            fp += 1
+            errors.append(f"误合并: {pair['a']['title']} | {pair['b']['title']}")
+        elif pair["same"]:
+            fn += 1
+            errors.append(f"漏合并: {pair['a']['title']} | {pair['b']['title']}")
+
+    # 整体聚类：同一标题的文章视为同一篇，每个簇内只应有标注为同一报道的文章
+    pool = {}
+    for pair in pairs:
+        for entry in (pair["a"], pair["b"]):
+            pool.setdefault((entry["source"], entry["title"]), entry)
+    same = {frozenset(((p["a"]["source"], p["a"]["title"]), (p["b"]["source"], p["b"]["title"]))) for p in pairs if p["same"]}
+    keys = list(pool)
+    articles = [to_article(pool[key], f"https://pool/{n}") for n, key in enumerate(keys)]
+    for members in deduplicator.cluster(articles):
+        for x in members:
+            for y in members:
+                if x < y and frozenset((keys[x], keys[y])) not in same:
+                    errors.append(f"整体聚类误合并: {keys[x][1]} | {keys[y][1]}")
+
+    # 按整体聚类时的 IDF 计算各对的相似度：不同来源的同一报道的最低分与不同报道的最高分，
+    # 两者与 SIMILARITY_THRESHOLD 的距离即阈值的余量（同一来源的对按 same_source_threshold 判断，不计入）
+    shingles = {key: deduplicator._shingles(article) for key, article in zip(keys, articles)}
+    weights = idf_weights(Counter(h for body, title in shingles.values() for h in body | title), len(keys))
+    profiles = {key: (weigh(body, weights), weigh(title, weights)) for key, (body, title) in shingles.items()}
+    scores = {True: [], False: []}
+    for pair in pairs:
+        if pair["a"]["source"] != pair["b"]["source"]:
+            a, b = (profiles[(pair[side]["source"], pair[side]["title"])] for side in ("a", "b"))
+            scores[pair["same"]].append(deduplicator.similarity(a, b, weights))
+
+    return {
+        "precision": round(tp / (tp + fp), 3) if tp + fp else 0.0,
+        "recall": round(tp / (tp + fn), 3) if tp + fn else 0.0,
+        "false_merges": fp,
+        "missed": fn,
+        "min_same_score": round(min(scores[True], default=0.0), 3),
+        "max_different_score": round(max(scores[False], default=0.0), 3),
+        "errors": errors
+    }
+
+
+def zipf_articles(count: int, topic_words: List[str], seed: int = 42) -> List[Dict]:
+    """
+    规模测试的背景文章：标题约 10 个词，正文约 80 个词
+
+    Args:
+        count: 文章数
+        topic_words: 话题词，占 ZIPF_TOPIC_SHARE
+        seed: 随机种子
+    """
+    rng = random.Random(seed)
+    words = [f"w{rank}" for rank in range(ZIPF_VOCABULARY)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(ZIPF_VOCABULARY)))
+
+    def draw(k: int) -> str:
+        topical = sum(1 for _ in range(k) if rng.random() < ZIPF_TOPIC_SHARE)
+        chosen = rng.choices(words, cum_weights=cum_weights, k=k - topical) + rng.choices(topic_words, k=topical)
+        rng.shuffle(chosen)
+        return " ".join(chosen)
+
+    articles = []
+    for n in range(count):
+        title = draw(rng.randint(6, 14))
+        text = draw(rng.randint(50, 110))
+        articles.append({"title": title, "text": f"{title}\n\n{text}", "source": rng.choice(ZIPF_SOURCES),
+                         "url": f"https://zipf/{n}"})
+    return articles
+
+
+def evaluate_scale(deduplicator: StoryDeduplicator, pairs: List[Dict], sizes: List[int]) -> List[Dict]:
+    """
+    把标注的文章混入不同数量的背景文章中聚类：每条耗时应基本不随规模增长，
+    标注对的召回率与单独聚类时相同，且不应出现误合并（背景文章之间、背景文章与标注文章之间）
+    """
+    pool = {}
+    for pair in pairs:
+        for entry in (pair["a"], pair["b"]):
+            pool.setdefault((entry["source"], entry["title"]), entry)
+    keys = list(pool)
+    same = {frozenset(((p["a"]["source"], p["a"]["title"]), (p["b"]["source"], p["b"]["title"]))) for p in pairs if p["same"]}
+    positives = [tuple(pair) for pair in same]
+
+    # 同一报道的文章连成一组，统计每个词出现在几组中
+    story = {key: key for key in keys}
+
+    def root(key):
+        while story[key] != key:
+            key = story[key]
+        return key
+
+    for a, b in positives:
+        story[root(a)] = root(b)
+    stories = defaultdict(set)
+    for key in keys:
+        entry = pool[key]
+        stories[root(key)].update(f"{entry['title']} {entry['text']}".lower().split())
+    spread = Counter(word for words in stories.values() for word in words)
+    topic_words = sorted(word for word, count in spread.items() if count >= TOPIC_MIN_STORIES)
+
+    results = []
+    for size in sizes:
+        rng = random.Random(size)
+        # 标注的文章插在随机位置
+        articles = zipf_articles(size, topic_words)
+        for n, key in enumerate(keys):
+            position = rng.randrange(len(articles) + 1)
+            articles.insert(position, dict(to_article(pool[key], f"https://pool/{n}"), key=key))
+        start = time.perf_counter()
+        clusters = deduplicator.cluster(articles)
+        elapsed = time.perf_counter() - start
+
+        cluster_of = {}
+        false_merges = 0
+        for number, members in enumerate(clusters):
+            for index in members:
+                if "key" in articles[index]:
+                    cluster_of[articles[index]["key"]] = number
+            for x, y in itertools.combinations(members, 2):
+                kx, ky = articles[x].get("key"), articles[y].get("key")
+                if kx is None or ky is None or frozenset((kx, ky)) not in same:
+                    false_merges += 1
+        found = sum(1 for a, b in positives if cluster_of[a] == cluster_of[b])
+        results.append({
+            "articles": len(articles),
+            "seconds": round(elapsed, 3),
+            "us_per_item": round(elapsed / len(articles) * 1e6, 1),
+            "recall": round(found / len(positives), 3) if positives else 0.0,
+            "false_merges": false_merges
+        })
+    return results
+
+
+def main():
+    args = parse_args()
+    pairs = load_pairs()
+
+    print("🧩 去重质量基准")
+    print("=" * 50)
+    print(f"   {len(pairs)} 对，其中同一报道 {sum(1 for p in pairs if p['same'])} 对")
+
+    results = {}
+    for name, deduplicator in {"legacy": StoryDeduplicator(**LEGACY), "current": StoryDeduplicator()}.items():
+        result = evaluate(deduplicator, pairs)
+        results[name] = result
+        print(f"   {name:<8} 精确率 {result['precision']:.3f}  召回率 {result['recall']:.3f}"
+              f"  误合并 {result['false_merges']}  漏合并 {result['missed']}"
+              f"  同一报道最低分 {result['min_same_score']:.3f}  不同报道最高分 {result['max_different_score']:.3f}")
+    for error in results["current"]["errors"]:
+        print(f"   ⚠️  {error}")
+
+    if args.scales:
+        sizes = [int(size) for size in args.scales.split(",") if size.strip()]
+        print("\n📈 规模测试（Zipf 背景文章 + 标注文章）")
+        print(f"   {'文章数':>8} {'耗时(s)':>10} {'每条(µs)':>10} {'召回率':>8} {'误合并':>8}")
+        scale = evaluate_scale(StoryDeduplicator(), pairs, sizes)
+        for row in scale:
+            print(f"   {row['articles']:>8} {row['seconds']:>10.3f} {row['us_per_item']:>10.1f}"
+                  f" {row['recall']:>8.3f} {row['false_merges']:>8}")
+        results["scale"] = scale
+        errors = []
+        growth = scale[-1]["us_per_item"] / scale[0]["us_per_item"] if len(scale) > 1 else 1.0
+        if growth > MAX_COST_GROWTH:
+            errors.append(f"每条耗时随规模增长 {growth:.1f} 倍（允许 {MAX_COST_GROWTH} 倍）")
+        for row in scale:
+            if row["recall"] < results["current"]["recall"] or row["false_merges"]:
+                errors.append(f"{row['articles']} 篇时召回率 {row['recall']:.3f}、误合并 {row['false_merges']}")
+        for error in errors:
+            print(f"   ⚠️  {error}")
+        results["current"]["errors"].extend(errors)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 结果已写入: {args.output}")
+
+    if args.fail_on_error and results["current"]["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""冷启动基准 - 用 python -X importtime 测量各 Vercel 处理函数模块的导入耗时，并检查预算"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+API_DIR = os.path.join(ROOT_DIR, "api")
+
+# 冷启动时不应加载的重量级依赖（只在实际抓取、渲染或剖析时导入）
+HEAVY_MODULES = ("requests", "urllib3", "bs4", "lxml", "jinja2", "cProfile", "pstats")
+
+# 默认预算：单个处理函数模块的导入耗时（毫秒）
+DEFAULT_BUDGET_MS = 30.0
+
+# 子进程中在加载处理函数前写入 stderr 的标记，之前的是解释器自身启动的导入
+_MARKER = "--- handler import ---"
+
+_LOADER = f"""
+import importlib.util, sys
+sys.stderr.write({_MARKER!r} + "\\n")
+spec = importlib.util.spec_from_file_location("handler", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="每日 AI 速递 - 冷启动导入耗时")
+    parser.add_argument("--repeat", type=int, default=7, help="每个处理函数的测量次数，取中位数（默认: 7）")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help=f"导入耗时预算（毫秒，默认: {DEFAULT_BUDGET_MS:g}）")
+    parser.add_argument("--top", type=int, default=5, help="列出最慢的模块数量（默认: 5）")
+    parser.add_argument("--output", type=str, default=None, help="结果 JSON 输出路径")
+    parser.add_argument("--fail-on-budget", action="store_true",
+                        help="超出预算或加载了重量级依赖时以非零状态退出（用于 CI）")
+    return parser.parse_args()
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    解析 -X importtime 输出（标记之后的部分）
+
+    每行格式: "import time: 自身(µs) | 累计(µs) | 缩进 + 模块名"，缩进表示被谁导入
+    """
+    lines = stderr.splitlines()
+    if _MARKER in lines:
+        lines = lines[lines.index(_MARKER) + 1:]
+    entries = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue  # 表头
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append({
+            "module": name.strip(),
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": depth
+        })
+    return entries
+
+
+def measure_handler(path: str) -> Dict:
+    """在全新的解释器中导入一次处理函数模块"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _LOADER, path],
+        cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"导入 {path} 失败:\n{completed.stderr[-2000:]}")
+    entries = parse_importtime(completed.stderr)
+    return {
+        "total_ms": sum(e["cumulative_us"] for e in entries if e["depth"] == 0) / 1000,
+        "modules": {e["module"] for e in entries},
+        "slowest": sorted((e for e in entries if e["depth"] == 0), key=lambda e: -e["cumulative_us"])
+    }
+
+
+def bench_handler(path: str, repeat: int, top: int) -> Dict:
+    runs = [measure_handler(path) for _ in range(repeat)]
+    heavy = sorted(m for m in runs[0]["modules"] if m.split(".")[0] in HEAVY_MODULES and "." not in m)
+    return {
+        "median_ms": round(statistics.median(r["total_ms"] for r in runs), 2),
+        "min_ms": round(min(r["total_ms"] for r in runs), 2),
+        "modules": len(runs[0]["modules"]),
+        "heavy_modules": heavy,
+        "slowest": [
+            {"module": e["module"], "cumulative_ms": round(e["cumulative_us"] / 1000, 2)}
+            for e in runs[0]["slowest"][:top]
+        ]
+    }
+
+
+def main():
+    args = parse_args()
+
+    print("🧊 每日 AI 速递冷启动导入耗时")
+    print("=" * 50)
+    print(f"   预算: {args.budget_ms:g} ms / 处理函数, 重复 {args.repeat} 次取中位数\n")
+
+    results = {}
+    failed = []
+    for filename in sorted(os.listdir(API_DIR)):
+        if not filename.endswith(".py"):
+            continue
+        name = filename[:-3]
+        result = bench_handler(os.path.join(API_DIR, filename), args.repeat, args.top)
+        results[name] = result
+
+        over_budget = result["median_ms"] > args.budget_ms
+        status = "✅" if not over_budget and not result["heavy_modules"] else "❌"
+        print(f"{status} {name:<16} 中位数 {result['median_ms']:>7.2f} ms  最小 {result['min_ms']:>7.2f} ms"
+              f"  模块 {result['modules']}")
+        for entry in result["slowest"]:
+            print(f"      {entry['module']:<28} {entry['cumulative_ms']:>7.2f} ms")
+        if result["heavy_modules"]:
+            print(f"      ⚠️  冷启动加载了重量级依赖: {', '.join(result['heavy_modules'])}")
+        if over_budget or result["heavy_modules"]:
+            failed.append(name)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"budget_ms": args.budget_ms, "handlers": results}, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 结果已写入: {args.output}")
+
+    if failed:
+        print(f"\n❌ 未达标: {', '.join(failed)}")
+        if args.fail_on_budget:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""内存基准 - 对比多日文章工作集用字典和 records.Article 保存时的内存占用与加载耗时"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from analyzer import ArticleAnalyzer
+from corpus import CorpusGenerator, CorpusProfile, to_article_json
+from dedup import StoryDeduplicator
+from records import to_records
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="每日 AI 速递 - 文章工作集内存基准")
+    parser.add_argument("--days", type=int, default=90, help="天数，默认: 90")
+    parser.add_argument("--per-day", type=int, default=100, help="每天的文章数，默认: 100")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--output", type=str, default=None, help="结果 JSON 输出路径")
+    return parser.parse_args()
+
+
+def build_days(days: int, per_day: int, seed: int):
+    """生成多日的数据文件内容（已去重和分析，与 data/articles_*.json 一致）"""
+    generator = CorpusGenerator(CorpusProfile.from_data_dir(), seed=seed)
+    analyzer = ArticleAnalyzer()
+    blobs = []
+    for day in range(days):
+        items = generator.articles(per_day)
+        articles = [to_article_json(item) for item in items]
+        for article in articles:
+            article["id"] = f"{article['id']}-{day}"
+        analyzed = analyzer.analyze_batch(StoryDeduplicator().dedupe(articles))["tweets"]
+        blobs.append(json.dumps({"articles": analyzed}, ensure_ascii=False))
+    return blobs
+
+
+def measure_load(load: Callable[[str], list], blobs) -> Dict:
+    """加载全部数据文件后常驻的内存（tracemalloc）和耗时（不开启 tracemalloc 单独计时）"""
+    gc.collect()
+    start = time.perf_counter()
+    working_set = [article for blob in blobs for article in load(blob)]
+    elapsed = time.perf_counter() - start
+    count = len(working_set)
+    del working_set
+    gc.collect()
+
+    tracemalloc.start()
+    working_set = [article for blob in blobs for article in load(blob)]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del working_set
+    return {
+        "articles": count,
+        "memory_mb": round(current / 1024 / 1024, 2),
+        "bytes_per_article": round(current / count),
+        "load_ms": round(elapsed * 1000, 1)
+    }
+
+
+def main():
+    args = parse_args()
+
+    print("🧠 文章工作集内存基准")
+    print("=" * 50)
+    blobs = build_days(args.days, args.per_day, args.seed)
+    print(f"   {args.days} 天 × {args.per_day} 篇，数据文件共 {sum(len(b.encode('utf-8')) for b in blobs) / 1024 / 1024:.1f} MB")
+
+    results = {
+        "dict": measure_load(lambda blob: json.loads(blob)["articles"], blobs),
+        "records": measure_load(lambda blob: to_records(json.loads(blob)["articles"]), blobs),
+    }
+    for name, result in results.items():
+        print(f"   {name:<8} {result['memory_mb']:>8.1f} MB  {result['bytes_per_article']:>6} 字节/篇"
+              f"  加载 {result['load_ms']:.0f} ms")
+    print(f"   内存减少为字典的 1/{results['dict']['memory_mb'] / results['records']['memory_mb']:.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 结果已写入: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
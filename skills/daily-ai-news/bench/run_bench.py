@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""基准测试 - 基于录制的 RSS/Atom 源对流水线各阶段计时，结果追加到 JSON 历史"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+import requests
+from bs4 import BeautifulSoup
+
+from fetcher import TechNewsFetcher
+from analyzer import ArticleAnalyzer
+from renderer import WebRenderer
+from dedup import StoryDeduplicator
+from enrichment import EngagementEnricher, HackerNewsProvider
+from identity import SeenSet
+from ingest import IngestIndex
+from stub_server import FeedStub
+
+DEFAULT_HISTORY = os.path.join(BENCH_DIR, "results", "history.json")
+
+# 中位数比上一次慢超过该比例即视为回归
+REGRESSION_THRESHOLD = 0.25
+
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="每日 AI 速递 - 流水线基准测试")
+    parser.add_argument("--repeat", type=int, default=5, help="每个阶段重复次数，默认: 5")
+    parser.add_argument("--synthetic", type=int, default=10000, help="合成大源的条目数，0 表示跳过，默认: 10000")
+    parser.add_argument("--history", type=str, default=DEFAULT_HISTORY, help="历史结果 JSON 文件")
+    parser.add_argument("--label", type=str, default=None, help="本次结果的标签，默认为 git 版本")
+    parser.add_argument("--no-save", action="store_true", help="不写入历史文件")
+    parser.add_argument("--fail-on-regression", action="store_true", help="检测到回归时以非零状态退出")
+    return parser.parse_args()
+
+
+def measure(func: Callable, repeat: int, setup: Optional[Callable] = None, items: int = 0) -> Dict:
+    """重复执行并统计耗时（setup 的耗时不计入）"""
+    timings = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        func(arg) if setup else func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    result = {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "repeat": repeat
+    }
+    if items:
+        result["items"] = items
+        result["per_item_us"] = round(result["median_ms"] * 1000 / items, 3)
+    return result
+
+
+def git_version() -> str:
+    """当前代码版本（git describe）"""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT_DIR, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def bench_dataset(name: str, urls: List[str], repeat: int, hn_url: str) -> Dict:
+    """对一组源依次测量各阶段（hn_url 为桩服务上的 Hacker News 搜索接口）"""
+    fetcher = TechNewsFetcher()
+    analyzer = ArticleAnalyzer()
+    renderer = WebRenderer()
+    session = requests.Session()
+
+    # 预先下载和解析一次，作为后续阶段的输入
+    contents = [session.get(url, headers=fetcher.headers, timeout=30).content for url in urls]
+    soups = [BeautifulSoup(content, "xml") for content in contents]
+    items = [item for soup in soups for item in soup.find_all("item")]
+    descriptions = [item.find("description").get_text() if item.find("description") else "" for item in items]
+    titles = [item.find("title").get_text(strip=True) if item.find("title") else "" for item in items]
+    cleaned = [fetcher._clean_description(d) for d in descriptions]
+    texts = [f"{t} {d}" for t, d in zip(titles, cleaned)]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        articles = [a for a in (fetcher._parse_rss_item(item, name) for item in items) if a]
+
+    print(f"   {name}: {len(urls)} 个源, {sum(len(c) for c in contents)} 字节, "
+          f"{len(items)} 个条目, {len(articles)} 篇 AI 文章")
+
+    stages = {}
+    stages["fetch"] = measure(
+        lambda: [session.get(url, headers=fetcher.headers, timeout=30).content for url in urls], repeat)
+    stages["parse.xml"] = measure(
+        lambda: [BeautifulSoup(content, "xml") for content in contents], repeat, items=len(items))
+    stages["parse.clean_description"] = measure(
+        lambda: [fetcher._clean_description(d) for d in descriptions], repeat, items=len(items))
+    stages["filter.ai"] = measure(
+        lambda: [fetcher._is_ai_related(t) for t in texts], repeat, items=len(items))
+    stages["translate"] = measure(
+        lambda f: [f._translate(a["title"], a["text"]) for a in articles], repeat,
+        setup=TechNewsFetcher, items=len(articles))
+    with contextlib.redirect_stdout(io.StringIO()):
+        stages["parse.item"] = measure(
+            lambda: [fetcher._parse_rss_item(item, name) for item in items], repeat, items=len(items))
+    # 增量抓取时已摄取条目的开销（只读 GUID/链接并查一次索引）
+    known = IngestIndex(SeenSet())
+    for item in items:
+        known.mark(*fetcher._item_identity(item))
+    stages["parse.item_known"] = measure(
+        lambda: [known.is_known(*fetcher._item_identity(item)) for item in items], repeat, items=len(items))
+    stages["dedup"] = measure(
+        StoryDeduplicator().dedupe, repeat, setup=lambda: copy.deepcopy(articles), items=len(articles))
+    # 互动数据补全：每次用新的补全器（空缓存，不限速）；enrich.cached 为结果都在缓存中时的开销
+    provider = HackerNewsProvider(hn_url)
+    provider.rate = 0
+    stages["enrich"] = measure(
+        lambda arts: EngagementEnricher([provider], budget=60).enrich(arts), repeat,
+        setup=lambda: copy.deepcopy(articles), items=len(articles))
+    enricher = EngagementEnricher([provider], budget=60)
+    enricher.enrich(copy.deepcopy(articles))
+    stages["enrich.cached"] = measure(
+        enricher.enrich, repeat, setup=lambda: copy.deepcopy(articles), items=len(articles))
+    # 每次用新的分析器（空的分析缓存）；analyze.cached 为结果已缓存时（如重复读取已保存的数据）的开销
+    stages["analyze"] = measure(
+        lambda arts: ArticleAnalyzer().analyze_batch(arts), repeat,
+        setup=lambda: copy.deepcopy(articles), items=len(articles))
+    analyzer.analyze_batch(copy.deepcopy(articles))
+    stages["analyze.cached"] = measure(
+        analyzer.analyze_batch, repeat, setup=lambda: copy.deepcopy(articles), items=len(articles))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, "page.html")
+        analyzed = analyzer.analyze_batch(copy.deepcopy(articles))
+        stages["render"] = measure(
+            lambda: renderer.render(analyzed["tweets"], analyzed["stats"], output_path), repeat,
+            items=len(articles))
+
+        def end_to_end():
+            run_fetcher = TechNewsFetcher()
+            run_fetcher.rss_sources = [{"name": f"{name}-{i}", "url": url, "category": "基准"} for i, url in enumerate(urls)]
+            with contextlib.redirect_stdout(io.StringIO()):
+                fetched = run_fetcher.fetch(use_rss=True)
+            result = ArticleAnalyzer().analyze_batch(StoryDeduplicator().dedupe(fetched))
+            WebRenderer().render(result["tweets"], result["stats"], output_path)
+
+        stages["end_to_end"] = measure(end_to_end, repeat, items=len(items))
+
+    return stages
+
+
+def load_history(path: str) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def find_regressions(current: Dict, previous: Optional[Dict]) -> List[str]:
+    """与上一次结果比较各阶段中位数"""
+    if not previous:
+        return []
+    regressions = []
+    for dataset, stages in current["datasets"].items():
+        old_stages = previous.get("datasets", {}).get(dataset, {})
+        for stage, stats in stages.items():
+            old = old_stages.get(stage)
+            if old and old["median_ms"] > 0 and stats["median_ms"] > old["median_ms"] * (1 + REGRESSION_THRESHOLD):
+                regressions.append(
+                    f"{dataset}/{stage}: {old['median_ms']:.2f}ms → {stats['median_ms']:.2f}ms "
+                    f"(+{(stats['median_ms'] / old['median_ms'] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_table(record: Dict):
+    for dataset, stages in record["datasets"].items():
+        print(f"\n[{dataset}]")
+        print(f"   {'阶段':<26}{'中位数(ms)':>12}{'最小(ms)':>12}{'每条(µs)':>12}")
+        for stage, stats in stages.items():
+            per_item = f"{stats['per_item_us']:.1f}" if "per_item_us" in stats else "-"
+            print(f"   {stage:<28}{stats['median_ms']:>12.2f}{stats['min_ms']:>12.2f}{per_item:>12}")
+
+
+def main():
+    args = parse_args()
+    version = git_version()
+
+    print("⏱️  每日 AI 速递基准测试")
+    print("=" * 50)
+
+    record = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "version": version,
+        "label": args.label or version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "datasets": {}
+    }
+
+    with FeedStub() as stub:
+        fixture_urls = [stub.url(f"fixtures/{name}") for name in stub.fixture_names()]
+        hn_url = stub.url("hn/api/v1")
+        record["datasets"]["recorded"] = bench_dataset("recorded", fixture_urls, args.repeat, hn_url)
+        if args.synthetic:
+            name = f"synthetic-{args.synthetic}"
+            record["datasets"][name] = bench_dataset(
+                name, [stub.url(f"synthetic/{args.synthetic}.xml")], args.repeat, hn_url)
+
+    print_table(record)
+
+    history = load_history(args.history)
+    regressions = find_regressions(record, history[-1] if history else None)
+    if regressions:
+        print(f"\n⚠️  与上一次（{history[-1]['label']}）相比发现回归:")
+        for line in regressions:
+            print(f"   {line}")
+    elif history:
+        print(f"\n✅ 与上一次（{history[-1]['label']}）相比无回归")
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.history) or ".", exist_ok=True)
+        history.append(record)
+        with open(args.history, "w", encoding="utf-8") as f:
+            json.dump(history, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 结果已追加到: {args.history}")
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""规模测试 - 在 N 倍于当前日量的合成语料上运行完整流水线，报告吞吐量和峰值内存"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from corpus import write_corpus
+from stub_server import FeedStub
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="每日 AI 速递 - 规模测试")
+    parser.add_argument("--scales", type=str, default="10,100,1000", help="逗号分隔的倍数，默认: 10,100,1000")
+    parser.add_argument("--render-limit", type=int, default=50, help="渲染的文章数（与 main.py --limit 一致），0 表示全部")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--output", type=str, default=None, help="结果 JSON 输出路径")
+    parser.add_argument("--child", type=str, default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def peak_rss_mb() -> float:
+    """当前进程的峰值常驻内存（Linux 单位为 KB，macOS 为字节）"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / 1024 / 1024
+    return peak / 1024
+
+
+def run_pipeline(config: Dict) -> Dict:
+    """子进程中执行：抓取 → 分析 → 渲染，返回各阶段耗时和峰值内存"""
+    from fetcher import TechNewsFetcher
+    from analyzer import ArticleAnalyzer
+    from renderer import WebRenderer
+
+    baseline_rss = peak_rss_mb()
+    timings = {}
+
+    fetcher = TechNewsFetcher()
+    fetcher.rss_sources = [{"name": name, "url": url, "category": "规模测试"} for name, url in config["feeds"].items()]
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        articles = fetcher.fetch(use_rss=True)
+    timings["fetch"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    analyzer = ArticleAnalyzer()
+    result = analyzer.analyze_batch(articles)
+    timings["analyze"] = time.perf_counter() - start
+
+    limit = config["render_limit"] or len(result["tweets"])
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        WebRenderer().render(analyzer.get_top_n(result, limit), result["stats"], os.path.join(tmp, "page.html"))
+    timings["render"] = time.perf_counter() - start
+
+    timings["total"] = sum(timings.values())
+    return {
+        "items": config["items"],
+        "articles": len(articles),
+        "rendered": min(limit, len(result["tweets"])),
+        "seconds": {k: round(v, 4) for k, v in timings.items()},
+        "items_per_second": {
+            "fetch": round(config["items"] / timings["fetch"], 1) if timings["fetch"] else 0,
+            "analyze": round(len(articles) / timings["analyze"], 1) if timings["analyze"] else 0,
+            "total": round(config["items"] / timings["total"], 1) if timings["total"] else 0
+        },
+        "baseline_rss_mb": round(baseline_rss, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+def run_scale(scale: int, args) -> Dict:
+    """生成语料并在独立子进程中运行，保证峰值内存互不影响"""
+    with tempfile.TemporaryDirectory() as corpus_dir:
+        corpus = write_corpus(scale, corpus_dir, seed=args.seed)
+        with FeedStub(corpus_dir=corpus_dir) as stub:
+            config = {
+                "items": corpus["count"],
+                "render_limit": args.render_limit,
+                "feeds": {source: stub.url(f"corpus/{filename}") for source, filename in corpus["feeds"].items()}
+            }
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", json.dumps(config)],
+                capture_output=True, text=True, check=True
+            )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["scale"] = scale
+    return result
+
+
+def print_table(results: List[Dict]):
+    print(f"\n{'倍数':>6}{'条目':>9}{'文章':>9}{'抓取(s)':>10}{'分析(s)':>10}{'渲染(s)':>10}"
+          f"{'总计(s)':>10}{'条目/秒':>10}{'峰值RSS(MB)':>13}")
+    for r in results:
+        s = r["seconds"]
+        print(f"{r['scale']:>7}{r['items']:>10}{r['articles']:>10}{s['fetch']:>11.2f}{s['analyze']:>11.2f}"
+              f"{s['render']:>11.2f}{s['total']:>11.2f}{r['items_per_second']['total']:>11.1f}{r['peak_rss_mb']:>14.1f}")
+
+
+def main():
+    args = parse_args()
+
+    if args.child:
+        print(json.dumps(run_pipeline(json.loads(args.child))))
+        return
+
+    print("📈 每日 AI 速递规模测试")
+    print("=" * 50)
+
+    results = []
+    for scale in [int(s) for s in args.scales.split(",") if s.strip()]:
+        print(f"   运行 {scale}× ...", flush=True)
+        results.append(run_scale(scale, args))
+
+    print_table(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 结果已写入: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""本地 HTTP 桩服务 - 为基准测试提供录制的 RSS/Atom 源、合成大源和热度来源的搜索接口"""
+import hashlib
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from corpus import build_feed
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+@lru_cache(maxsize=8)
+def _synthetic_body(count: int) -> bytes:
+    """合成源只生成一次，重复请求直接返回缓存"""
+    return build_feed(count).encode("utf-8")
+
+
+def _hn_search(url: str) -> bytes:
+    """
+    模拟 Hacker News（Algolia）按链接检索：由链接的哈希决定是否有讨论及 points、评论数，
+    另附一条链接不同的结果（检验只计入链接一致的帖子）
+    """
+    h = int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=4).digest(), "big")
+    hits = [{"url": f"https://example.com/other/{h}", "points": 999, "num_comments": 999}]
+    if h % 4:
+        hits += [{"url": url, "points": h % 500, "num_comments": h % 200} for _ in range(1 + h % 2)]
+    return json.dumps({"hits": hits}).encode("utf-8")
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    """
+    路由:
+        /fixtures/<name>.xml   录制的源文件
+        /synthetic/<n>.xml     n 条目的合成 RSS 源
+        /corpus/<name>.xml     corpus_dir/feeds 中生成的语料源
+        /status/<code>         返回指定状态码（模拟源故障）
+        /hn/api/v1/search      Hacker News（Algolia）搜索接口，见 _hn_search
+        /slow/<ms>/<路径>      延迟 ms 毫秒后按 <路径> 返回（模拟响应慢的来源）
+    """
+
+    def do_GET(self):
+        request = urlsplit(self.path)
+        parts = request.path.strip("/").split("/")
+        body: Optional[bytes] = None
+        status = 200
+        content_type = "application/rss+xml; charset=utf-8"
+
+        if len(parts) > 2 and parts[0] == "slow":
+            time.sleep(int(parts[1]) / 1000)
+            parts = parts[2:]
+
+        if len(parts) == 2 and parts[0] == "fixtures":
+            path = os.path.join(FIXTURE_DIR, os.path.basename(parts[1]))
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    body = f.read()
+        elif len(parts) == 2 and parts[0] == "synthetic" and parts[1].endswith(".xml"):
+            body = _synthetic_body(int(parts[1][:-4]))
+        elif len(parts) == 2 and parts[0] == "corpus" and self.server.corpus_dir:
+            path = os.path.join(self.server.corpus_dir, "feeds", os.path.basename(parts[1]))
+            if os.path.isfile(path):
+                with open(path, "rb") as f:
+                    body = f.read()
+        elif len(parts) == 2 and parts[0] == "status":
+            status = int(parts[1])
+            body = b""
+        elif parts == ["hn", "api", "v1", "search"]:
+            body = _hn_search(parse_qs(request.query).get("query", [""])[0])
+            content_type = "application/json"
+
+        if body is None:
+            status, body = 404, b"not found"
+
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端已放弃请求（如超出时间预算）
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FeedStub:
+    """
+    在后台线程中运行的桩服务
+
+    用法:
+        with FeedStub() as stub:
+            url = stub.url("fixtures/venturebeat.xml")
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, corpus_dir: Optional[str] = None):
+        self.server = ThreadingHTTPServer((host, port), _FeedHandler)
+        self.server.corpus_dir = corpus_dir
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def fixture_names(self):
+        return sorted(name for name in os.listdir(FIXTURE_DIR) if name.endswith(".xml"))
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,268 @@
+"""分类模块 - 在稀疏词项矩阵上一次性为一批文章的所有分类打分（多标签，分数为校准后的概率）"""
+import hashlib
+import json
+import math
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import config
+
+# 未训练时，词表权重到对数几率的换算：命中一个权重为 1 的词约为 0.62，两个约为 0.88
+KEYWORD_LOGIT = 1.5
+DEFAULT_BIAS = -1.0
+
+# 概率达到该值的分类计入标签
+LABEL_THRESHOLD = 0.5
+
+# 没有任何分类达到阈值时的分类
+DEFAULT_CATEGORY = "其他"
+
+_numpy = None
+
+
+def _np():
+    """NumPy（可选）：可用时矩阵运算交给 NumPy，否则用纯 Python 的稀疏实现；按需导入，不影响冷启动"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def _sigmoid(x: float) -> float:
+    if x >= 0:
+        return 1 / (1 + math.exp(-x))
+    z = math.exp(x)
+    return z / (1 + z)
+
+
+class TermMatrix:
+    """
+    一批文章的稀疏词项矩阵（CSR：indptr / indices / data）
+
+    每行为一篇文章，列为词表中的词，值为 1（出现）。
+    """
+
+    __slots__ = ("indptr", "indices", "data", "rows")
+
+    def __init__(self, indptr: List[int], indices: List[int], data: List[float]):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.rows = len(indptr) - 1
+
+
+class CategoryClassifier:
+    """
+    多标签分类器（一对多的线性模型 + sigmoid）
+
+    每个分类的分数为 sigmoid(词项向量 · 权重 + 偏置)，各分类独立，一篇文章可以有多个标签。
+    未训练时权重来自双语加权词表；fit() 在已标注的存档上做带 L2 正则的逻辑回归
+    （正则项把权重拉向词表先验，存档中没出现过的词保留词表权重），得到校准后的概率。
+    一批文章的打分是一次稀疏矩阵乘法：有 NumPy 时用 NumPy，否则逐个非零元累加。
+    """
+
+    MODEL_FILE = "classifier.json"
+
+    def __init__(
+        self,
+        terms: Dict[str, Dict[str, float]],
+        weights: Optional[Dict[str, Dict[str, float]]] = None,
+        bias: Optional[Dict[str, float]] = None,
+        threshold: float = LABEL_THRESHOLD
+    ):
+        """
+        Args:
+            terms: 分类 → {词: 权重}（词表，也是未训练时的先验）
+            weights: 训练得到的权重（分类 → {词: 权重}），默认为词表权重 * KEYWORD_LOGIT
+            bias: 训练得到的偏置（分类 → 偏置），默认为 DEFAULT_BIAS
+            threshold: 计入标签的概率阈值
+        """
+        self.terms = terms
+        self.categories = list(terms)
+        self.vocabulary: Dict[str, int] = {}
+        for category_terms in terms.values():
+            for term in category_terms:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+        self.threshold = threshold
+
+        # 先验权重矩阵（词数 × 分类数）
+        self._prior = [[0.0] * len(self.categories) for _ in self.vocabulary]
+        for c, category in enumerate(self.categories):
+            for term, weight in terms[category].items():
+                self._prior[self.vocabulary[term]][c] = weight * KEYWORD_LOGIT
+        self.weights = [list(row) for row in self._prior]
+        self.bias = [DEFAULT_BIAS] * len(self.categories)
+        if weights:
+            for c, category in enumerate(self.categories):
+                for term, weight in weights.get(category, {}).items():
+                    if term in self.vocabulary:
+                        self.weights[self.vocabulary[term]][c] = weight
+        if bias:
+            self.bias = [bias.get(category, DEFAULT_BIAS) for category in self.categories]
+        self.trained = bool(weights)
+
+    # ---------- 持久化 ----------
+
+    @classmethod
+    def load(cls, terms: Dict[str, Dict[str, float]], path: Optional[str] = None) -> "CategoryClassifier":
+        """词表 + 数据目录中训练好的模型（state/classifier.json）；没有模型或无法读取时只用词表"""
+        try:
+            path = path or config.state_path(cls.MODEL_FILE)
+            if not os.path.exists(path):
+                return cls(terms)
+            with open(path, "r", encoding="utf-8") as f:
+                model = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"   ⚠️  读取分类模型失败，只用词表: {e}")
+            return cls(terms)
+        return cls(terms, model.get("weights"), model.get("bias"), model.get("threshold", LABEL_THRESHOLD))
+
+    def save(self, path: Optional[str] = None) -> str:
+        """保存训练得到的权重（先写临时文件再重命名）"""
+        path = path or config.state_path(self.MODEL_FILE)
+        model = {
+            "weights": {
+                category: {term: round(self.weights[i][c], 4) for term, i in self.vocabulary.items()}
+                for c, category in enumerate(self.categories)
+            },
+            "bias": {category: round(self.bias[c], 4) for c, category in enumerate(self.categories)},
+            "threshold": self.threshold
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(model, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        return path
+
+    def fingerprint(self) -> str:
+        """词表、权重和阈值的指纹（分析结果缓存的版本的一部分）"""
+        content = json.dumps([self.categories, sorted(self.vocabulary.items()), self.weights, self.bias, self.threshold])
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=4).hexdigest()
+
+    # ---------- 打分 ----------
+
+    def matrix(self, documents: Sequence[Sequence[str]]) -> TermMatrix:
+        """各文章命中的词（见 features.ArticleFeatures.terms）→ 稀疏词项矩阵，词表外的词忽略"""
+        indptr, indices = [0], []
+        vocabulary = self.vocabulary
+        for terms in documents:
+            indices.extend(sorted(vocabulary[term] for term in set(terms) if term in vocabulary))
+            indptr.append(len(indices))
+        return TermMatrix(indptr, indices, [1.0] * len(indices))
+
+    def decision(self, X: TermMatrix, weights=None, bias=None) -> List[List[float]]:
+        """对数几率：X · W + b（行数 × 分类数）"""
+        weights = self.weights if weights is None else weights
+        bias = self.bias if bias is None else bias
+        np = _np()
+        if np is not None:
+            return self._decision_numpy(np, X, np.asarray(weights, dtype=float), np.asarray(bias, dtype=float)).tolist()
+
+        scores = []
+        for i in range(X.rows):
+            row = list(bias)
+            for k in range(X.indptr[i], X.indptr[i + 1]):
+                w = weights[X.indices[k]]
+                d = X.data[k]
+                for c in range(len(row)):
+                    row[c] += d * w[c]
+            scores.append(row)
+        return scores
+
+    @staticmethod
+    def _decision_numpy(np, X: TermMatrix, W, b):
+        rows = np.repeat(np.arange(X.rows), np.diff(np.asarray(X.indptr)))
+        scores = np.tile(b, (X.rows, 1))
+        if len(X.indices):
+            np.add.at(scores, rows, np.asarray(X.data)[:, None] * W[np.asarray(X.indices)])
+        return scores
+
+    def predict_proba(self, documents: Sequence[Sequence[str]]) -> List[Dict[str, float]]:
+        """每篇文章各分类的概率"""
+        return [
+            {category: _sigmoid(score) for category, score in zip(self.categories, row)}
+            for row in self.decision(self.matrix(documents))
+        ]
+
+    def classify(self, documents: Sequence[Sequence[str]]) -> List[Tuple[str, float, List[str]]]:
+        """
+        批量分类
+
+        Returns:
+            每篇文章的 (主分类, 主分类的概率, 达到阈值的所有分类（按概率从高到低）)；
+            没有分类达到阈值时为 ("其他", 0, [])
+        """
+        results = []
+        for probabilities in self.predict_proba(documents):
+            labels = sorted(
+                (category for category, p in probabilities.items() if p >= self.threshold),
+                key=lambda category: -probabilities[category]
+            )
+            if labels:
+                results.append((labels[0], round(probabilities[labels[0]], 3), labels))
+            else:
+                results.append((DEFAULT_CATEGORY, 0, []))
+        return results
+
+    # ---------- 训练 ----------
+
+    def fit(
+        self,
+        documents: Sequence[Sequence[str]],
+        labels: Sequence[Sequence[str]],
+        epochs: int = 300,
+        learning_rate: float = 1.0,
+        l2: float = 0.01
+    ) -> "CategoryClassifier":
+        """
+        在已标注的文章上训练（逐分类的逻辑回归，全批量梯度下降）
+
+        Args:
+            documents: 各文章命中的词
+            labels: 各文章的分类（可以有多个；"其他" 或空列表表示不属于任何分类）
+            l2: L2 正则系数（权重向词表先验收缩）
+        """
+        X = self.matrix(documents)
+        Y = [[1.0 if category in set(doc_labels) else 0.0 for category in self.categories] for doc_labels in labels]
+        n = max(X.rows, 1)
+        np = _np()
+
+        if np is not None:
+            W, b = np.asarray(self.weights, dtype=float), np.asarray(self.bias, dtype=float)
+            prior, Y = np.asarray(self._prior, dtype=float), np.asarray(Y, dtype=float).reshape(X.rows, len(self.categories))
+            rows = np.repeat(np.arange(X.rows), np.diff(np.asarray(X.indptr)))
+            indices, data = np.asarray(X.indices), np.asarray(X.data)
+            for _ in range(epochs):
+                residual = 1 / (1 + np.exp(-self._decision_numpy(np, X, W, b))) - Y
+                grad_W = np.zeros_like(W)
+                np.add.at(grad_W, indices, data[:, None] * residual[rows])
+                W -= learning_rate * (grad_W / n + l2 * (W - prior))
+                b -= learning_rate * residual.mean(axis=0)
+            self.weights, self.bias = W.tolist(), b.tolist()
+        else:
+            W, b = [list(row) for row in self.weights], list(self.bias)
+            for _ in range(epochs):
+                scores = self.decision(X, W, b)
+                grad_W = [[0.0] * len(b) for _ in W]
+                grad_b = [0.0] * len(b)
+                for i in range(X.rows):
+                    residual = [_sigmoid(s) - y for s, y in zip(scores[i], Y[i])]
+                    for c, r in enumerate(residual):
+                        grad_b[c] += r
+                    for k in range(X.indptr[i], X.indptr[i + 1]):
+                        g = grad_W[X.indices[k]]
+                        d = X.data[k]
+                        for c, r in enumerate(residual):
+                            g[c] += d * r
+                for t, row in enumerate(W):
+                    for c in range(len(b)):
+                        row[c] -= learning_rate * (grad_W[t][c] / n + l2 * (row[c] - self._prior[t][c]))
+                b = [bc - learning_rate * g / n for bc, g in zip(b, grad_b)]
+            self.weights, self.bias = W, b
+
+        self.trained = True
+        return self
@@ -0,0 +1,57 @@
+"""组件容器 - 在同一个（热）进程内复用抓取器、分析器、渲染器等对象"""
+import threading
+from typing import Any, Callable, Dict
+
+import metrics
+
+
+class Components:
+    """
+    进程级组件容器
+
+    每个组件在首次使用时构建一次，之后同一进程内的请求直接复用
+    （关键词表、Jinja2 环境与模板缓存、HTTP 连接池等都随之保留）。
+    组件本身不保存单次运行的状态：摄取索引、本次抓取的源等都作为参数传入，
+    因此可以在多次调用之间共享。
+    """
+
+    def __init__(self):
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        取得组件，不存在时用 factory 构建
+
+        Args:
+            name: 组件名称
+            factory: 无参构建函数（通常是类本身）
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            # 双重检查：等锁期间可能已被其他线程构建
+            instance = self._instances.get(name)
+            if instance is None:
+                with metrics.timer("components.build"):
+                    instance = factory()
+                metrics.incr("components_built")
+                self._instances[name] = instance
+        return instance
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._instances
+
+    def reset(self):
+        """丢弃所有组件（配置变更或测试时使用）"""
+        with self._lock:
+            self._instances.clear()
+
+
+_components = Components()
+
+
+def shared() -> Components:
+    """进程内共享的组件容器"""
+    return _components
@@ -0,0 +1,27 @@
+"""路径配置 - 各模块共用的目录"""
+import os
+
+# 项目根目录（utils/ 下的模块副本也指向这里）
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def data_dir() -> str:
+    """数据目录，可用 DAILY_AI_NEWS_DATA_DIR 覆盖（serverless 环境只有 /tmp 可写，但 /tmp 不跨实例共享，见 README）"""
+    return os.environ.get("DAILY_AI_NEWS_DATA_DIR") or os.path.join(BASE_DIR, "data")
+
+
+def articles_path(date_str: str) -> str:
+    """某天文章文件的路径（date_str 为 YYYY-MM-DD）"""
+    return os.path.join(data_dir(), f"articles_{date_str}.json")
+
+
+def articles_log_path(date_str: str) -> str:
+    """某天文章追加日志的路径（见 journal.ArticleJournal）"""
+    return os.path.join(data_dir(), f"articles_{date_str}.jsonl")
+
+
+def state_path(name: str) -> str:
+    """运行状态文件路径（位于数据目录下的 state/）"""
+    path = os.path.join(data_dir(), "state")
+    os.makedirs(path, exist_ok=True)
+    return os.path.join(path, name)
@@ -0,0 +1,41 @@
+"""日期解析工具 - RSS/Atom 发布时间与 API 查询参数中的时间"""
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def parse_pub_date(text: str) -> Optional[datetime]:
+    """解析条目发布时间（RSS 的 RFC 822 格式或 Atom 的 ISO 8601 格式），统一为 UTC"""
+    text = (text or "").strip()
+    if not text:
+        return None
+    try:
+        dt = parsedate_to_datetime(text)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def parse_query_time(text: str, end_of_day: bool = False) -> datetime:
+    """
+    解析查询参数中的时间（YYYY-MM-DD 或 ISO 8601），统一为 UTC
+
+    Args:
+        end_of_day: 只给出日期时取次日零点（用于 until，使当天包含在内）
+
+    Raises:
+        ValueError: 格式无法识别
+    """
+    text = (text or "").strip()
+    if len(text) == 10:
+        dt = datetime.strptime(text, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+        return dt + timedelta(days=1) if end_of_day else dt
+    dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
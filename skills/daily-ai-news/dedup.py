@@ -0,0 +1,303 @@
+"""去重模块 - 基于 MinHash/LSH 将多个来源的同一报道聚类合并"""
+import math
+import random
+import zlib
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from fulltext import tokenize
+import metrics
+
+# 签名长度 = 分段数 × 每段行数；LSH 的候选阈值约为 (1/BANDS) ** (1/ROWS) ≈ 0.09，
+# 低于合并阈值，改写过的报道也能成为候选，候选对再用精确的相似度确认。
+# 一篇文章约 60 个 shingle，签名中大半是致密化填充的桶，分段多一些才能稳定找到改写
+NUM_BINS = 256
+BANDS = 128
+ROWS = 2
+
+# 词级 shingle 长度：不同媒体改写同一报道时很少保留相同的连续短语，
+# 只比较实词本身（英文去掉常用词，中文为相邻二字组，见 fulltext.tokenize）
+SHINGLE_SIZE = 1
+
+# 新闻稿的通用词（融资、发布类报道都会用到），不作为 shingle：
+# 两篇不同公司的融资新闻只在这些词上重合，不应被合并
+GENERIC_TERMS = frozenset({
+    "announced", "announces", "available", "billion", "closed", "company", "companies", "free",
+    "funding", "investors", "launched", "launches", "led", "million", "new", "now", "raised",
+    "raises", "released", "releases", "round", "said", "says", "series", "startup", "today",
+    "users", "valuation", "valued", "valuing",
+})
+
+# 不同来源的两篇文章相似度达到该值即合并（相似度见 StoryDeduplicator.similarity）；
+# 同一新闻的改写约为 0.21 ~ 0.55，同一公司、同一话题的不同新闻一般低于 0.14（见 bench/dedup_quality.py 输出的余量）
+SIMILARITY_THRESHOLD = 0.19
+
+# 正文相似度低于该值时不计标题：标题短，不同新闻的标题共有一两个少见词（公司名）时标题相似度就很高，
+# 只靠标题会把大批文章中不相关的报道合并；同一新闻的改写正文相似度都在 0.19 以上
+MIN_BODY_SIMILARITY = 0.1
+
+# 签名只由不超过该篇数的文章共有的 shingle 计算：无关的文章主要通过常见词落入相同的 LSH 桶，
+# 去掉常见词后只有共有较少见的词（公司名、产品名、数字）的文章才可能成为候选，
+# 每篇文章的候选数有上限，不随一批文章的总数增长；篇数不超过该值的批次不受影响
+MAX_SIGNATURE_DF = 50
+
+# 去掉常见词后剩下的 shingle 少于该数时，改用文档频率最低的这么多个（当天热点的报道全是常见词也能找到候选）
+MIN_SIGNATURE_SHINGLES = 8
+
+# 一批文章不少于该篇数时才按 IDF 加权（篇数太少时文档频率没有意义，共有的词反而被压低）
+MIN_IDF_ARTICLES = 10
+
+# 同一来源的两篇文章只在几乎相同时合并（同一媒体的栏目、周报共用大段模板文字）
+SAME_SOURCE_THRESHOLD = 0.5
+
+# 同一个 LSH 桶中最多比对的成员数，防止退化为两两比较
+MAX_BUCKET_COMPARISONS = 32
+
+# 每篇文章最多比对的候选数：词汇很少、所有词都常见的一批文章（如合成语料）几乎落入所有相同的桶，
+# 只比对前面这些候选；真实数据中每篇文章的候选一般不超过 20 个
+MAX_CANDIDATES = 64
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_EMPTY = _MASK64
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> set:
+    """把文本切成词级 shingle 并哈希为 64 位整数"""
+    words = [word for word in tokenize(text) if word not in GENERIC_TERMS]
+    # 短文本整体作为一个 shingle
+    size = min(size, len(words))
+    hashes = set()
+    for i in range(len(words) - size + 1 if size else 0):
+        h = zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        hashes.add((h * _GOLDEN) & _MASK64)
+    return hashes
+
+
+def minhash_signature(hashes: set, num_bins: int = NUM_BINS) -> Optional[tuple]:
+    """
+    计算 MinHash 签名（单次排列哈希 + 致密化填充）
+
+    每个 shingle 只哈希一次：低位决定分桶，高位作为桶内取最小值的键。
+    空桶按各自固定的伪随机顺序借用第一个非空桶，保证签名长度固定。
+    （都向后借用最近的非空桶时，两篇文章共有的一个常见词会填满其后一连串空桶，
+    大量无关的文章落入相同的 LSH 桶）
+    """
+    if not hashes:
+        return None
+
+    signature = [_EMPTY] * num_bins
+    for h in hashes:
+        index = h % num_bins
+        value = h >> 8
+        if value < signature[index]:
+            signature[index] = value
+
+    filled = list(signature)
+    for i, order in enumerate(_probe_orders(num_bins)):
+        if signature[i] == _EMPTY:
+            for offset, j in enumerate(order, 1):
+                if signature[j] != _EMPTY:
+                    # 借用时加上探查次数，避免不同文档借用到同一值而被误判为相同
+                    filled[i] = signature[j] + offset
+                    break
+    return tuple(filled)
+
+
+@lru_cache(maxsize=None)
+def _probe_orders(num_bins: int) -> Tuple[Tuple[int, ...], ...]:
+    """每个桶的借用顺序（固定种子，所有文档相同）"""
+    return tuple(tuple(random.Random(i).sample(range(num_bins), num_bins)) for i in range(num_bins))
+
+
+def estimate_similarity(a: tuple, b: tuple) -> float:
+    """用签名估计 Jaccard 相似度"""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+def idf_weights(counts: Counter, total: int) -> Dict[int, float]:
+    """
+    一批文章中各 shingle 的权重（平滑的 IDF）
+
+    Args:
+        counts: 各 shingle 出现的文章数
+        total: 文章总数
+
+    当天很多文章都出现的词（模型、推理、发布等）权重低，只在少数文章中出现的词（公司名、产品名）权重高。
+    篇数少于 MIN_IDF_ARTICLES 时返回空字典（不加权）。
+    """
+    if total < MIN_IDF_ARTICLES:
+        return {}
+    return {h: math.log((total + 1) / (count + 1)) + 1 for h, count in counts.items()}
+
+
+def weigh(hashes: set, weights: Optional[Dict[int, float]] = None) -> Tuple[set, float]:
+    """(shingle 集合, 权重和)；没有权重时每个 shingle 计 1，有权重时须包含集合中的全部 shingle"""
+    total = sum(map(weights.__getitem__, hashes)) if weights else float(len(hashes))
+    return hashes, total
+
+
+def weighted_jaccard(a: Tuple[set, float], b: Tuple[set, float], weights: Optional[Dict[int, float]] = None) -> float:
+    """
+    加权 Jaccard 相似度：交集权重和 / 并集权重和，没有权重时即普通 Jaccard
+
+    a、b 为 weigh 的结果：并集权重和由两边的权重和减去交集得到，只需对交集求和。
+    """
+    common = a[0] & b[0]
+    if not common:
+        return 0.0
+    shared = sum(map(weights.__getitem__, common)) if weights else float(len(common))
+    return shared / (a[1] + b[1] - shared)
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, x: int) -> int:
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            # 保留输入顺序靠前的文章作为根
+            if rb < ra:
+                ra, rb = rb, ra
+            self.parent[rb] = ra
+
+
+class StoryDeduplicator:
+    """
+    近重复报道聚类器
+
+    LSH 分桶只用于找候选对；候选对按精确的相似度确认:
+    max(正文的加权 Jaccard, (标题加权 Jaccard + 2 × 正文加权 Jaccard) / 3)，权重为本批文章上的 IDF，
+    改写后正文重合不多、但标题抓住了同一主体（模型名、公司名）的报道也能合并；
+    正文相似度低于 MIN_BODY_SIMILARITY 时只看正文。
+    """
+
+    def __init__(
+        self,
+        num_bins: int = NUM_BINS,
+        bands: int = BANDS,
+        threshold: float = SIMILARITY_THRESHOLD,
+        shingle_size: int = SHINGLE_SIZE,
+        same_source_threshold: float = SAME_SOURCE_THRESHOLD
+    ):
+        if bands * (num_bins // bands) != num_bins:
+            raise ValueError("num_bins 必须能被 bands 整除")
+        self.num_bins = num_bins
+        self.bands = bands
+        self.rows = num_bins // bands
+        self.threshold = threshold
+        self.same_source_threshold = same_source_threshold
+        self.shingle_size = shingle_size
+
+    def _text(self, article: Dict) -> str:
+        return f"{article.get('title', '')} {article.get('text', '')}"
+
+    def _shingles(self, article: Dict) -> Tuple[set, set]:
+        """(正文 shingle, 标题 shingle)"""
+        return (shingle_hashes(self._text(article), self.shingle_size),
+                shingle_hashes(article.get("title", ""), self.shingle_size))
+
+    @staticmethod
+    def similarity(a: Tuple, b: Tuple, weights: Optional[Dict[int, float]] = None) -> float:
+        """两篇文章的相似度（a、b 为正文、标题 shingle 各自 weigh 的结果）"""
+        body = weighted_jaccard(a[0], b[0], weights)
+        if body < MIN_BODY_SIMILARITY:
+            return body
+        return max(body, (2 * body + weighted_jaccard(a[1], b[1], weights)) / 3)
+
+    @staticmethod
+    def _signature_shingles(body: set, counts: Counter) -> set:
+        """计算签名用的 shingle：去掉超过 MAX_SIGNATURE_DF 篇文章共有的，至少保留 MIN_SIGNATURE_SHINGLES 个"""
+        rare = {h for h in body if counts[h] <= MAX_SIGNATURE_DF}
+        if len(rare) < MIN_SIGNATURE_SHINGLES <= len(body):
+            rare = set(sorted(body, key=lambda h: (counts[h], h))[:MIN_SIGNATURE_SHINGLES])
+        return rare or body
+
+    def _threshold(self, a: Dict, b: Dict) -> float:
+        same = a.get("source") and a.get("source") == b.get("source")
+        return self.same_source_threshold if same else self.threshold
+
+    def cluster(self, articles: List[Dict]) -> List[List[int]]:
+        """
+        对文章聚类
+
+        Returns:
+            每个簇的文章下标列表（按输入顺序），簇按首篇文章的位置排序
+        """
+        shingles = [self._shingles(a) for a in articles]
+        # 标题 shingle 一般都在正文中，合并后统计保证每个 shingle 都有权重
+        counts = Counter(h for body, title in shingles for h in body | title)
+        signatures = [minhash_signature(self._signature_shingles(body, counts), self.num_bins) for body, _ in shingles]
+        weights = idf_weights(counts, len(articles))
+        profiles = [(weigh(body, weights), weigh(title, weights)) for body, title in shingles]
+        union_find = _UnionFind(len(articles))
+        buckets = defaultdict(list)
+
+        for index, signature in enumerate(signatures):
+            if signature is None:
+                continue
+            # 同一对文章常落在多个相同的桶中，只比较一次
+            compared = set()
+            for band in range(self.bands):
+                key = (band, signature[band * self.rows:(band + 1) * self.rows])
+                members = buckets[key]
+                for other in members[:MAX_BUCKET_COMPARISONS]:
+                    if union_find.find(other) == union_find.find(index):
+                        break
+                    if other in compared:
+                        continue
+                    if len(compared) >= MAX_CANDIDATES:
+                        break
+                    compared.add(other)
+                    if self.similarity(profiles[index], profiles[other], weights) >= \
+                            self._threshold(articles[index], articles[other]):
+                        union_find.union(other, index)
+                        break
+                members.append(index)
+
+        clusters = defaultdict(list)
+        for index in range(len(articles)):
+            clusters[union_find.find(index)].append(index)
+        return [clusters[root] for root in sorted(clusters)]
+
+    def dedupe(self, articles: List[Dict]) -> List[Dict]:
+        """
+        合并同一报道的多个副本
+
+        每个簇保留输入顺序中的第一篇，附加:
+            sources: [{source, url, title}]  簇内所有来源的链接
+            cluster_size: 簇大小（计入热度）
+
+        已合并过的文章（如当天已保存的）保留之前合并进来的来源和簇大小，
+        重复去重结果不变，新抓取的文章可以与已保存的文章一起去重。
+        """
+        with metrics.span("dedup", count=len(articles)):
+            merged = []
+            for members in self.cluster(articles):
+                primary = articles[members[0]]
+                sources = []
+                seen_urls = set()
+                for index in members:
+                    article = articles[index]
+                    own = {"source": article.get("source", ""), "url": article.get("url", ""),
+                           "title": article.get("title", "")}
+                    for source in article.get("sources") or [own]:
+                        url = source.get("url", "")
+                        if url in seen_urls:
+                            continue
+                        seen_urls.add(url)
+                        sources.append({"source": source.get("source", ""), "url": url, "title": source.get("title", "")})
+                primary["sources"] = sources
+                primary["cluster_size"] = sum(articles[index].get("cluster_size", 1) for index in members)
+                merged.append(primary)
+
+            metrics.incr("duplicates_merged", len(articles) - len(merged))
+            return merged
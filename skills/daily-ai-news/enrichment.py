@@ -0,0 +1,273 @@
+"""互动数据模块 - 在讨论站点等热度来源上查询文章链接，并发、限速、带 TTL 缓存，在固定时间预算内补全 metrics"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from identity import article_id
+from resilience import HostRateLimiter
+import config
+import metrics
+
+if TYPE_CHECKING:
+    import requests
+
+# 每次运行用于查询的时间预算（秒），可用 DAILY_AI_NEWS_ENRICH_BUDGET 覆盖，0 表示不查询
+ENRICH_BUDGET = 5.0
+
+# 并发查询数
+MAX_WORKERS = 8
+
+# 查询结果（含"没有找到"）的缓存时长（秒）
+CACHE_TTL = 3600
+
+# 缓存的最大条目数（超出后先丢弃已过期的，仍超出时清空）
+CACHE_SIZE = 8192
+
+# 连接超时；读取超时不超过剩余预算
+CONNECT_TIMEOUT = 3
+
+# 补全的 metrics 字段
+METRIC_FIELDS = ("like_count", "retweet_count", "reply_count")
+
+
+class EngagementProvider:
+    """
+    热度来源
+
+    子类实现 lookup()：按文章链接查询，返回 metrics 字段的计数（见 METRIC_FIELDS），
+    没有找到时返回 None，请求失败时抛出 requests 的异常（不缓存，下次运行重试）。
+    rate / burst 为对该来源的限速（每秒请求数 / 突发数）。
+    """
+
+    name = ""
+    base_url = ""
+    rate = 1.0
+    burst = 5
+
+    def lookup(self, session: "requests.Session", url: str, timeout: Tuple[float, float]) -> Optional[Dict[str, int]]:
+        raise NotImplementedError
+
+
+class HackerNewsProvider(EngagementProvider):
+    """
+    Hacker News（Algolia 搜索 API）
+
+    按链接检索讨论帖，只计入链接规范化后与文章一致的帖子:
+    points 计入 like_count，评论数计入 reply_count，同一链接被重复提交的次数计入 retweet_count。
+    base_url 可用 DAILY_AI_NEWS_HN_API 覆盖（如指向本地桩服务）。
+    """
+
+    name = "hn"
+    BASE_URL = "https://hn.algolia.com/api/v1"
+    # Algolia 对单个 IP 限制每小时 10000 次
+    rate = 2.5
+    burst = 10
+
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = (base_url or os.environ.get("DAILY_AI_NEWS_HN_API") or self.BASE_URL).rstrip("/")
+
+    def lookup(self, session: "requests.Session", url: str, timeout: Tuple[float, float]) -> Optional[Dict[str, int]]:
+        response = session.get(
+            f"{self.base_url}/search",
+            params={"query": url, "restrictSearchableAttributes": "url", "tags": "story", "hitsPerPage": 20},
+            timeout=timeout
+        )
+        response.raise_for_status()
+        target = article_id(url)
+        hits = [hit for hit in response.json().get("hits", []) if hit.get("url") and article_id(hit["url"]) == target]
+        if not hits:
+            return None
+        return {
+            "like_count": sum(hit.get("points") or 0 for hit in hits),
+            "retweet_count": len(hits) - 1,
+            "reply_count": sum(hit.get("num_comments") or 0 for hit in hits)
+        }
+
+
+class EngagementEnricher:
+    """
+    互动数据补全
+
+    对每篇文章（含去重合并进来的其他来源的链接）逐个来源查询，结果按 (来源, 文章 ID) 缓存 CACHE_TTL 秒。
+    未命中缓存的查询并发执行（每个来源单独限速），整个阶段不超过时间预算：
+    预算用完时尚未完成的查询被放弃，对应文章保留原有的 metrics，下次运行再查。
+    同一篇文章在各链接、各来源上的计数相加后写入 article["metrics"]。
+
+    缓存默认只保存在内存中；用 EngagementEnricher.load() 创建时持久化到 state/engagement.json，
+    跨运行复用。
+    """
+
+    CACHE_FILE = "engagement.json"
+
+    def __init__(
+        self,
+        providers: Optional[Sequence[EngagementProvider]] = None,
+        budget: Optional[float] = None,
+        workers: int = MAX_WORKERS,
+        ttl: float = CACHE_TTL,
+        cache: Optional[Dict[str, List]] = None,
+        path: Optional[str] = None
+    ):
+        """
+        Args:
+            providers: 热度来源，默认为 Hacker News
+            budget: 每次运行的时间预算（秒），默认为 ENRICH_BUDGET
+            cache: 已有的缓存 {"来源|文章 ID": [过期时间戳, 结果]}
+            path: 缓存文件路径，为空时只保存在内存中
+        """
+        self.providers = list(providers) if providers is not None else [HackerNewsProvider()]
+        if budget is None:
+            budget = float(os.environ.get("DAILY_AI_NEWS_ENRICH_BUDGET") or ENRICH_BUDGET)
+        self.budget = budget
+        self.workers = workers
+        self.ttl = ttl
+        self.cache = cache or {}
+        self.path = path
+        self._limiters = {provider.name: HostRateLimiter(provider.rate, provider.burst) for provider in self.providers}
+        self._session = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls) -> "EngagementEnricher":
+        path = config.state_path(cls.CACHE_FILE)
+        cache = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    cache = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"   ⚠️  读取互动数据缓存失败: {e}")
+        return cls(cache=cache, path=path)
+
+    def _http(self) -> "requests.Session":
+        """HTTP 会话（首次查询时创建，实例复用时连接池随之复用）"""
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.workers)
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+        return self._session
+
+    @staticmethod
+    def _urls(article: Dict) -> List[str]:
+        """文章及去重合并进来的其他来源的链接"""
+        urls = [article.get("url", "")] + [source.get("url", "") for source in article.get("sources", [])]
+        return [url for url in dict.fromkeys(urls) if url]
+
+    def enrich(self, articles: List[Dict]) -> int:
+        """
+        补全一批文章的 metrics，返回找到互动数据的文章数
+
+        Returns:
+            在任一来源上找到讨论的文章数
+        """
+        if not articles or not self.providers or self.budget <= 0:
+            return 0
+
+        with metrics.span("enrich", count=len(articles)):
+            now = time.time()
+            results: Dict[str, Optional[Dict[str, int]]] = {}
+            pending: Dict[str, Tuple[EngagementProvider, str]] = {}
+            for article in articles:
+                for url in self._urls(article):
+                    for provider in self.providers:
+                        key = f"{provider.name}|{article_id(url)}"
+                        if key in results or key in pending:
+                            continue
+                        entry = self.cache.get(key)
+                        if entry is not None and entry[0] > now:
+                            results[key] = entry[1]
+                        else:
+                            pending[key] = (provider, url)
+            metrics.incr("enrich_cached", len(results))
+
+            if pending:
+                fetched = self._lookup_all(pending)
+                expires = time.time() + self.ttl
+                for key, result in fetched.items():
+                    self.cache[key] = [expires, result]
+                results.update(fetched)
+                self._prune(now)
+
+            enriched = 0
+            for article in articles:
+                totals = dict.fromkeys(METRIC_FIELDS, 0)
+                found = False
+                for url in self._urls(article):
+                    for provider in self.providers:
+                        counts = results.get(f"{provider.name}|{article_id(url)}")
+                        if counts:
+                            found = True
+                            for field in METRIC_FIELDS:
+                                totals[field] += counts.get(field, 0)
+                if found:
+                    article["metrics"] = {**(article.get("metrics") or {}), **totals}
+                    enriched += 1
+            metrics.incr("articles_enriched", enriched)
+            return enriched
+
+    def _lookup_all(self, pending: Dict[str, Tuple[EngagementProvider, str]]) -> Dict[str, Optional[Dict[str, int]]]:
+        """在时间预算内并发查询，返回已完成的结果（失败和超时的不在其中）"""
+        deadline = time.monotonic() + self.budget
+        session = self._http()
+        fetched = {}
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {
+                executor.submit(self._lookup, session, provider, url, deadline): key
+                for key, (provider, url) in pending.items()
+            }
+            remaining = set(futures)
+            failures = []
+            while remaining:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                done, remaining = wait(remaining, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        fetched[futures[future]] = future.result()
+                    except Exception as e:
+                        failures.append(e)
+            metrics.incr("enrich_looked_up", len(fetched))
+            if failures:
+                metrics.incr("enrich_failed", len(failures))
+                print(f"   ⚠️  {len(failures)} 个互动数据查询失败: {str(failures[0])[:100]}")
+            if remaining:
+                metrics.incr("enrich_timed_out", len(remaining))
+                print(f"   ⚠️  互动数据查询超出时间预算（{self.budget:g} 秒），{len(remaining)} 个查询留到下次")
+        finally:
+            # 不等待仍在进行的查询：未开始的直接取消，进行中的在各自的超时后结束
+            executor.shutdown(wait=False, cancel_futures=True)
+        return fetched
+
+    def _lookup(self, session, provider: EngagementProvider, url: str, deadline: float) -> Optional[Dict[str, int]]:
+        self._limiters[provider.name].wait(provider.base_url)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("超出时间预算")
+        return provider.lookup(session, url, (min(CONNECT_TIMEOUT, remaining), remaining))
+
+    def _prune(self, now: float):
+        if len(self.cache) <= CACHE_SIZE:
+            return
+        self.cache = {key: entry for key, entry in self.cache.items() if entry[0] > now}
+        if len(self.cache) > CACHE_SIZE:
+            self.cache = {}
+
+    def save(self):
+        """写回缓存（去掉已过期的条目，先写临时文件再重命名）；未指定路径时只保存在内存中"""
+        if not self.path:
+            return
+        now = time.time()
+        with self._lock:
+            self.cache = {key: entry for key, entry in self.cache.items() if entry[0] > now}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
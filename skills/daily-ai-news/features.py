@@ -0,0 +1,186 @@
+"""文章特征模块 - 每篇文章只分词、扫描一次，抓取、分析、翻译各阶段共用，并随文章一起保存"""
+import hashlib
+import json
+import re
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from relevance import RelevanceScorer, TermMatcher, tokenize
+
+# 特征格式版本；提取逻辑变化时递增，已保存的旧特征会被重新计算
+FEATURES_VERSION = 2
+
+# 内存中缓存的特征数（按内容哈希，超出后清空）
+FEATURE_CACHE_SIZE = 4096
+
+# 汉字占比超过该值视为中文内容，无需翻译
+CJK_MAJORITY = 0.5
+
+HASHTAG_PATTERN = re.compile(r'#(\w+)')
+MENTION_PATTERN = re.compile(r'@(\w+)')
+URL_PATTERN = re.compile(r'https?://[^\s]+')
+
+
+def content_digest(text: str) -> str:
+    """文章正文的内容哈希（特征的缓存键）"""
+    return hashlib.blake2b((text or "").encode("utf-8"), digest_size=8).hexdigest()
+
+
+class ArticleFeatures:
+    """
+    一篇文章的特征
+
+    持久化的字段:
+        digest: 正文内容哈希
+        cjk_ratio: 汉字在文字中的占比（判断是否需要翻译）
+        relevance: AI 相关性分数（见 relevance.RelevanceScorer）
+        terms: 命中的分类词表中的词（分类器的稀疏输入，见 classifier.CategoryClassifier）
+        tags, mentions, urls: 话题标签、@提及、链接
+
+    text_lower 和 tokens 只在本次提取时保留在内存中，不写入文件。
+    """
+
+    __slots__ = ("digest", "cjk_ratio", "relevance", "terms", "tags", "mentions", "urls",
+                 "text_lower", "tokens")
+
+    def __init__(
+        self,
+        digest: str,
+        cjk_ratio: float,
+        relevance: float,
+        terms: List[str],
+        tags: List[str],
+        mentions: List[str],
+        urls: List[str],
+        text_lower: Optional[str] = None,
+        tokens: Optional[List[str]] = None
+    ):
+        self.digest = digest
+        self.cjk_ratio = cjk_ratio
+        self.relevance = relevance
+        self.terms = terms
+        self.tags = tags
+        self.mentions = mentions
+        self.urls = urls
+        self.text_lower = text_lower
+        self.tokens = tokens
+
+    def to_dict(self, version: str) -> Dict:
+        return {
+            "v": version,
+            "digest": self.digest,
+            "cjk_ratio": self.cjk_ratio,
+            "relevance": self.relevance,
+            "terms": self.terms,
+            "tags": self.tags,
+            "mentions": self.mentions,
+            "urls": self.urls
+        }
+
+    @property
+    def mostly_chinese(self) -> bool:
+        return self.cjk_ratio > CJK_MAJORITY
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ArticleFeatures":
+        return cls(
+            data["digest"], data["cjk_ratio"], data["relevance"], data["terms"],
+            data["tags"], data["mentions"], data["urls"]
+        )
+
+
+class FeatureExtractor:
+    """
+    特征提取与缓存
+
+    同一正文只提取一次：先查内存缓存，再查文章中保存的特征（版本和内容哈希都一致才使用），
+    都没有时才分词计算。版本由 FEATURES_VERSION 和关键词表的指纹组成，
+    修改相关性词表或分类关键词后，已保存的特征会自动失效。
+    """
+
+    def __init__(self, vocabulary: Iterable[str], relevance: Optional[RelevanceScorer] = None):
+        """
+        Args:
+            vocabulary: 分类词表中的所有词（中英文，英文按整词匹配）
+            relevance: AI 相关性打分器
+        """
+        self.relevance = relevance or RelevanceScorer()
+        vocabulary = sorted(set(vocabulary))
+        self._terms = TermMatcher(dict.fromkeys(vocabulary, 1.0))
+        fingerprint = hashlib.blake2b(json.dumps(
+            [vocabulary, self.relevance.fingerprint()], ensure_ascii=False, sort_keys=True
+        ).encode("utf-8"), digest_size=4).hexdigest()
+        self.version = f"{FEATURES_VERSION}-{fingerprint}"
+        self._cache: Dict[str, ArticleFeatures] = {}
+        self._lock = threading.Lock()
+
+    def extract(self, text: str, digest: Optional[str] = None) -> ArticleFeatures:
+        """提取正文的特征（按内容哈希缓存）"""
+        digest = digest or content_digest(text)
+        cached = self._cache.get(digest)
+        if cached is not None:
+            return cached
+
+        text = text or ""
+        text_lower = text.lower()
+        tokens = tokenize(text)
+        cjk = sum(len(token) for token in tokens if token[0] > "\x7f")
+        letters = sum(len(token) for token in tokens)
+        features = ArticleFeatures(
+            digest=digest,
+            cjk_ratio=round(cjk / letters, 3) if letters else 0.0,
+            relevance=self.relevance.score_tokens(tokens),
+            terms=sorted(self._terms.hits(tokens)),
+            tags=HASHTAG_PATTERN.findall(text),
+            mentions=MENTION_PATTERN.findall(text),
+            urls=URL_PATTERN.findall(text),
+            text_lower=text_lower,
+            tokens=tokens
+        )
+        self._remember(features)
+        return features
+
+    def for_article(self, article: Dict) -> ArticleFeatures:
+        """
+        文章的特征
+
+        优先使用文章中保存的特征；重新计算时写回 article["features"]，随文章一起保存。
+        """
+        text = article.get("text", "")
+        digest = content_digest(text)
+        stored = article.get("features")
+        if stored and stored.get("v") == self.version and stored.get("digest") == digest:
+            features = self._cache.get(digest)
+            if features is None:
+                features = ArticleFeatures.from_dict(stored)
+                self._remember(features)
+            return features
+
+        features = self.extract(text, digest)
+        article["features"] = features.to_dict(self.version)
+        return features
+
+    def _remember(self, features: ArticleFeatures):
+        with self._lock:
+            if len(self._cache) >= FEATURE_CACHE_SIZE:
+                self._cache.clear()
+            self._cache[features.digest] = features
+
+
+_extractor: Optional[FeatureExtractor] = None
+_lock = threading.Lock()
+
+
+def get_extractor() -> FeatureExtractor:
+    """进程内共享的特征提取器（抓取器和分析器共用同一份缓存）"""
+    global _extractor
+    if _extractor is None:
+        with _lock:
+            if _extractor is None:
+                # 分类词表属于分析器；在此延迟导入，避免 analyzer ↔ features 循环导入
+                from analyzer import ArticleAnalyzer
+
+                _extractor = FeatureExtractor(
+                    term for terms in ArticleAnalyzer.category_terms().values() for term in terms
+                )
+    return _extractor
@@ -1,176 +1,347 @@
 """内容抓取模块 - 从科技媒体 RSS 抓取 AI 相关新闻"""
-import os
-import json
-import re
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-import requests
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 from translator import MockTranslator
+from textclean import html_to_text
+from dates import parse_pub_date
+from identity import article_id
+from features import ArticleFeatures, get_extractor
+from ingest import IngestIndex
+from journal import ArticleJournal
+from resilience import HostRateLimiter, RetryPolicy, SourceHealth
+from sources import SourceRegistry, get_registry
+import config
+import metrics
+
+# requests 和 bs4 只在实际抓取时导入，读取已保存数据的路径无需加载
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
+
+# 连接超时短一些，不可达的源尽快失败；读取超时留给响应慢但正常的源
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 20
+
+# 翻译缓存的最大条目数（实例在热进程中长期复用，超出后清空）
+TRANSLATION_CACHE_SIZE = 4096
 
 
 class TechNewsFetcher:
     """科技新闻内容抓取器"""
     """科技新闻内容抓取器"""
 
-    def __init__(self):
-        # 科技媒体 RSS 源
-        self.rss_sources = [
-            {
-                "name": "TechCrunch",
-                "url": "https://techcrunch.com/category/artificial-intelligence/feed/",
-                "category": "科技媒体"
-            },
-            {
-                "name": "The Verge",
-                "url": "https://www.theverge.com/rss/artificial-intelligence/index.xml",
-                "category": "科技媒体"
-            },
-            {
-                "name": "VentureBeat",
-                "url": "https://venturebeat.com/category/ai/feed/",
-                "category": "科技媒体"
-            },
-            {
-                "name": "MIT Technology Review",
-                "url": "https://www.technologyreview.com/feed/",
-                "category": "科技媒体"
-            },
-            {
-                "name": "AI News",
-                "url": "https://artificialintelligence-news.com/feed/",
-                "category": "AI 专业"
-            }
-        ]
+    def __init__(self, health: Optional[SourceHealth] = None, registry: Optional[SourceRegistry] = None):
+        """
+        Args:
+            health: 源健康记录（熔断器），默认只保存在内存中；
+                    用 SourceHealth.load() 传入时跨运行记住失败的源
+            registry: 数据源注册表，默认为进程内共享的注册表
+        """
+        # RSS 源（见 sources.SourceRegistry）
+        self.registry = registry or get_registry()
+        self.rss_sources = list(self.registry.sources)
 
-        # AI 相关关键词（用于过滤）
-        self.ai_keywords = [
-            "AI", "artificial intelligence", "人工智能", "machine learning", "机器学习",
-            "deep learning", "深度学习", "neural network", "神经网络", "LLM", "GPT",
-            "Claude", "ChatGPT", "openai", "google deepmind", "gemini", "copilot",
-            "midjourney", "stable diffusion", "diffusion model", "transformer",
-            "generative", "生成式", "reinforcement learning", "强化学习",
-            "computer vision", "nlp", "natural language processing", "robotics",
-            "autonomous", "automation", "智能", "大模型", "agentic", "多模态"
-        ]
+        # 文章特征（分词、AI 相关性打分等，每篇只计算一次，分析阶段复用，见 features.FeatureExtractor）
+        self.features = get_extractor()
+        self.relevance = self.features.relevance
 
         # 请求头
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
         }
 
+        # 熔断、限速与重试
+        self.health = health or SourceHealth()
+        self.rate_limiter = HostRateLimiter()
+        self.retry = RetryPolicy()
+
+        # HTTP 会话（首次抓取时创建，实例复用时连接池随之复用）
+        self._session = None
+
         # 翻译器
         self.translator = MockTranslator()
 
+        # 翻译缓存（标题 + 摘要 -> 翻译结果）
+        self._translation_cache = {}
+
     def _is_ai_related(self, text: str) -> bool:
-        """判断内容是否与 AI 相关"""
+        """判断内容是否与 AI 相关（见 relevance.RelevanceScorer）"""
         if not text:
             return False
-        text_lower = text.lower()
-        return any(keyword.lower() in text_lower for keyword in self.ai_keywords)
+        return self.relevance.is_relevant(text)
+
+    def _http(self) -> "requests.Session":
+        """共享的 HTTP 会话"""
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
+    def _download(self, url: str, headers: Dict[str, str], timeout: float = READ_TIMEOUT) -> "requests.Response":
+        """单次请求（先等待该主机的限速令牌）"""
+        self.rate_limiter.wait(url)
+        response = self._http().get(url, headers=headers, timeout=(CONNECT_TIMEOUT, timeout))
+        response.raise_for_status()
+        return response
+
+    def _fetch_rss(
+        self,
+        url: str,
+        index: Optional[IngestIndex] = None,
+        timeout: float = READ_TIMEOUT
+    ) -> Optional["BeautifulSoup"]:
+        """
+        获取 RSS feed（传入摄取索引时发送条件请求，源未更新则返回空文档）
 
-    def _fetch_rss(self, url: str) -> Optional[BeautifulSoup]:
-        """获取 RSS feed"""
+        响应的校验值只暂存在摄取索引中，由调用方在条目处理完后提交（见 IngestIndex.commit_validators）。
+
+        熔断中的源不发请求直接返回 None；瞬时错误（连接失败、超时、429/5xx）按退避策略重试。
+        """
+        import requests
+        from bs4 import BeautifulSoup
+
+        if not self.health.allow(url):
+            metrics.incr("feeds_circuit_open")
+            print(f"   ⚠️  源已熔断，跳过: {url[:50]}...")
+            return None
+
+        headers = dict(self.headers)
+        if index is not None:
+            headers.update(index.request_headers(url))
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, "xml")
+            with metrics.span("fetch.download", url=url):
+                response = self.retry.call(
+                    lambda: self._download(url, headers, timeout),
+                    on_retry=lambda attempt, error: metrics.incr("fetch_retries")
+                )
+            self.health.record_success(url)
+            if response.status_code == 304:
+                metrics.incr("feeds_not_modified")
+                return BeautifulSoup("", "xml")
+            if index is not None:
+                index.stage_validators(url, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            metrics.incr("bytes_downloaded", len(response.content))
+            with metrics.span("parse.xml", url=url):
+                return BeautifulSoup(response.content, "xml")
         except requests.exceptions.RequestException as e:
+            metrics.incr("feeds_failed")
+            if self.health.record_failure(url, e):
+                metrics.incr("circuits_opened")
             print(f"   ⚠️  获取 RSS 失败: {url[:50]}... - {e}")
             return None
 
-    def _parse_rss_item(self, item, source_name: str) -> Optional[Dict]:
-        """解析 RSS 单个条目"""
-        try:
-            # 提取基本信息
-            title = item.find("title")
-            link = item.find("link")
-            description = item.find("description")
-            pub_date = item.find("pubDate")
-            author = item.find("author") or item.find("dc:creator")
-            category = item.find("category")
-
-            if not title or not link:
-                return None
-
-            title_text = title.get_text(strip=True)
-            link_text = link.get_text(strip=True) or link.get("href", "")
-
-            # 清理描述（移除 HTML 标签）
-            desc_text = ""
-            if description:
-                desc_soup = BeautifulSoup(description.get_text(), "html.parser")
-                desc_text = desc_soup.get_text(strip=True)[:500]  # 限制长度
-
-            # 检查是否与 AI 相关
-            if not self._is_ai_related(title_text + " " + desc_text):
-                return None
-
-            # 解析发布时间
-            pub_time = pub_date.get_text(strip=True) if pub_date else ""
-            try:
-                pub_dt = datetime.strptime(pub_time, "%a, %d %b %Y %H:%M:%S %z")
-                pub_dt = pub_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
-            except:
-                pub_dt = pub_time
-
-            # 生成中文翻译
-            translations = self.translator.generate_chinese_translation(title_text, desc_text)
-
-            return {
-                "id": link_text.split("/")[-1][:50],
-                "title": title_text,
-                "title_cn": translations["title_cn"],
-                "text": f"{title_text}\n\n{desc_text}",
-                "text_cn": translations["text_cn"],
-                "author": {
-                    "id": source_name,
-                    "username": source_name.lower().replace(" ", "_"),
-                    "name": author.get_text(strip=True) if author else source_name,
-                    "avatar": ""
-                },
-                "metrics": {
-                    "like_count": 0,
-                    "retweet_count": 0,
-                    "reply_count": 0
-                },
-                "created_at": pub_dt,
-                "url": link_text,
-                "source": source_name,
-                "category_text": category.get_text(strip=True) if category else ""
-            }
-        except Exception as e:
-            print(f"   ⚠️  解析条目失败: {e}")
+    def _clean_description(self, html: str) -> str:
+        """清理描述（移除 HTML 标签），只解析到足够生成摘要为止"""
+        return html_to_text(html, max_chars=500)  # 限制长度
+
+    def _translate(self, title: str, summary: str, features: Optional[ArticleFeatures] = None) -> Dict[str, str]:
+        """生成中文翻译（带缓存）"""
+        key = (title, summary)
+        cached = self._translation_cache.get(key)
+        if cached is not None:
+            metrics.incr("translations_cached")
+            return cached
+
+        metrics.incr("translations_missed")
+        with metrics.timer("translate"):
+            translations = self.translator.generate_chinese_translation(title, summary, features)
+        if len(self._translation_cache) >= TRANSLATION_CACHE_SIZE:
+            self._translation_cache.clear()
+        self._translation_cache[key] = translations
+        return translations
+
+    def _find_items(self, soup: "BeautifulSoup", parser: str = "auto") -> List:
+        """按源的解析方式查找条目：RSS 的 <item> 或 Atom 的 <entry>"""
+        if parser == "rss":
+            return soup.find_all("item")
+        if parser == "atom":
+            return soup.find_all("entry")
+        return soup.find_all("item") or soup.find_all("entry")
+
+    def _item_link(self, item) -> str:
+        """条目链接（RSS 为 <link> 文本，Atom 优先取 rel="alternate" 的 href）"""
+        link = item.find("link", rel="alternate") or item.find("link")
+        if not link:
+            return ""
+        return link.get_text(strip=True) or link.get("href", "")
+
+    def _item_identity(self, item) -> Tuple[str, str]:
+        """只读取条目的 GUID 和链接，用于在完整解析前查询摄取索引"""
+        guid = item.find("guid") or item.find("id")
+        return (guid.get_text(strip=True) if guid else ""), self._item_link(item)
+
+    def _item_published(self, item) -> Optional[datetime]:
+        """条目发布时间（调度器据此估计源的更新频率）"""
+        pub_date = item.find("pubDate") or item.find("published") or item.find("updated")
+        return parse_pub_date(pub_date.get_text(strip=True)) if pub_date else None
+
+    def _parse_rss_item(self, item, source_name: str, translate: bool = True) -> Optional[Dict]:
+        """
+        解析单个条目（RSS <item> 或 Atom <entry>）
+
+        Args:
+            translate: 为 False 时不生成翻译（中文源），译文直接使用原文
+
+        Returns:
+            文章；条目缺少标题或链接、与 AI 无关时返回 None（确定的过滤结果）
+
+        Raises:
+            Exception: 解析失败（由调用方计数；增量抓取时该条目不记为已处理，下次重试）
+        """
+        # 提取基本信息
+        title = item.find("title")
+        link_text = self._item_link(item)
+        description = item.find("description") or item.find("summary") or item.find("content")
+        pub_date = item.find("pubDate") or item.find("published") or item.find("updated")
+        author = item.find("author") or item.find("dc:creator")
+        category = item.find("category")
+
+        if not title or not link_text:
+            return None
+
+        title_text = title.get_text(strip=True)
+
+        # 清理描述（移除 HTML 标签）
+        desc_text = ""
+        if description:
+            with metrics.timer("parse.clean_description"):
+                desc_text = self._clean_description(description.get_text())
+
+        # 提取特征并检查是否与 AI 相关（特征随文章保存，分析阶段不再重新分词）
+        text = f"{title_text}\n\n{desc_text}"
+        with metrics.timer("filter.ai"):
+            features = self.features.extract(text)
+        if features.relevance < self.relevance.threshold:
+            metrics.incr("items_filtered_non_ai")
             return None
 
-    def fetch_by_rss(self, date: datetime = None) -> List[Dict]:
-        """使用 RSS 抓取内容"""
+        # 解析发布时间（无法解析时保留原文）
+        pub_time = pub_date.get_text(strip=True) if pub_date else ""
+        parsed = parse_pub_date(pub_time)
+        pub_dt = parsed.strftime("%Y-%m-%dT%H:%M:%SZ") if parsed else pub_time
+
+        # 生成中文翻译（内容已是中文时不翻译）
+        if translate and not features.mostly_chinese:
+            translations = self._translate(title_text, desc_text, features)
+        else:
+            translations = {"title_cn": title_text, "text_cn": desc_text}
+
+        # Atom 的作者名在 <author><name> 中，分类在 term 属性中
+        author_name = author.find("name") if author else None
+        author_text = (author_name or author).get_text(strip=True) if author else ""
+        category_text = (category.get_text(strip=True) or category.get("term", "")) if category else ""
+
+        return {
+            "id": article_id(link_text),
+            "title": title_text,
+            "title_cn": translations["title_cn"],
+            "text": text,
+            "text_cn": translations["text_cn"],
+            "author": {
+                "id": source_name,
+                "username": source_name.lower().replace(" ", "_"),
+                "name": author_text or source_name,
+                "avatar": ""
+            },
+            "metrics": {
+                "like_count": 0,
+                "retweet_count": 0,
+                "reply_count": 0
+            },
+            "created_at": pub_dt,
+            "url": link_text,
+            "source": source_name,
+            "category_text": category_text,
+            "features": features.to_dict(self.features.version)
+        }
+
+    def fetch_by_rss(
+        self,
+        date: datetime = None,
+        index: Optional[IngestIndex] = None,
+        sources: Optional[List[Dict]] = None,
+        results: Optional[Dict[str, Dict]] = None
+    ) -> List[Dict]:
+        """
+        使用 RSS 抓取内容
+
+        Args:
+            date: 目标日期
+            index: 摄取索引，传入时只处理之前未见过的条目（增量抓取），
+                   已见条目在解析、清理、过滤和翻译之前就被跳过
+            sources: 本次抓取的源（默认全部 rss_sources，调度器只传入到期的源）
+            results: 传入字典时按源名写入抓取结果，供调度器调整轮询间隔:
+                     {ok, new_items, latest}，new_items 含非 AI 条目，latest 为最新条目的发布时间
+        """
         date = date or datetime.now()
         start_date = date.replace(hour=0, minute=0, second=0, microsecond=0)
         end_date = start_date + timedelta(days=1)
 
         all_articles = []
 
-        print(f"   开始抓取 {len(self.rss_sources)} 个 RSS 源...")
+        sources = self.rss_sources if sources is None else sources
+        print(f"   开始抓取 {len(sources)} 个 RSS 源...")
 
-        for source in self.rss_sources:
+        for source in sources:
             print(f"   📡 {source['name']}: ", end="", flush=True)
-            soup = self._fetch_rss(source["url"])
-
-            if not soup:
-                print("失败")
-                continue
-
-            items = soup.find_all("item")
-            count = 0
-
-            for item in items:
-                article = self._parse_rss_item(item, source["name"])
-                if article:
-                    all_articles.append(article)
-                    count += 1
-
-            print(f"成功，获取 {count} 篇")
+            with metrics.span("fetch.feed", source=source["name"]):
+                soup = self._fetch_rss(source["url"], index, source.get("timeout", READ_TIMEOUT))
+
+                if not soup:
+                    if results is not None:
+                        results[source["name"]] = {"ok": False, "new_items": 0, "latest": None}
+                    print("失败")
+                    continue
+
+                items = self._find_items(soup, source.get("parser", "auto"))
+                translate = source.get("translate", True)
+                weight = source.get("weight", 1.0)
+                count = 0
+                new_items = 0
+                failures = 0
+                latest = None
+
+                for item in items:
+                    metrics.incr("items_seen")
+                    if index is not None:
+                        guid, link = self._item_identity(item)
+                        if index.is_known(guid, link):
+                            metrics.incr("items_already_seen")
+                            continue
+
+                    new_items += 1
+                    if results is not None:
+                        published = self._item_published(item)
+                        if published and (latest is None or published > latest):
+                            latest = published
+
+                    try:
+                        with metrics.timer("parse.item"):
+                            article = self._parse_rss_item(item, source["name"], translate)
+                    except Exception as e:
+                        # 解析失败的条目不记为已处理，下次抓取时重试
+                        metrics.incr("parse_failures")
+                        print(f"   ⚠️  解析条目失败: {e}")
+                        failures += 1
+                        continue
+                    if index is not None:
+                        # 解析成功或确定被过滤（与 AI 无关等）才记为已处理，下次只需一次查找
+                        index.mark(guid, link)
+                    if article:
+                        if weight != 1.0:
+                            article["source_weight"] = weight
+                        all_articles.append(article)
+                        count += 1
+
+                if index is not None:
+                    index.commit_validators(source["url"], complete=failures == 0)
+                if results is not None:
+                    results[source["name"]] = {"ok": True, "new_items": new_items, "latest": latest}
+                metrics.incr("items_kept", count)
+                print(f"成功，获取 {count} 篇")
+
+        self.health.save()
 
         return all_articles
 
@@ -276,37 +447,60 @@ class TechNewsFetcher:
 
         return mock_articles
 
-    def fetch(self, date: datetime = None, use_rss: bool = False) -> List[Dict]:
+    def fetch(
+        self,
+        date: datetime = None,
+        use_rss: bool = False,
+        index: Optional[IngestIndex] = None,
+        sources: Optional[List[Dict]] = None,
+        results: Optional[Dict[str, Dict]] = None
+    ) -> List[Dict]:
         """
         抓取内容
 
         Args:
             date: 目标日期
             use_rss: 是否使用 RSS（False 则使用模拟数据）
+            index: 摄取索引（仅 RSS），传入时只返回新条目
+            sources, results: 仅 RSS，见 fetch_by_rss
         """
-        if use_rss:
-            return self.fetch_by_rss(date)
-        else:
-            return self.fetch_mock(date)
+        with metrics.span("fetch", use_rss=use_rss):
+            if use_rss:
+                return self.fetch_by_rss(date, index, sources, results)
+            else:
+                return self.fetch_mock(date)
+
+    @staticmethod
+    def file_path(date: datetime = None) -> str:
+        """某天文章的保存路径"""
+        date = date or datetime.now()
+        return config.articles_path(date.strftime("%Y-%m-%d"))
+
+    @staticmethod
+    def load_from_file(date: datetime = None) -> Optional[List[Dict]]:
+        """读取 save_to_file 保存的某天文章（已去重和分析），没有保存过时返回 None"""
+        journal = ArticleJournal.for_date(date)
+        if not journal.exists():
+            return None
+        return list(journal)
 
     def save_to_file(self, articles: List[Dict], date: datetime = None) -> str:
-        """保存到文件"""
-        date = date or datetime.now()
-        date_str = date.strftime("%Y-%m-%d")
+        """
+        保存到文件：追加到当天的日志（与已保存的文章按 ID 合并，后写入的为准），日志较大时压缩为快照
 
-        # 确保 data 目录存在
-        data_dir = os.path.join(os.path.dirname(__file__), "data")
-        os.makedirs(data_dir, exist_ok=True)
+        Returns:
+            写入的日志路径
+        """
+        journal = ArticleJournal.for_date(date)
+        journal.append(articles)
+        if journal.needs_compaction():
+            journal.compact()
 
-        filepath = os.path.join(data_dir, f"articles_{date_str}.json")
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump({
-                "date": date_str,
-                "count": len(articles),
-                "articles": articles
-            }, f, ensure_ascii=False, indent=2)
+        # 增量更新全文索引（只有本次写入的文章，内容未变的会被跳过）
+        from fulltext import index_saved
+        index_saved(articles, journal.date)
 
-        return filepath
+        return journal.log_path
 
 
 # 保留旧的类名作为别名，确保兼容性
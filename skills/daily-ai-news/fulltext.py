@@ -0,0 +1,333 @@
+"""全文检索模块 - 基于 SQLite 的倒排索引（中文二元切分 + BM25 排序），随数据文件增量更新；以及静态页面使用的分片索引"""
+import glob
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import config
+
+# BM25 参数
+K1 = 1.2
+B = 0.75
+
+# 标题中的词按此倍数计入词频
+TITLE_WEIGHT = 2
+
+# 单次查询最多返回的结果数
+MAX_RESULTS = 100
+
+# 客户端索引中汉字开头的词按首字编码分到这么多个分片（英文词按首字母分片）
+CJK_SHARDS = 16
+
+# 英文词（字母数字）或连续的中日韩文字
+_TOKEN = re.compile(r"[a-z0-9]+|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+# 不建索引的英文常用词
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "its", "of", "on", "or", "that", "the", "this", "to", "was", "were", "will", "with"
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    docid INTEGER PRIMARY KEY,
+    article_id TEXT UNIQUE NOT NULL,
+    date TEXT,
+    source TEXT,
+    title TEXT,
+    title_cn TEXT,
+    url TEXT,
+    created_at TEXT,
+    length INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    docid INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, docid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_docid ON postings (docid);
+"""
+
+
+def tokenize(text: str) -> Iterator[str]:
+    """
+    切分文本
+
+    英文按字母数字切词并转小写（跳过常用词）；中文没有空格分词，
+    连续的汉字切成相邻二字组（"大模型" → "大模"、"模型"），单字保留原样。
+    """
+    for match in _TOKEN.finditer((text or "").lower()):
+        token = match.group()
+        if token[0] > "\x7f":
+            if len(token) == 1:
+                yield token
+            else:
+                for i in range(len(token) - 1):
+                    yield token[i:i + 2]
+        elif token not in STOPWORDS:
+            yield token
+
+
+def _term_counts(article: Dict) -> Counter:
+    counts = Counter()
+    for field in ("title", "title_cn"):
+        for token in tokenize(article.get(field, "")):
+            counts[token] += TITLE_WEIGHT
+    for field in ("text", "text_cn"):
+        counts.update(tokenize(article.get(field, "")))
+    return counts
+
+
+def _digest(article: Dict) -> str:
+    """参与索引的字段的哈希，内容未变的文章重复保存时不必重建倒排表"""
+    content = json.dumps(
+        [article.get(field, "") for field in ("title", "title_cn", "text", "text_cn", "source", "url")],
+        ensure_ascii=False
+    )
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class SearchIndex:
+    """
+    文章存档的全文索引
+
+    倒排表存放在 SQLite 中（按 (term, docid) 聚簇），查询时只读取查询词的倒排列表，
+    不需要把存档加载到内存；文档表只保存展示结果所需的字段。
+    BM25 的文档长度归一化项（及来源）在内存中缓存一份，索引被修改后才重新计算。
+    """
+
+    INDEX_FILE = "search.db"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        # (data_version, {docid: (长度归一化项, 来源)})
+        self._doc_stats = None
+
+    @classmethod
+    def open(cls) -> "SearchIndex":
+        """数据目录下的索引（state/search.db），不存在时创建"""
+        return cls(config.state_path(cls.INDEX_FILE))
+
+    def close(self):
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    def add(self, articles: Iterable[Dict], date: str) -> int:
+        """
+        加入或更新文章（按文章 ID），返回实际重建索引的文章数
+
+        Args:
+            articles: 文章列表
+            date: 文章所在的数据文件日期（YYYY-MM-DD）
+        """
+        updated = 0
+        with self._lock, self._conn:
+            self._doc_stats = None
+            for article in articles:
+                article_id = article.get("id")
+                if not article_id:
+                    continue
+                digest = _digest(article)
+                row = self._conn.execute(
+                    "SELECT docid, digest FROM docs WHERE article_id = ?", (article_id,)
+                ).fetchone()
+                if row and row[1] == digest:
+                    continue
+                if row:
+                    self._conn.execute("DELETE FROM postings WHERE docid = ?", (row[0],))
+                    self._conn.execute("DELETE FROM docs WHERE docid = ?", (row[0],))
+
+                counts = _term_counts(article)
+                cursor = self._conn.execute(
+                    "INSERT INTO docs (article_id, date, source, title, title_cn, url, created_at, length, digest)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (article_id, date, article.get("source", ""), article.get("title", ""),
+                     article.get("title_cn", ""), article.get("url", ""), article.get("created_at", ""),
+                     sum(counts.values()), digest)
+                )
+                self._conn.executemany(
+                    "INSERT INTO postings (term, docid, tf) VALUES (?, ?, ?)",
+                    ((term, cursor.lastrowid, tf) for term, tf in counts.items())
+                )
+                updated += 1
+        return updated
+
+    def rebuild(self) -> int:
+        """按日期逐个流式读取数据文件建立索引（用于已有存档），返回文章数"""
+        with self._lock, self._conn:
+            self._doc_stats = None
+            self._conn.execute("DELETE FROM postings")
+            self._conn.execute("DELETE FROM docs")
+        from journal import ArticleJournal, dates
+
+        for date in dates():
+            self.add(ArticleJournal(date), date)
+        return len(self)
+
+    def _stats(self) -> Dict[int, tuple]:
+        """
+        各文档的 K1 × (1 - B + B × 长度 / 平均长度) 和来源
+
+        data_version 在其他连接（如定时任务）提交修改后会变化，本连接的修改在 add 中清除缓存。
+        """
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._doc_stats is None or self._doc_stats[0] != version:
+            rows = self._conn.execute("SELECT docid, length, source FROM docs").fetchall()
+            avg_length = sum(row[1] for row in rows) / len(rows) if rows else 1
+            stats = {docid: (K1 * (1 - B + B * length / avg_length), source) for docid, length, source in rows}
+            self._doc_stats = (version, stats)
+        return self._doc_stats[1]
+
+    def search(self, query: str, limit: int = 20, sources: Sequence[str] = ()) -> List[Dict]:
+        """
+        BM25 检索
+
+        查询词之间为"或"关系，按 BM25 总分排序；命中的词越多、越稀有，分数越高。
+
+        Args:
+            query: 查询文本（中英文均可）
+            limit: 返回条数（不超过 MAX_RESULTS）
+            sources: 只在这些来源中检索
+
+        Returns:
+            结果列表，每项包含文档表中的字段和 score
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        limit = max(1, min(limit, MAX_RESULTS))
+        if not terms:
+            return []
+
+        sources = set(sources)
+
+        with self._lock:
+            stats = self._stats()
+            total = len(stats)
+            if not total:
+                return []
+
+            scores: Dict[int, float] = {}
+            for term in terms:
+                rows = self._conn.execute("SELECT docid, tf FROM postings WHERE term = ?", (term,)).fetchall()
+                if not rows:
+                    continue
+                # 文档频率按全部存档计算，来源筛选不影响词的稀有程度
+                weight = math.log(1 + (total - len(rows) + 0.5) / (len(rows) + 0.5)) * (K1 + 1)
+                for docid, tf in rows:
+                    norm, source = stats[docid]
+                    if sources and source not in sources:
+                        continue
+                    scores[docid] = scores.get(docid, 0.0) + weight * tf / (tf + norm)
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            if not top:
+                return []
+            rows = self._conn.execute(
+                "SELECT docid, article_id, date, source, title, title_cn, url, created_at FROM docs"
+                f" WHERE docid IN ({','.join('?' * len(top))})",
+                [docid for docid, _ in top]
+            ).fetchall()
+
+        docs = {row[0]: row for row in rows}
+        results = []
+        for docid, score in top:
+            _, article_id, date, source, title, title_cn, url, created_at = docs[docid]
+            results.append({
+                "id": article_id,
+                "title": title,
+                "title_cn": title_cn,
+                "url": url,
+                "source": source,
+                "date": date,
+                "created_at": created_at,
+                "score": round(score, 4)
+            })
+        return results
+
+
+def shard_key(term: str) -> str:
+    """
+    客户端索引的分片键：英文词取首字母，汉字开头的词取首字编码对 CJK_SHARDS 的余数
+
+    同一前缀的词总在同一个分片中，页面上边输入边检索时只需加载一个分片。
+    """
+    first = term[0]
+    return first if first < "\x80" else f"u{ord(first) % CJK_SHARDS}"
+
+
+def build_client_index(articles: Sequence[Dict]) -> Dict[str, Dict[str, List[int]]]:
+    """
+    为页面上的文章生成分片的倒排索引（供静态页面在浏览器中检索）
+
+    Returns:
+        {分片键: {词: 文章位置的差分编码}}；位置即文章在页面上的顺序，
+        递增的位置差分后多为小整数，gzip 压缩效果好
+    """
+    postings: Dict[str, List[int]] = {}
+    for position, article in enumerate(articles):
+        for term in _term_counts(article):
+            postings.setdefault(term, []).append(position)
+
+    shards: Dict[str, Dict[str, List[int]]] = {}
+    for term in sorted(postings):
+        positions = postings[term]
+        shards.setdefault(shard_key(term), {})[term] = [positions[0]] + [
+            b - a for a, b in zip(positions, positions[1:])
+        ]
+    return shards
+
+
+def write_client_index(articles: Sequence[Dict], directory: str) -> Dict:
+    """
+    把客户端索引写成分片文件（<分片键>.json），返回页面脚本需要的描述信息
+
+    目录中旧的分片会先被删除，重新生成的页面不会引用过期的数据。
+    """
+    os.makedirs(directory, exist_ok=True)
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        os.remove(path)
+
+    shards = build_client_index(articles)
+    for key, terms in shards.items():
+        with open(os.path.join(directory, f"{key}.json"), "w", encoding="utf-8") as f:
+            json.dump(terms, f, ensure_ascii=False, separators=(",", ":"))
+
+    return {
+        "base": os.path.basename(os.path.normpath(directory)),
+        "shards": sorted(shards),
+        "docs": len(articles),
+        "cjk_shards": CJK_SHARDS,
+        "stopwords": sorted(STOPWORDS)
+    }
+
+
+def index_saved(articles: List[Dict], date: str) -> Optional[int]:
+    """
+    保存数据文件后更新索引
+
+    索引失败不影响数据保存（可以之后用 main.py search --rebuild 重建），此时返回 None。
+    """
+    try:
+        index = SearchIndex.open()
+        try:
+            return index.add(articles, date)
+        finally:
+            index.close()
+    except sqlite3.Error as e:
+        print(f"   ⚠️  更新检索索引失败: {e}")
+        return None
@@ -0,0 +1,137 @@
+"""文章标识模块 - URL 规范化、定长文章 ID 与持久化的已见集合"""
+import hashlib
+import heapq
+import os
+from array import array
+from bisect import bisect_left
+from typing import Iterable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 跟踪参数（不影响文章内容）
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid", "mkt_tok",
+    "ref", "ref_src", "ref_url", "cmpid", "guccounter", "guce_referrer", "guce_referrer_sig",
+    "_hsenc", "_hsmi", "sr_share", "taid", "ncid", "soc_src", "soc_trk"
+}
+TRACKING_PREFIXES = ("utm_", "at_", "pk_")
+
+DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+# 文章 ID 的字节数（十六进制后为 16 个字符）
+ID_BYTES = 8
+
+
+def canonical_url(url: str) -> str:
+    """
+    规范化 URL，使同一篇文章的不同写法得到同一个结果
+
+    - 统一为 https，主机名小写并去掉 www. 和 80/443 端口
+    - 去掉跟踪参数和片段，其余参数按名称排序
+    - 去掉路径末尾的斜杠
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    scheme = parts.scheme.lower()
+    if scheme in ("http", "https"):
+        scheme = "https"
+
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = parts.port
+    if port and str(port) not in DEFAULT_PORTS.values():
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/")
+
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    ]
+    query.sort()
+
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=ID_BYTES).digest()
+
+
+def article_id(url: str) -> str:
+    """由规范化 URL 生成定长文章 ID（16 位十六进制）"""
+    return _digest(canonical_url(url)).hex()
+
+
+def item_key(guid: str, link: str) -> str:
+    """条目的摄取键：优先用源提供的 GUID，没有时用链接生成的文章 ID"""
+    guid = (guid or "").strip()
+    if guid:
+        return _digest(f"guid:{guid}").hex()
+    if link:
+        return article_id(link)
+    return ""
+
+
+def id_to_int(value: str) -> int:
+    """文章 ID 转为 64 位整数（已见集合的存储形式）"""
+    return int(value, 16)
+
+
+class SeenSet:
+    """
+    已处理文章的持久化集合
+
+    磁盘上是排好序的 64 位整数数组（每条 8 字节），加载后用二分查找；
+    本次运行新加入的 ID 放在内存集合中，save() 时合并写回。
+    """
+
+    def __init__(self, path: str = None, values: Iterable[int] = ()):
+        self.path = path
+        self._sorted = array("Q", sorted(set(values)))
+        self._pending = set()
+
+    @classmethod
+    def load(cls, path: str) -> "SeenSet":
+        seen = cls(path)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                seen._sorted.frombytes(f.read())
+        return seen
+
+    def _contains_int(self, value: int) -> bool:
+        if value in self._pending:
+            return True
+        index = bisect_left(self._sorted, value)
+        return index < len(self._sorted) and self._sorted[index] == value
+
+    def __contains__(self, item_id: str) -> bool:
+        return self._contains_int(id_to_int(item_id))
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending)
+
+    def add(self, item_id: str):
+        value = id_to_int(item_id)
+        if not self._contains_int(value):
+            self._pending.add(value)
+
+    def save(self, path: str = None):
+        """合并新 ID 并原子写回（先写临时文件再重命名）"""
+        path = path or self.path
+        if not path:
+            raise ValueError("SeenSet 未指定保存路径")
+        if self._pending:
+            # add() 保证新 ID 不在已排序数组中，直接归并即可
+            self._sorted = array("Q", heapq.merge(self._sorted, sorted(self._pending)))
+            self._pending = set()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self._sorted.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
@@ -0,0 +1,88 @@
+"""摄取索引模块 - 记录已处理的条目和各源的 HTTP 校验值，使定时抓取只处理新条目"""
+import json
+import os
+from typing import Dict, Optional
+
+import config
+from identity import SeenSet, article_id, item_key
+
+
+class IngestIndex:
+    """
+    持久化摄取索引
+
+    - seen: 已处理条目的键（优先用 <guid>/<id>，没有时用规范化链接）
+    - validators: 各源上次响应的 ETag / Last-Modified，用于条件请求；
+      只在该次响应的所有条目都已处理（或确定被过滤）后才记下，见 stage_validators / commit_validators
+    """
+
+    SEEN_FILE = "seen_ids.bin"
+    VALIDATORS_FILE = "feed_validators.json"
+
+    def __init__(self, seen: SeenSet, validators: Dict[str, Dict] = None, validators_path: str = None):
+        self.seen = seen
+        self.validators = validators or {}
+        self.validators_path = validators_path
+        # 已下载、条目尚未处理完的源的校验值
+        self._pending: Dict[str, Dict] = {}
+
+    @classmethod
+    def load(cls) -> "IngestIndex":
+        seen = SeenSet.load(config.state_path(cls.SEEN_FILE))
+        validators_path = config.state_path(cls.VALIDATORS_FILE)
+        validators = {}
+        if os.path.exists(validators_path):
+            with open(validators_path, "r", encoding="utf-8") as f:
+                validators = json.load(f)
+        return cls(seen, validators, validators_path)
+
+    def is_known(self, guid: str, link: str) -> bool:
+        """条目是否已处理过（先查 GUID 键；找不到时再按链接 ID 查，兼容只按链接记录的旧条目）"""
+        key = item_key(guid, link)
+        if key and key in self.seen:
+            return True
+        return bool(guid and link) and article_id(link) in self.seen
+
+    def mark(self, guid: str, link: str):
+        """记为已处理"""
+        key = item_key(guid, link)
+        if key:
+            self.seen.add(key)
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """条件请求头"""
+        saved = self.validators.get(url, {})
+        headers = {}
+        if saved.get("etag"):
+            headers["If-None-Match"] = saved["etag"]
+        if saved.get("last_modified"):
+            headers["If-Modified-Since"] = saved["last_modified"]
+        return headers
+
+    def stage_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """暂存本次响应的校验值，条目处理完后由 commit_validators 决定是否保存"""
+        self._pending[url] = {"etag": etag, "last_modified": last_modified}
+
+    def commit_validators(self, url: str, complete: bool):
+        """
+        条目处理完后更新该源的校验值
+
+        Args:
+            complete: 所有条目都已处理或确定被过滤时为 True，保存本次的校验值；
+                      有条目解析失败时为 False，删除该源的校验值，下次无条件请求并重试失败的条目
+                      （保留校验值时源未更新就会返回 304，失败的条目再也不会被处理）
+        """
+        pending = self._pending.pop(url, None)
+        if not complete:
+            self.validators.pop(url, None)
+        elif pending and (pending["etag"] or pending["last_modified"]):
+            self.validators[url] = pending
+
+    def save(self):
+        """写回已见集合和校验值（均为先写临时文件再重命名）"""
+        self.seen.save()
+        if self.validators_path:
+            tmp_path = f"{self.validators_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.validators, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.validators_path)
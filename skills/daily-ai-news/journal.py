@@ -0,0 +1,259 @@
+"""文章日志模块 - 每天的文章追加写入逐行的 JSON 日志，定期压缩为快照（原子替换），读取时逐行流式解析"""
+import glob
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Mapping
+
+from records import json_default
+import config
+
+try:
+    import fcntl
+except ImportError:  # Windows：没有文件锁，追加写入仍是单次 write
+    fcntl = None
+
+# 日志达到该大小（字节），且不小于快照大小的 COMPACT_RATIO 倍时，写入后压缩
+COMPACT_MIN_BYTES = 256 * 1024
+COMPACT_RATIO = 0.5
+
+# 逐行格式快照的首行前缀
+_HEADER = '{"date": '
+
+
+def _dumps(article: Mapping) -> str:
+    """一篇文章的紧凑 JSON（单行）"""
+    return json.dumps(article, ensure_ascii=False, separators=(",", ":"), default=json_default)
+
+
+def _fsync_dir(path: str):
+    """同步目录项（重命名、删除在断电后仍然生效）；不支持的平台忽略"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _iter_snapshot(path: str) -> Iterator[Dict]:
+    """逐行读取快照；旧格式（整体缩进的 JSON）整体解析一次，下次压缩时改写为逐行格式"""
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        first = f.readline()
+        if not (first.startswith(_HEADER) and first.rstrip().endswith("[")):
+            f.seek(0)
+            yield from json.load(f).get("articles", [])
+            return
+        for line in f:
+            if line.startswith("]"):
+                break
+            line = line.rstrip().rstrip(",")
+            if line:
+                yield json.loads(line)
+
+
+def _iter_log(path: str) -> Iterator[Dict]:
+    """
+    逐行读取日志
+
+    写入中断时最后一行可能不完整（没有换行符），跳过；无法解析的行同样跳过。
+    """
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _is_legacy(path: str) -> bool:
+    """快照是否为旧格式（整体缩进的 JSON）"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return not f.readline().startswith(_HEADER)
+    except FileNotFoundError:
+        return False
+
+
+def dates() -> List[str]:
+    """数据目录中有文章的日期（YYYY-MM-DD，升序）"""
+    prefix = os.path.basename(config.articles_path(""))[:-len(".json")]
+    found = set()
+    for path in glob.glob(os.path.join(config.data_dir(), f"{prefix}*.json*")):
+        name = os.path.basename(path)[len(prefix):]
+        date_str, _, suffix = name.partition(".")
+        if suffix in ("json", "jsonl", "jsonl.compacting"):
+            found.add(date_str)
+    return sorted(found)
+
+
+class ArticleJournal:
+    """
+    某一天的文章存储
+
+    - 快照 articles_<日期>.json：上次压缩时的全部文章。仍是完整的 JSON 对象（旧的读取方式照常可用），
+      但每篇文章单独一行，可以逐行读取；旧的整体缩进格式也能读取
+    - 日志 articles_<日期>.jsonl：上次压缩之后写入的文章，每行一篇紧凑的 JSON
+
+    写入只追加日志：一批文章一次 write、一次 fsync，耗时与新文章数成正比。
+    写入中途中断最多留下一行不完整的记录，读取时跳过，已写入的记录不受影响。
+    同一 ID 以最后写入的记录为准：读取时先逐行读快照（跳过被日志覆盖的文章），再按最后写入的顺序给出日志中的文章，
+    与原先"已有的文章 + 新文章"的合并顺序一致。
+
+    日志较大时压缩：日志先改名为 .compacting（之后的写入进入新日志），与快照合并写入临时文件、
+    fsync 后原子替换快照，再删除 .compacting。任一步骤中断都不会丢失或损坏数据：
+    残留的 .compacting 在读取时照常合并，下次压缩时继续处理。
+    """
+
+    def __init__(self, date_str: str):
+        self.date = date_str
+        self.snapshot_path = config.articles_path(date_str)
+        self.log_path = config.articles_log_path(date_str)
+        self.pending_path = f"{self.log_path}.compacting"
+
+    @classmethod
+    def for_date(cls, date: datetime = None) -> "ArticleJournal":
+        return cls((date or datetime.now()).strftime("%Y-%m-%d"))
+
+    def paths(self) -> List[str]:
+        """当天存在的文件（快照、压缩中的日志、日志）"""
+        return [path for path in (self.snapshot_path, self.pending_path, self.log_path) if os.path.exists(path)]
+
+    def exists(self) -> bool:
+        return bool(self.paths())
+
+    # ---------- 写入 ----------
+
+    @contextmanager
+    def _open_log(self):
+        """以追加方式打开日志并加锁；加锁期间日志被压缩改名时重新打开新日志"""
+        while True:
+            f = open(self.log_path, "a+b")
+            if fcntl is None:
+                break
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                if os.stat(self.log_path).st_ino == os.fstat(f.fileno()).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            f.close()
+        try:
+            yield f
+        finally:
+            f.close()
+
+    def append(self, articles: Iterable[Mapping]) -> int:
+        """追加一批文章（一次 write + 一次 fsync），返回写入的篇数"""
+        lines = [_dumps(article) + "\n" for article in articles]
+        if not lines:
+            return 0
+        os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+        data = "".join(lines).encode("utf-8")
+        with self._open_log() as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                # 上次写入中断时最后一行不完整，先补换行，避免与新记录粘连
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(lines)
+
+    def needs_compaction(self) -> bool:
+        """日志足够大（或快照仍是旧格式）时需要压缩"""
+        try:
+            log_size = os.path.getsize(self.log_path)
+        except FileNotFoundError:
+            return os.path.exists(self.pending_path)
+        if _is_legacy(self.snapshot_path):
+            return True
+        try:
+            snapshot_size = os.path.getsize(self.snapshot_path)
+        except FileNotFoundError:
+            snapshot_size = 0
+        return log_size >= max(COMPACT_MIN_BYTES, snapshot_size * COMPACT_RATIO)
+
+    def compact(self) -> int:
+        """把日志合并进快照，返回快照中的文章数"""
+        count = None
+        # 上次压缩中断留下的 .compacting 先合并
+        if os.path.exists(self.pending_path):
+            count = self._merge_pending()
+        if os.path.exists(self.log_path):
+            # 持锁改名：正在等待的写入在改名后会重新打开新日志
+            with self._open_log():
+                os.replace(self.log_path, self.pending_path)
+            count = self._merge_pending()
+        if count is None:
+            # 没有日志（如旧格式快照），只改写快照
+            if not os.path.exists(self.snapshot_path):
+                return 0
+            count = self._write_snapshot(_iter_snapshot(self.snapshot_path))
+        return count
+
+    def _merge_pending(self) -> int:
+        count = self._write_snapshot(self._iter_merged(self._read_updates(self.pending_path)))
+        os.remove(self.pending_path)
+        _fsync_dir(os.path.dirname(self.pending_path))
+        return count
+
+    def _write_snapshot(self, articles: Iterable[Mapping]) -> int:
+        """逐行写入临时文件，fsync 后原子替换快照"""
+        tmp_path = f"{self.snapshot_path}.tmp"
+        count = 0
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(f'{_HEADER}{json.dumps(self.date)}, "articles": [\n')
+            for article in articles:
+                f.write((",\n" if count else "") + _dumps(article))
+                count += 1
+            f.write(f'\n], "count": {count}}}\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_dir(os.path.dirname(self.snapshot_path))
+        return count
+
+    # ---------- 读取 ----------
+
+    @staticmethod
+    def _read_updates(*paths: str) -> Dict[str, Dict]:
+        """日志中的文章：同一 ID 取最后一条，按最后写入的顺序排列"""
+        updates = {}
+        for path in paths:
+            for article in _iter_log(path):
+                key = article.get("id")
+                updates.pop(key, None)
+                updates[key] = article
+        return updates
+
+    def _iter_merged(self, updates: Dict[str, Dict]) -> Iterator[Dict]:
+        for article in _iter_snapshot(self.snapshot_path):
+            if article.get("id") not in updates:
+                yield article
+        yield from updates.values()
+
+    def __iter__(self) -> Iterator[Dict]:
+        """
+        流式读取当天的全部文章（已合并日志）
+
+        快照逐行解析；只有上次压缩之后的日志需要整体读入（按 ID 覆盖快照中的文章）。
+        """
+        return self._iter_merged(self._read_updates(self.pending_path, self.log_path))
@@ -3,6 +3,7 @@
 import os
 import sys
 import argparse
+import logging
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -12,6 +13,13 @@ sys.path.insert(0, os.path.dirname(__file__))
 from fetcher import TechNewsFetcher
 from analyzer import ArticleAnalyzer
 from renderer import WebRenderer
+from dedup import StoryDeduplicator
+from enrichment import EngagementEnricher
+from records import to_records
+from journal import ArticleJournal, dates
+from resilience import SourceHealth
+import metrics
+import profiling
 
 
 def parse_args():
@@ -52,6 +60,16 @@ def parse_args():
         action="store_true",
         help="生成单文件 HTML（内联 CSS）"
     )
+    parser.add_argument(
+        "--no-search-index",
+        action="store_true",
+        help="不生成页面的分片检索索引（默认在页面旁生成 <页面名>-search/ 目录）"
+    )
+    parser.add_argument(
+        "--no-enrich",
+        action="store_true",
+        help="不查询讨论站点的互动数据（见 enrichment.py）"
+    )
     parser.add_argument(
         "--summary",
         type=int,
@@ -64,6 +82,41 @@ def parse_args():
         default="每日 AI 速递",
         help="页面标题"
     )
+    parser.add_argument(
+        "--report",
+        type=str,
+        default=None,
+        help="运行报告（JSON）输出路径，默认为 output/run-report-YYYY-MM-DD.json"
+    )
+    parser.add_argument(
+        "--log-json",
+        action="store_true",
+        help="将各阶段的结构化 JSON 日志输出到 stderr"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="使用 cProfile 剖析本次运行，输出 .prof 文件和按阶段汇总的文本摘要"
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=str,
+        default=None,
+        help="剖析结果目录，默认为 output/profiles"
+    )
+
+    subparsers = parser.add_subparsers(dest="command")
+    search_parser = subparsers.add_parser("search", help="全文检索已保存的文章")
+    search_parser.add_argument("query", nargs="*", help="查询文本（中英文均可）")
+    search_parser.add_argument("--limit", type=int, default=10, help="返回条数，默认: 10")
+    search_parser.add_argument("--source", type=str, default=None, help="只检索这些来源（逗号分隔）")
+    search_parser.add_argument("--rebuild", action="store_true", help="先从数据文件重建检索索引")
+    train_parser = subparsers.add_parser("train-classifier", help="在已标注的存档上训练分类器")
+    train_parser.add_argument(
+        "--labels", type=str, default=None,
+        help="人工标注文件（JSON: {文章 ID: [分类, ...]}）；未标注的文章使用存档中分类器自己输出的 categories/category 字段"
+    )
+    train_parser.add_argument("--epochs", type=int, default=300, help="训练轮数，默认: 300")
 
     return parser.parse_args()
 
@@ -93,7 +146,7 @@ def generate_daily_news(args):
 
     # 1. 抓取内容
     print("🔍 正在从科技媒体抓取 AI 新闻...")
-    fetcher = TechNewsFetcher()
+    fetcher = TechNewsFetcher(health=SourceHealth.load() if args.use_rss else None)
     articles = fetcher.fetch(date=date, use_rss=args.use_rss)
     print(f"   抓取到 {len(articles)} 篇文章")
 
@@ -101,9 +154,22 @@ def generate_daily_news(args):
         print("⚠️  没有抓取到文章，请稍后重试")
         return None
 
+    # 合并多个来源的同一报道
+    deduped = StoryDeduplicator().dedupe(articles)
+    if len(deduped) < len(articles):
+        print(f"   合并重复报道 {len(articles) - len(deduped)} 篇")
+    articles = deduped
+
+    # 补全讨论站点的互动数据（points、评论数，计入热度；限时，超出预算的留到下次）
+    if args.use_rss and not args.no_enrich:
+        enricher = EngagementEnricher.load()
+        enriched = enricher.enrich(articles)
+        enricher.save()
+        print(f"   补全互动数据 {enriched} 篇")
+
     # 2. 分析内容
     print("📊 正在分析内容...")
-    analyzer = ArticleAnalyzer()
+    analyzer = ArticleAnalyzer.load()
     result = analyzer.analyze_batch(articles)
     print(f"   分析完成")
     print(f"   分类分布: {result['stats']['category_distribution']}")
@@ -127,7 +193,8 @@ def generate_daily_news(args):
 
     if args.inline_css:
         # 生成单文件 HTML
-        html_content = generate_inline_html(top_articles, result["stats"], date, args.title)
+        with metrics.span("render", template="inline", count=len(top_articles)):
+            html_content = generate_inline_html(top_articles, result["stats"], date, args.title, renderer)
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(html_content)
     else:
@@ -137,20 +204,36 @@ def generate_daily_news(args):
             stats=result["stats"],
             output_path=str(output_path),
             date=date,
-            title=args.title
+            title=args.title,
+            search_index=not args.no_search_index
         )
 
     print(f"✅ 网页已生成: {output_path.absolute()}")
     return output_path
 
 
-def generate_inline_html(tweets, stats, date, title):
-    """生成内联 CSS 的单文件 HTML"""
+def also_reported_html(article):
+    """同一报道的其他来源链接"""
+    others = article.get("sources", [])[1:]
+    if not others:
+        return ""
+    links = "、".join(f'<a href="{s["url"]}" target="_blank">{s["source"]}</a>' for s in others)
+    return f'<div class="article-also">同时报道：{links}</div>'
+
+
+def generate_inline_html(tweets, stats, date, title, renderer):
+    """生成内联 CSS 的单文件 HTML（来源标签和页脚取自渲染器的数据源注册表）"""
     from renderer import generate_inline_css
 
     date_str = date.strftime("%Y-%m-%d")
     date_display = date.strftime("%Y年%m月%d日")
 
+    source_tags_html = "".join(
+        f"""
+            <span class="source-tag" data-source="{chip['name']}" onclick="filterSource(this.dataset.source, '全部')">{chip['label']}</span>"""
+        for chip in renderer.source_chips(tweets)
+    )
+
     # 文章列表 HTML
     articles_html = ""
     for article in tweets:
@@ -168,6 +251,8 @@ def generate_inline_html(tweets, stats, date, title):
                 {article.get('text', '')}
             </div>
 
+            {also_reported_html(article)}
+
             <div class="article-metrics">
                 <span class="article-time">{article.get('created_at', '')[:10] if article.get('created_at') else ''}</span>
                 <a href="{article.get('url', '#')}" class="article-link" target="_blank">阅读全文 →</a>
@@ -221,11 +306,7 @@ def generate_inline_html(tweets, stats, date, title):
 
         <div class="source-filter">
             <span class="source-label">来源:</span>
-            <span class="source-tag active" onclick="filterSource('全部', '全部')">全部</span>
-            <span class="source-tag" onclick="filterSource('TechCrunch', '全部')">TechCrunch</span>
-            <span class="source-tag" onclick="filterSource('The Verge', '全部')">The Verge</span>
-            <span class="source-tag" onclick="filterSource('VentureBeat', '全部')">VentureBeat</span>
-            <span class="source-tag" onclick="filterSource('MIT Technology Review', '全部')">MIT Tech Review</span>
+            <span class="source-tag active" onclick="filterSource('全部', '全部')">全部</span>{source_tags_html}
         </div>
 
         <div class="article-list">
@@ -234,7 +315,7 @@ def generate_inline_html(tweets, stats, date, title):
 
         <footer>
             <p>生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p>数据来源: TechCrunch, The Verge, VentureBeat, MIT Technology Review | 每日 AI 速递</p>
+            <p>数据来源: {renderer.registry.footer} | 每日 AI 速递</p>
         </footer>
     </div>
 
@@ -288,27 +369,41 @@ def generate_summary(args):
     print(f"📊 生成最近 {days} 天的汇总页面...")
 
     fetcher = TechNewsFetcher()
-    analyzer = ArticleAnalyzer()
+    analyzer = ArticleAnalyzer.load()
     renderer = WebRenderer()
 
     daily_data = []
     end_date = datetime.now()
+    daily_articles = []
 
     for i in range(days):
         date = end_date - timedelta(days=i)
         print(f"   处理日期: {date.strftime('%Y-%m-%d')}")
 
-        # 尝试从文件加载，如果没有则抓取
-        data_file = Path(__file__).parent / "data" / f"articles_{date.strftime('%Y-%m-%d')}.json"
+        # 尝试从文件加载（逐行流式读取），如果没有则抓取
+        journal = ArticleJournal.for_date(date)
 
-        if data_file.exists():
-            import json
-            with open(data_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                articles = data.get("articles", [])
+        if journal.exists():
+            articles = journal
         else:
             articles = fetcher.fetch(date=date, use_rss=args.use_rss)
 
+        # 多日的文章同时保存在内存中，转为紧凑的文章记录
+        daily_articles.append((date, to_records(articles)))
+
+    # 在整个多日文章池上合并重复报道，每篇报道归入最早出现的那一天
+    pool = []
+    first_day = {}
+    for date, articles in reversed(daily_articles):
+        for article in articles:
+            first_day[id(article)] = date
+            pool.append(article)
+    by_day = {}
+    for article in StoryDeduplicator().dedupe(pool):
+        by_day.setdefault(first_day[id(article)], []).append(article)
+
+    for date, _ in daily_articles:
+        articles = by_day.get(date, [])
         if articles:
             result = analyzer.analyze_batch(articles)
             daily_data.append({
@@ -334,17 +429,140 @@ def generate_summary(args):
     return output_path
 
 
+def search_articles(args):
+    """全文检索已保存的文章"""
+    import time
+    from fulltext import SearchIndex
+
+    index = SearchIndex.open()
+    if args.rebuild or not len(index):
+        print("🗂️  正在从数据文件建立检索索引...")
+        print(f"   共索引 {index.rebuild()} 篇文章")
+
+    query = " ".join(args.query)
+    if not query:
+        return
+
+    sources = [s.strip() for s in (args.source or "").split(",") if s.strip()]
+    started = time.perf_counter()
+    results = index.search(query, limit=args.limit, sources=sources)
+    took_ms = (time.perf_counter() - started) * 1000
+
+    print(f"🔍 \"{query}\" 命中 {len(results)} 篇（{took_ms:.1f} ms）\n")
+    for i, result in enumerate(results, 1):
+        print(f"{i}. [{result['date']}] {result['source']} | {result['title_cn'] or result['title']}"
+              f"  (得分: {result['score']:.2f})")
+        print(f"   {result['url']}")
+
+
+def train_classifier(args):
+    """
+    在已标注的存档上训练分类器，保存到数据目录（state/classifier.json）
+
+    存档中的 categories/category 是分类器自己的输出，没有人工标注（--labels）时只是在自身结果上再训练，
+    不能纠正现有的分类错误。
+    """
+    import json
+    from classifier import DEFAULT_CATEGORY, CategoryClassifier
+
+    labels_by_id = {}
+    if args.labels:
+        with open(args.labels, "r", encoding="utf-8") as f:
+            labels_by_id = json.load(f)
+
+    # 同一文章出现在多天时取最新的一份
+    articles = {}
+    for date_str in reversed(dates()):
+        for article in ArticleJournal(date_str):
+            articles.setdefault(article.get("id"), article)
+
+    analyzer = ArticleAnalyzer()
+    documents, labels = [], []
+    self_labelled = 0
+    for article_id, article in articles.items():
+        article_labels = labels_by_id.get(article_id)
+        if article_labels is None:
+            article_labels = article.get("categories") or ([article["category"]] if article.get("category") else None)
+            if article_labels is None:
+                continue
+            self_labelled += 1
+        documents.append(analyzer.features.for_article(article).terms)
+        labels.append([label for label in article_labels if label in analyzer.CATEGORY_KEYWORDS])
+
+    if not documents:
+        print("⚠️  存档中没有已标注的文章（可用 --labels 指定标注文件）")
+        return
+
+    def accuracy(model):
+        predicted = model.classify(documents)
+        return sum(1 for (category, _, _), truth in zip(predicted, labels)
+                   if category in truth or (not truth and category == DEFAULT_CATEGORY)) / len(documents)
+
+    classifier = CategoryClassifier(ArticleAnalyzer.category_terms())
+    before = accuracy(classifier)
+    classifier.fit(documents, labels, epochs=args.epochs)
+    print(f"🧮 训练样本 {len(documents)} 篇，主分类准确率 {before:.3f} → {accuracy(classifier):.3f}")
+    print(f"   模型已保存: {classifier.save()}")
+    if self_labelled:
+        print(f"⚠️  其中 {self_labelled} 篇的标注是存档中分类器自己的输出：训练只会贴近现有的分类结果（包括其中的错误），"
+              f"准确率也只是相对这些标注；请用 --labels 提供人工标注")
+
+
+def get_report_path(args) -> Path:
+    """获取运行报告路径"""
+    if args.report:
+        return Path(args.report)
+
+    output_dir = Path(__file__).parent.parent.parent / "output"
+    output_dir.mkdir(exist_ok=True)
+
+    date_str = args.date or datetime.now().strftime("%Y-%m-%d")
+    return output_dir / f"run-report-{date_str}.json"
+
+
+def run(args):
+    """执行一次生成任务"""
+    with metrics.span("total"):
+        if args.summary:
+            generate_summary(args)
+        else:
+            generate_daily_news(args)
+
+
 def main():
     """主函数"""
     args = parse_args()
 
+    if args.log_json:
+        logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     print("🤖 每日 AI 速递")
     print("=" * 50)
 
-    if args.summary:
-        generate_summary(args)
-    else:
-        generate_daily_news(args)
+    if args.command == "search":
+        search_articles(args)
+        return
+    if args.command == "train-classifier":
+        train_classifier(args)
+        return
+
+    with metrics.run() as run_metrics:
+        if args.profile:
+            profile_dir = args.profile_dir or str(Path(__file__).parent.parent.parent / "output" / "profiles")
+            with profiling.profile_run(
+                "summary" if args.summary else "daily",
+                stages=[TechNewsFetcher, ArticleAnalyzer, WebRenderer],
+                output_dir=profile_dir
+            ) as profile:
+                run(args)
+            print(f"🔬 剖析结果: {profile.prof_path}")
+            print(f"   文本摘要: {profile.summary_path}")
+        else:
+            run(args)
+
+    report_path = get_report_path(args)
+    run_metrics.write_report(str(report_path))
+    print(f"📈 运行报告: {report_path.absolute()}")
 
     print("\n✨ 完成!")
 
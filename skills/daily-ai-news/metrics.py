@@ -0,0 +1,221 @@
+"""运行指标模块 - 各阶段计时、计数器与延迟直方图"""
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("daily_ai_news.metrics")
+
+# 延迟直方图的桶上界（毫秒），最后一个桶为 +Inf
+LATENCY_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+# 每个直方图最多保留的样本数（用于计算分位数）
+MAX_SAMPLES = 10000
+
+
+class Histogram:
+    """延迟直方图"""
+
+    def __init__(self, buckets: List[float] = None):
+        self.buckets = buckets or LATENCY_BUCKETS_MS
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self._samples = []
+
+    def observe(self, value_ms: float):
+        """记录一次耗时"""
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value_ms <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value_ms
+        self.min = value_ms if self.min is None else min(self.min, value_ms)
+        self.max = value_ms if self.max is None else max(self.max, value_ms)
+        if len(self._samples) < MAX_SAMPLES:
+            self._samples.append(value_ms)
+
+    def percentile(self, p: float) -> float:
+        """计算分位数（基于保留的样本）"""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+
+    def to_dict(self) -> Dict:
+        bounds = [str(b) for b in self.buckets] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total, 3),
+            "min_ms": round(self.min or 0, 3),
+            "max_ms": round(self.max or 0, 3),
+            "p50_ms": round(self.percentile(50), 3),
+            "p95_ms": round(self.percentile(95), 3),
+            "buckets": dict(zip(bounds, self.counts))
+        }
+
+
+class RunMetrics:
+    """单次运行的指标收集器"""
+
+    def __init__(self, run_id: Optional[str] = None, log_events: bool = True):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+        self.started_at = datetime.utcnow().isoformat()
+        self.log_events = log_events
+        self.counters = Counter()
+        self.histograms: Dict[str, Histogram] = {}
+        self.spans: List[Dict] = []
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def _emit(self, event: Dict):
+        """输出一条结构化 JSON 日志"""
+        if self.log_events:
+            event["run_id"] = self.run_id
+            logger.info(json.dumps(event, ensure_ascii=False))
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """
+        计时区间（阶段级或数据源级），结束时记录到 spans 和直方图
+
+        用法:
+            with metrics.span("fetch.feed", source="TechCrunch"):
+                ...
+        """
+        status = "ok"
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            status = "error"
+            raise
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            record = {
+                "name": name,
+                "labels": labels,
+                "duration_ms": round(duration_ms, 3),
+                "status": status
+            }
+            with self._lock:
+                self.spans.append(record)
+            self.observe(name, duration_ms)
+            self._emit(dict(record, event="span"))
+
+    @contextmanager
+    def timer(self, name: str):
+        """轻量计时（只进直方图，不记录 span，用于逐条目的热路径）"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000)
+
+    def incr(self, name: str, value: int = 1):
+        """计数器累加"""
+        with self._lock:
+            self.counters[name] += value
+
+    def observe(self, name: str, value_ms: float):
+        """向直方图记录一次耗时"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value_ms)
+
+    def to_dict(self) -> Dict:
+        """生成机器可读的运行报告"""
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "started_at": self.started_at,
+                "elapsed_ms": round((time.perf_counter() - self._start) * 1000, 3),
+                "counters": dict(self.counters),
+                "spans": list(self.spans),
+                "histograms": {name: h.to_dict() for name, h in self.histograms.items()}
+            }
+
+    def write_report(self, path: str) -> str:
+        """将运行报告写入 JSON 文件"""
+        report = self.to_dict()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        self._emit({"event": "report", "path": str(path), "counters": report["counters"]})
+        return path
+
+
+class _NullMetrics(RunMetrics):
+    """未开启运行时使用的空实现，不保留任何数据"""
+
+    def __init__(self):
+        super().__init__(run_id="-", log_events=False)
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        yield
+
+    @contextmanager
+    def timer(self, name: str):
+        yield
+
+    def incr(self, name: str, value: int = 1):
+        pass
+
+    def observe(self, name: str, value_ms: float):
+        pass
+
+
+_NULL = _NullMetrics()
+_current: ContextVar = ContextVar("daily_ai_news_metrics", default=_NULL)
+
+
+def current() -> RunMetrics:
+    """获取当前运行的指标收集器"""
+    return _current.get()
+
+
+@contextmanager
+def run(run_id: Optional[str] = None, log_events: bool = True):
+    """
+    开启一次运行的指标收集，区间内的 span/incr/observe 都记录到同一个 RunMetrics
+
+    用法:
+        with metrics.run() as m:
+            ...
+        report = m.to_dict()
+    """
+    collector = RunMetrics(run_id=run_id, log_events=log_events)
+    token = _current.set(collector)
+    try:
+        yield collector
+    finally:
+        _current.reset(token)
+
+
+def span(name: str, **labels):
+    return current().span(name, **labels)
+
+
+def timer(name: str):
+    return current().timer(name)
+
+
+def incr(name: str, value: int = 1):
+    current().incr(name, value)
+
+
+def observe(name: str, value_ms: float):
+    current().observe(name, value_ms)
@@ -0,0 +1,142 @@
+"""性能剖析模块 - 用 cProfile 记录一次完整运行，并按阶段汇总耗时"""
+import io
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pstats
+
+# 开关：环境变量或查询参数 ?profile=1
+PROFILE_ENV = "DAILY_AI_NEWS_PROFILE"
+PROFILE_DIR_ENV = "DAILY_AI_NEWS_PROFILE_DIR"
+
+# 文本摘要中列出的函数数量
+TOP_N = 30
+
+
+class ProfileResult:
+    """一次剖析的输出文件路径"""
+
+    def __init__(self):
+        self.prof_path: Optional[str] = None
+        self.summary_path: Optional[str] = None
+        self.stages: Dict[str, Dict] = {}
+
+
+def is_enabled(query: Optional[Dict] = None) -> bool:
+    """判断是否开启剖析（查询参数优先于环境变量）"""
+    truthy = ("1", "true", "yes", "on")
+    if query and str(query.get("profile", "")).lower() in truthy:
+        return True
+    return os.environ.get(PROFILE_ENV, "").lower() in truthy
+
+
+def default_output_dir() -> str:
+    """剖析结果默认目录（serverless 环境只有 /tmp 可写）"""
+    return os.environ.get(PROFILE_DIR_ENV, "/tmp/daily-ai-news-profiles")
+
+
+def _stage_functions(cls) -> Dict[tuple, str]:
+    """收集一个类中所有方法的 (文件, 行号, 函数名) 键"""
+    keys = {}
+    for klass in cls.__mro__:
+        if klass is object:
+            continue
+        for attr in vars(klass).values():
+            func = getattr(attr, "__func__", attr)
+            code = getattr(func, "__code__", None)
+            if code is not None:
+                keys[(code.co_filename, code.co_firstlineno, code.co_name)] = code.co_name
+    return keys
+
+
+def summarize_stages(stats: "pstats.Stats", stages: List[type]) -> Dict[str, Dict]:
+    """
+    按阶段（类）汇总剖析数据
+
+    Returns:
+        {类名: {"cumulative": 入口方法的最大累计耗时, "self": 方法自身耗时之和, "methods": [...]}}
+    """
+    summary = {}
+    for cls in stages:
+        keys = _stage_functions(cls)
+        methods = []
+        for key, (cc, nc, tt, ct, callers) in stats.stats.items():
+            if key in keys:
+                methods.append({
+                    "method": keys[key],
+                    "calls": nc,
+                    "self_s": round(tt, 6),
+                    "cumulative_s": round(ct, 6)
+                })
+        methods.sort(key=lambda m: m["cumulative_s"], reverse=True)
+        summary[cls.__name__] = {
+            "cumulative_s": methods[0]["cumulative_s"] if methods else 0,
+            "self_s": round(sum(m["self_s"] for m in methods), 6),
+            "methods": methods
+        }
+    return summary
+
+
+def _format_summary(name: str, stats: "pstats.Stats", stages: Dict[str, Dict]) -> str:
+    """生成文本摘要：阶段汇总 + 累计耗时和自身耗时排行"""
+    lines = [f"# 剖析报告: {name}", f"# 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", ""]
+
+    lines.append("## 按阶段汇总")
+    for stage, data in stages.items():
+        lines.append(f"{stage:<20} 累计 {data['cumulative_s']:.4f}s  自身 {data['self_s']:.4f}s")
+        for method in data["methods"]:
+            lines.append(
+                f"    {method['method']:<28} 调用 {method['calls']:>7}  "
+                f"自身 {method['self_s']:.4f}s  累计 {method['cumulative_s']:.4f}s"
+            )
+    lines.append("")
+
+    for sort_key, label in (("cumulative", "累计耗时"), ("tottime", "自身耗时")):
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats(sort_key).print_stats(TOP_N)
+        lines.append(f"## 按{label}排序的前 {TOP_N} 个函数")
+        lines.append(stream.getvalue())
+
+    return "\n".join(lines)
+
+
+@contextmanager
+def profile_run(name: str, stages: List[type] = None, output_dir: Optional[str] = None):
+    """
+    用 cProfile 包裹一次运行，结束时写出 .prof 文件和文本摘要
+
+    用法:
+        with profile_run("cli", stages=[TechNewsFetcher, ArticleAnalyzer, WebRenderer]) as result:
+            ...
+        print(result.summary_path)
+    """
+    output_dir = output_dir or default_output_dir()
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = os.path.join(output_dir, f"{name}-{stamp}")
+
+    result = ProfileResult()
+    # cProfile/pstats 只在开启剖析时导入
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+
+        result.prof_path = base + ".prof"
+        profiler.dump_stats(result.prof_path)
+
+        stats = pstats.Stats(profiler)
+        result.stages = summarize_stages(stats, stages or [])
+
+        result.summary_path = base + ".txt"
+        with open(result.summary_path, "w", encoding="utf-8") as f:
+            f.write(_format_summary(name, stats, result.stages))
@@ -0,0 +1,255 @@
+"""排序模块 - 按时间衰减、来源权重、分类置信度、多源报道和 AI 相关强度计算热度，并维护按时间分桶的排序索引"""
+import bisect
+import hashlib
+import heapq
+import json
+import math
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from dates import parse_pub_date
+
+# 热度半衰期（小时），可用 DAILY_AI_NEWS_HALF_LIFE_HOURS 覆盖
+HALF_LIFE_HOURS = 24.0
+
+# 各信号的权重（基础分 = 来源权重 * (1 + Σ 权重 * 信号)）
+WEIGHTS = {
+    "cluster": 1.0,       # 每多一个来源报道同一新闻
+    "confidence": 0.5,    # 分类置信度（0 ~ 1）
+    "intensity": 0.5,     # AI 相关强度（相关性分数 / INTENSITY_CAP，最多为 1）
+    "engagement": 0.25,   # 互动数的对数（RSS 条目没有互动数据时为 0）
+}
+INTENSITY_CAP = 8.0
+
+# 热度的显示比例（刚发布、各信号为 0 的文章为 100）
+SCALE = 100.0
+
+# 排序索引的时间桶宽度（秒）
+BUCKET_SECONDS = 3600
+
+
+def _display(score: float) -> float:
+    """热度保留 4 位有效数字（较早的文章衰减后仍能区分先后，不会都显示为 0）"""
+    return float(f"{score:.4g}")
+
+
+def published_ts(article: Dict) -> Optional[float]:
+    """文章发布时间的 Unix 时间戳，无法解析时为 None"""
+    published = parse_pub_date(article.get("created_at", ""))
+    return published.timestamp() if published else None
+
+
+class RankingEngine:
+    """
+    热度计算
+
+    热度 = SCALE * 基础分 * 2^(-(参考时间 - 发布时间) / 半衰期)
+
+    指数衰减可以拆成与时间无关的排序键 log2(基础分) + 发布时间 / 半衰期，
+    任意参考时间下的热度都是 2^(排序键 - 参考时间 / 半衰期)：时间推移不改变文章之间的先后，
+    排序键算一次即可长期使用（见 RankedIndex），参考时间只决定热度的绝对值。
+    """
+
+    def __init__(self, half_life_hours: Optional[float] = None, weights: Optional[Dict[str, float]] = None):
+        if half_life_hours is None:
+            half_life_hours = float(os.environ.get("DAILY_AI_NEWS_HALF_LIFE_HOURS") or HALF_LIFE_HOURS)
+        self.half_life = half_life_hours * 3600
+        self.weights = {**WEIGHTS, **(weights or {})}
+
+    def fingerprint(self) -> str:
+        """半衰期和权重的指纹（快照版本的一部分，参数变化后热度和排序随之变化）"""
+        content = json.dumps([self.half_life, sorted(self.weights.items())])
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=4).hexdigest()
+
+    def base_scores(self, articles: Sequence[Dict]) -> List[float]:
+        """与时间无关的基础分（逐列计算各信号后合并）"""
+        w = self.weights
+        cluster = [a.get("cluster_size", 1) - 1 for a in articles]
+        confidence = [a.get("category_confidence", 0) or 0 for a in articles]
+        intensity = [min((a.get("relevance", 0) or 0) / INTENSITY_CAP, 1.0) for a in articles]
+        engagement = [math.log1p(self._engagement(a.get("metrics") or {})) for a in articles]
+        source_weight = [a.get("source_weight", 1.0) for a in articles]
+        return [
+            sw * (1 + w["cluster"] * c + w["confidence"] * cf + w["intensity"] * i + w["engagement"] * e)
+            for sw, c, cf, i, e in zip(source_weight, cluster, confidence, intensity, engagement)
+        ]
+
+    @staticmethod
+    def _engagement(metrics: Dict) -> float:
+        return (metrics.get("like_count", 0) + metrics.get("retweet_count", 0) * 2
+                + metrics.get("reply_count", 0) * 1.5 + metrics.get("impression_count", 0) * 0.001)
+
+    def keys(
+        self,
+        articles: Sequence[Dict],
+        timestamps: Optional[Sequence[Optional[float]]] = None,
+        default_ts: Optional[float] = None
+    ) -> List[Tuple[float, float]]:
+        """
+        每篇文章的 (排序键, 发布时间戳)
+
+        Args:
+            timestamps: 已解析的发布时间（默认从 created_at 解析）
+            default_ts: 发布时间无法解析时使用的时间（默认为当前时间）
+        """
+        if timestamps is None:
+            timestamps = [published_ts(a) for a in articles]
+        if default_ts is None:
+            default_ts = datetime.now().timestamp()
+        result = []
+        for base, ts in zip(self.base_scores(articles), timestamps):
+            ts = default_ts if ts is None else ts
+            result.append((math.log2(max(base, 1e-9)) + ts / self.half_life, ts))
+        return result
+
+    def score_at(self, key: float, now: float) -> float:
+        """排序键在参考时间的热度"""
+        return SCALE * 2 ** (key - now / self.half_life)
+
+    def score_batch(self, articles: Sequence[Dict], now: Optional[float] = None) -> List[float]:
+        """
+        一批文章在参考时间的热度
+
+        Args:
+            now: 参考时间（Unix 时间戳），默认为这批文章中最新的发布时间，
+                 使同一批数据的热度不随计算时刻变化（快照版本和 ETag 保持稳定）
+        """
+        timestamps = [published_ts(a) for a in articles]
+        known = [ts for ts in timestamps if ts is not None]
+        if now is None:
+            now = max(known) if known else datetime.now().timestamp()
+        keys = self.keys(articles, timestamps, default_ts=now)
+        return [_display(self.score_at(key, now)) for key, _ in keys]
+
+
+class RankedIndex:
+    """
+    按时间分桶的排序索引
+
+    文章按发布时间放入 BUCKET_SECONDS 宽的桶，桶内按排序键从高到低排列。
+    排序键不随时间变化，因此时间推移时不需要重新打分：取某个时间窗口内的前 K 篇，
+    只需对窗口内的各个桶做一次多路归并，取到 K 篇即停止。
+    update() / sync() 增量更新：只有新增或信号变化的文章重新计算排序键。
+    """
+
+    def __init__(self, engine: Optional[RankingEngine] = None):
+        self.engine = engine or RankingEngine()
+        # 桶编号 → [(-排序键, 文章 ID)]（升序，即排序键从高到低）
+        self._buckets: Dict[int, List[Tuple[float, str]]] = {}
+        # 文章 ID → (桶编号, 排序键, 发布时间戳, 文章, 计算排序键时的信号)
+        self._entries: Dict[str, Tuple[int, float, float, Dict, Tuple]] = {}
+        self._bucket_ids: List[int] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def latest(self) -> Optional[float]:
+        """索引中最新的发布时间戳，索引为空时为 None"""
+        with self._lock:
+            if not self._bucket_ids:
+                return None
+            return max(self._entries[article_id][2] for _, article_id in self._buckets[self._bucket_ids[-1]])
+
+    def add(self, articles: Iterable[Dict]):
+        """加入或更新文章（按 ID）"""
+        articles = [a for a in articles if a.get("id")]
+        keys = self.engine.keys(articles)
+        with self._lock:
+            for article, (key, ts) in zip(articles, keys):
+                self._remove(article["id"])
+                bucket = int(ts // BUCKET_SECONDS)
+                if bucket not in self._buckets:
+                    self._buckets[bucket] = []
+                    bisect.insort(self._bucket_ids, bucket)
+                bisect.insort(self._buckets[bucket], (-key, article["id"]))
+                self._entries[article["id"]] = (bucket, key, ts, article, self._signals(article))
+
+    def remove(self, article_id: str):
+        with self._lock:
+            self._remove(article_id)
+
+    def _remove(self, article_id: str):
+        entry = self._entries.pop(article_id, None)
+        if entry is None:
+            return
+        bucket, key = entry[0], entry[1]
+        items = self._buckets[bucket]
+        items.pop(bisect.bisect_left(items, (-key, article_id)))
+        if not items:
+            del self._buckets[bucket]
+            self._bucket_ids.pop(bisect.bisect_left(self._bucket_ids, bucket))
+
+    def sync(self, articles: Sequence[Dict]) -> int:
+        """
+        与一组文章保持一致：移除不再存在的，加入新增的或排序信号变化的，返回重新计算的篇数
+        """
+        current = {a.get("id") for a in articles if a.get("id")}
+        for article_id in [i for i in self._entries if i not in current]:
+            self.remove(article_id)
+        return self.update(articles)
+
+    def update(self, articles: Iterable[Dict]) -> int:
+        """
+        加入新增的或排序信号变化的文章（不移除其他文章），返回重新计算的篇数
+
+        与计算排序键时记录的信号比较，文章字典原地修改（如合并了新的来源）也能发现。
+        """
+        current = {a.get("id"): a for a in articles if a.get("id")}
+        changed = [
+            article for article_id, article in current.items()
+            if article_id not in self._entries or self._entries[article_id][4] != self._signals(article)
+        ]
+        self.add(changed)
+        return len(changed)
+
+    @staticmethod
+    def _signals(article: Dict) -> Tuple:
+        return (
+            article.get("created_at"), article.get("cluster_size", 1), article.get("category_confidence"),
+            article.get("relevance"), article.get("source_weight", 1.0),
+            tuple(sorted((article.get("metrics") or {}).items()))
+        )
+
+    def top(
+        self,
+        k: int,
+        now: Optional[float] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        predicate=None
+    ) -> List[Tuple[Dict, float]]:
+        """
+        时间窗口内热度最高的 K 篇
+
+        Args:
+            now: 参考时间（Unix 时间戳，默认为当前时间），只影响返回的热度值
+            since, until: 发布时间窗口 [since, until)（Unix 时间戳）
+            predicate: 额外的过滤条件（如来源、分类）
+
+        Returns:
+            [(文章, 热度)]，按热度从高到低
+        """
+        if k <= 0:
+            return []
+        if now is None:
+            now = datetime.now().timestamp()
+        with self._lock:
+            lo = 0 if since is None else bisect.bisect_left(self._bucket_ids, int(since // BUCKET_SECONDS))
+            hi = len(self._bucket_ids) if until is None else \
+                bisect.bisect_right(self._bucket_ids, int(until // BUCKET_SECONDS))
+            streams = [self._buckets[b] for b in self._bucket_ids[lo:hi]]
+            results = []
+            for neg_key, article_id in heapq.merge(*streams):
+                _, _, ts, article, _ = self._entries[article_id]
+                # 窗口两端的桶只有部分落在窗口内
+                if (since is not None and ts < since) or (until is not None and ts >= until):
+                    continue
+                if predicate is not None and not predicate(article):
+                    continue
+                results.append((article, _display(self.engine.score_at(-neg_key, now))))
+                if len(results) >= k:
+                    break
+            return results
@@ -0,0 +1,268 @@
+"""文章记录模块 - 紧凑的文章对象：字段存放在 __slots__ 中，来源、分类等重复的字符串驻留，作者和互动数据按内容共享，可当作字典使用"""
+import sys
+import threading
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# 文章的已知字段（抓取器、去重、互动数据补全和分析器写入的字段）；其他字段存放在 _extra 字典中
+FIELDS = (
+    "id", "title", "title_cn", "text", "text_cn", "author", "metrics", "created_at", "url", "source",
+    "category_text", "features", "sources", "cluster_size", "source_weight",
+    "category", "category_confidence", "categories", "relevance", "tags", "mentions", "urls", "hot_score"
+)
+_SLOTS = frozenset(FIELDS)
+
+# 取值只有少数几种的字符串字段，驻留后所有文章共用一份（模拟翻译器的 text_cn 也只有几种模板）
+_INTERNED = frozenset({"source", "category", "category_text", "text_cn"})
+
+# 字符串列表字段，转为共享的元组（相同的标签组合只保存一份）
+_TUPLES = frozenset({"categories", "tags", "mentions"})
+
+# 取值重复的子对象（作者按来源只有几种，未补全的互动数据全为 0），转为共享的只读映射
+_SHARED_MAPS = frozenset({"author", "metrics"})
+
+# 共享表的最大条目数，超出后新值不再共享（正确性不受影响，只是不再节省内存）
+MAX_SHARED = 65536
+
+_shared_maps: Dict[Tuple, "FrozenMap"] = {}
+_shared_tuples: Dict[Tuple, Tuple] = {}
+_lock = threading.Lock()
+
+
+class FrozenMap(Mapping):
+    """
+    只读的小映射（作者、互动数据、特征、合并来源的一项等），模板中可按属性或键访问
+
+    键和值各存为一个元组（键元组按内容共享），没有哈希表；这些映射只有几个键，按位置查找即可。
+    """
+
+    __slots__ = ("_keys", "_values")
+
+    def __init__(self, data):
+        items = data.items() if isinstance(data, Mapping) else data
+        keys, values = zip(*items) if items else ((), ())
+        self._keys = shared_tuple(keys)
+        self._values = tuple(values)
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return self._values[self._keys.index(key)] if key in self._keys else default
+
+    def __contains__(self, key) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def items(self):
+        return zip(self._keys, self._values)
+
+    def __repr__(self) -> str:
+        return f"FrozenMap({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict:
+        return {key: _plain(value) for key, value in zip(self._keys, self._values)}
+
+
+def shared_map(data: Mapping) -> FrozenMap:
+    """内容相同的映射共用同一个 FrozenMap（字符串值驻留）"""
+    if isinstance(data, FrozenMap):
+        return data
+    items = tuple((key, sys.intern(value) if isinstance(value, str) else value) for key, value in data.items())
+    try:
+        shared = _shared_maps.get(items)
+    except TypeError:
+        # 含不可哈希的值（如嵌套列表），不共享
+        return FrozenMap(items)
+    if shared is None:
+        shared = FrozenMap(items)
+        with _lock:
+            if len(_shared_maps) < MAX_SHARED:
+                shared = _shared_maps.setdefault(items, shared)
+    return shared
+
+
+def shared_tuple(values: Iterable) -> Tuple:
+    """内容相同的字符串列表共用同一个元组（元素驻留）"""
+    items = tuple(sys.intern(value) if isinstance(value, str) else value for value in values)
+    if not items:
+        return ()
+    shared = _shared_tuples.get(items)
+    if shared is None:
+        shared = items
+        with _lock:
+            if len(_shared_tuples) < MAX_SHARED:
+                shared = _shared_tuples.setdefault(items, items)
+    return shared
+
+
+def _compact_features(features: Mapping) -> FrozenMap:
+    """特征：版本字符串和词表中的词驻留，列表转为共享的元组"""
+    return FrozenMap([
+        (key, sys.intern(value) if key == "v" and isinstance(value, str)
+         else shared_tuple(value) if isinstance(value, list) else value)
+        for key, value in features.items()
+    ])
+
+
+class Article(MutableMapping):
+    """
+    一篇文章
+
+    与文章字典的读写方式相同（get、[]、in、items、{**article} 等），模板中也可按属性访问，
+    内存占用约为字典表示的几分之一:
+        - 已知字段存放在 __slots__ 中，没有每篇文章一个的字段字典
+        - 来源、分类等取值只有几种的字符串驻留，作者和互动数据按内容共享一个只读对象
+        - 标签等字符串列表转为共享的元组；合并来源（sources）中与文章相同的链接和标题复用文章的字符串
+
+    作者和互动数据是只读的，修改时整体替换（article["metrics"] = {...}）。
+    序列化为 JSON 时用 to_dict() 或 json.dumps(..., default=json_default)。
+    """
+
+    __slots__ = FIELDS + ("_extra",)
+
+    def __init__(self, data: Mapping = None, **fields):
+        self._extra = None
+        if data:
+            for key, value in data.items():
+                self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Article":
+        return data if isinstance(data, cls) else cls(data)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _SLOTS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _SLOTS:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra is not None else default
+
+    def __contains__(self, key) -> bool:
+        if key in _SLOTS:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in _SLOTS:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+            return
+        compact = _COMPACT.get(key)
+        setattr(self, key, compact(self, value) if compact else value)
+
+    def _compact_sources(self, sources: Any) -> Any:
+        """合并来源：来源名驻留，与文章本身相同的链接和标题复用文章的字符串"""
+        if not isinstance(sources, list):
+            return sources
+        own = {"url": self.get("url"), "title": self.get("title")}
+        return [
+            FrozenMap([
+                (key, sys.intern(value) if key == "source" and isinstance(value, str)
+                 else own[key] if key in own and value == own[key] else value)
+                for key, value in source.items()
+            ])
+            for source in sources
+        ]
+
+    def __delitem__(self, key: str):
+        if key in _SLOTS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for key in FIELDS if hasattr(self, key)) + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self) -> str:
+        return f"Article({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict:
+        """转换为普通字典（与抓取器输出的结构相同，可直接序列化为 JSON）"""
+        return {key: _plain(value) for key, value in self.items()}
+
+
+def _intern(article: Article, value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _tuple(article: Article, value: Any) -> Any:
+    return shared_tuple(value) if isinstance(value, (list, tuple)) else value
+
+
+def _map(article: Article, value: Any) -> Any:
+    return shared_map(value) if isinstance(value, Mapping) else value
+
+
+def _features(article: Article, value: Any) -> Any:
+    return _compact_features(value) if isinstance(value, dict) else value
+
+
+def _urls(article: Article, value: Any) -> Any:
+    return tuple(value) if isinstance(value, list) else value
+
+
+# 各字段写入时的紧凑化处理（其余字段原样保存）
+_COMPACT = {
+    **dict.fromkeys(_INTERNED, _intern),
+    **dict.fromkeys(_TUPLES, _tuple),
+    **dict.fromkeys(_SHARED_MAPS, _map),
+    "features": _features,
+    "sources": Article._compact_sources,
+    "urls": _urls,
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, (Article, FrozenMap)):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """json.dumps 的 default：序列化 Article 和 FrozenMap"""
+    if isinstance(value, (Article, FrozenMap)):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def to_records(articles: Iterable[Mapping]) -> List[Article]:
+    """把一批文章字典转换为 Article"""
+    return [Article.from_dict(article) for article in articles]
@@ -0,0 +1,126 @@
+"""相关性模块 - 在分词后的文本上按加权词表判断内容是否与 AI 相关"""
+import re
+from typing import Dict, List, Sequence, Tuple
+
+# 英文词（字母数字）或连续的汉字
+_TOKEN = re.compile(r"[a-z0-9]+|[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+# 小写字母后紧跟大写字母处（去掉内联链接后常见 "ofClaude CodeatAnthropic" 式粘连）
+_CAMEL = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+# 正向词及权重：单独出现即可达到阈值的为 2，需要与其他词同时出现的为 1 或更低
+# 英文词按整词匹配（"ai" 不会匹配 "said"、"again"、"email"），多词短语按连续的词匹配
+AI_TERMS = {
+    "ai": 2.0, "artificial intelligence": 2.0, "machine learning": 2.0, "deep learning": 2.0,
+    "neural network": 2.0, "neural networks": 2.0, "llm": 2.0, "llms": 2.0, "gpt": 2.0,
+    "chatgpt": 2.0, "openai": 2.0, "anthropic": 2.0, "deepmind": 2.0, "deep mind": 2.0, "midjourney": 2.0,
+    "stable diffusion": 2.0, "diffusion model": 2.0, "diffusion models": 2.0,
+    "language model": 2.0, "language models": 2.0, "chatbot": 2.0, "chatbots": 2.0,
+    "reinforcement learning": 2.0, "computer vision": 2.0, "nlp": 2.0,
+    "natural language processing": 2.0, "agentic": 2.0, "generative": 2.0, "multimodal": 1.5,
+    # 有歧义的产品名单独出现时分数不足，与公司名或型号连用时才确定
+    "claude": 1.0, "claude code": 2.0, "claude sonnet": 2.0, "claude opus": 2.0, "claude haiku": 2.0,
+    "gemini": 1.0, "google gemini": 2.0, "copilot": 1.0, "github copilot": 2.0, "microsoft copilot": 2.0,
+    "robotics": 1.0, "transformer": 0.5, "transformers": 0.5, "autonomous": 0.5, "automation": 0.5,
+    "model": 0.5, "models": 0.5, "agent": 0.5, "agents": 0.5, "inference": 0.5,
+    "人工智能": 2.0, "机器学习": 2.0, "深度学习": 2.0, "神经网络": 2.0, "大模型": 2.0,
+    "强化学习": 2.0, "生成式": 1.5, "多模态": 1.5, "智能": 0.5,
+}
+
+# 负向词：关键词的常见非 AI 含义（艺术家艾未未、星座、画家莫奈、变形金刚、电力变压器、智能手机等）
+NEGATIVE_TERMS = {
+    "ai weiwei": -4.0, "weiwei": -2.0, "horoscope": -2.0, "zodiac": -2.0, "monet": -1.0,
+    "debussy": -1.0, "optimus prime": -2.0, "substation": -1.0, "voltage": -0.5,
+    "智能手机": -0.5,
+}
+
+# 总分达到该值视为 AI 相关
+THRESHOLD = 2.0
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    切分为小写英文词和连续汉字串（共享的词流，相关性、分类等都在其上计算）
+
+    小写字母后紧跟大写字母处视为词边界，因此 "DeepMind" 切成 "deep"、"mind"，
+    "OpenAI" 切成 "open"、"ai"。
+    """
+    return _TOKEN.findall(_CAMEL.sub(" ", text or "").lower())
+
+
+class TermMatcher:
+    """
+    在词流上匹配词表
+
+    单个英文词用集合求交，多词短语和含汉字的词在以空格连接的词流中查找子串
+    （英文部分两侧带空格，保证按整词匹配；汉字没有词边界，直接查找）。
+    """
+
+    def __init__(self, weights: Dict[str, float]):
+        # 单个英文词 → 权重
+        self._words: Dict[str, float] = {}
+        # 多词短语按首词分组: 首词 → [(" 词1 词2 ", 原词, 权重)]
+        self._phrases: Dict[str, List[Tuple[str, str, float]]] = {}
+        # 含汉字的词（子串匹配；以英文开头的如 "AI 绘画" 前面带空格，英文部分仍按整词匹配）
+        self._cjk: List[Tuple[str, str, float]] = []
+        for term, weight in weights.items():
+            words = tokenize(term)
+            if not term.isascii():
+                needle = " ".join(words)
+                self._cjk.append((needle if needle[0] > "\x7f" else f" {needle}", term, weight))
+            elif len(words) == 1:
+                self._words[words[0]] = weight
+            else:
+                self._phrases.setdefault(words[0], []).append((f" {' '.join(words)} ", term, weight))
+        self._phrase_heads = frozenset(self._phrases)
+        self._weights = weights
+
+    def hits(self, tokens: Sequence[str]) -> Dict[str, float]:
+        """命中的词及其权重"""
+        present = set(tokens)
+        found = {word: self._words[word] for word in self._words.keys() & present}
+        heads = self._phrase_heads & present
+        joined = f" {' '.join(tokens)} "
+        for head in heads:
+            for needle, term, weight in self._phrases[head]:
+                if needle in joined:
+                    found[term] = weight
+        if not joined.isascii():
+            for needle, term, weight in self._cjk:
+                if needle in joined:
+                    found[term] = weight
+        return found
+
+
+class RelevanceScorer(TermMatcher):
+    """
+    AI 相关性打分器
+
+    用 TermMatcher 在词流上匹配正负加权词表，每个词只计一次分（重复出现不累加），
+    正负权重相加后与阈值比较。
+    """
+
+    def __init__(
+        self,
+        terms: Dict[str, float] = None,
+        negative: Dict[str, float] = None,
+        threshold: float = THRESHOLD
+    ):
+        self.threshold = threshold
+        weights = dict(AI_TERMS if terms is None else terms)
+        weights.update(NEGATIVE_TERMS if negative is None else negative)
+        super().__init__(weights)
+
+    def fingerprint(self) -> List:
+        """词表和阈值（词表变化时，依赖打分结果的缓存据此失效）"""
+        return [sorted(self._weights.items()), self.threshold]
+
+    def score_tokens(self, tokens: Sequence[str]) -> float:
+        return sum(self.hits(tokens).values())
+
+    def score(self, text: str) -> float:
+        return self.score_tokens(tokenize(text))
+
+    def is_relevant(self, text: str) -> bool:
+        """内容是否与 AI 相关"""
+        return self.score(text) >= self.threshold
@@ -2,16 +2,24 @@
 import os
 from datetime import datetime
 from typing import List, Dict, Optional
-from jinja2 import Template, Environment, FileSystemLoader
+from sources import SourceRegistry, get_registry
+import config
+import metrics
 
 
 class WebRenderer:
     """网页渲染器"""
 
-    def __init__(self, template_dir: Optional[str] = None):
+    def __init__(self, template_dir: Optional[str] = None, registry: Optional[SourceRegistry] = None):
+        # 来源筛选标签和页脚使用注册表中预先计算的查找表
+        self.registry = registry or get_registry()
+
         if template_dir is None:
-            # 默认使用当前目录下的 templates
-            template_dir = os.path.join(os.path.dirname(__file__), "templates")
+            # 默认使用项目根目录下的 templates（utils/ 下的副本也指向这里）
+            template_dir = os.path.join(config.BASE_DIR, "templates")
+
+        # Jinja2 只在创建渲染器时导入，不渲染页面的入口无需加载
+        from jinja2 import Environment, FileSystemLoader
 
         self.env = Environment(
             loader=FileSystemLoader(template_dir),
@@ -31,6 +39,17 @@ class WebRenderer:
             return f"{num / 1000:.1f}K"
         return str(num)
 
+    def source_chips(self, tweets: List[Dict]) -> List[Dict]:
+        """来源筛选标签：注册表中的源，加上文章中出现但未注册的来源（如模拟数据）"""
+        chips = list(self.registry.chips)
+        known = set(self.registry.labels)
+        for tweet in tweets:
+            name = tweet.get("source")
+            if name and name not in known:
+                known.add(name)
+                chips.append({"name": name, "label": name})
+        return chips
+
     def _format_time(self, time_str: str) -> str:
         """格式化时间"""
         try:
@@ -45,7 +64,8 @@ class WebRenderer:
         stats: Dict,
         output_path: str,
         date: Optional[datetime] = None,
-        title: str = "每日 AI 速递"
+        title: str = "每日 AI 速递",
+        search_index: bool = False
     ) -> str:
         """
         渲染网页
@@ -56,10 +76,44 @@ class WebRenderer:
             output_path: 输出文件路径
             date: 日期
             title: 页面标题
+            search_index: 同时在页面旁生成分片检索索引（<页面名>-search/），页面显示搜索框
 
         Returns:
             输出文件路径
         """
+        index_info = None
+        if search_index:
+            from fulltext import write_client_index
+
+            with metrics.span("search_index", count=len(tweets)):
+                index_info = write_client_index(tweets, os.path.splitext(output_path)[0] + "-search")
+
+        html = self.render_html(tweets, stats, date, title, search_index=index_info)
+
+        # 确保输出目录存在
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        # 写入文件
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write(html)
+
+        return output_path
+
+    def render_html(
+        self,
+        tweets: List[Dict],
+        stats: Dict,
+        date: Optional[datetime] = None,
+        title: str = "每日 AI 速递",
+        search_index: Optional[Dict] = None
+    ) -> str:
+        """
+        渲染网页并返回 HTML 字符串（API 直接返回，不经过文件）
+
+        search_index 为 fulltext.write_client_index 返回的描述信息，没有时不显示搜索框
+        """
         date = date or datetime.now()
         date_str = date.strftime("%Y-%m-%d")
         date_display = date.strftime("%Y年%m月%d日")
@@ -78,24 +132,18 @@ class WebRenderer:
             "tweets": tweets,
             "stats": stats,
             "now": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "sources": self.source_chips(tweets),
+            "source_labels": self.registry.labels,
+            "sources_footer": self.registry.footer,
+            "search_index": search_index,
             "categories": [
                 "大模型", "AI 绘画", "工具推荐", "技术分享", "行业新闻", "其他"
             ]
         }
 
         # 渲染
-        html = template.render(context)
-
-        # 确保输出目录存在
-        output_dir = os.path.dirname(output_path)
-        if output_dir:
-            os.makedirs(output_dir, exist_ok=True)
-
-        # 写入文件
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html)
-
-        return output_path
+        with metrics.span("render", template=template.name, count=len(tweets)):
+            return template.render(context)
 
     def render_summary(
         self,
@@ -121,7 +169,8 @@ class WebRenderer:
             "total_tweets": sum(d.get("count", len(d.get("tweets", []))) for d in daily_data)
         }
 
-        html = template.render(context)
+        with metrics.span("render", template=template.name, days=days):
+            html = template.render(context)
 
         output_dir = os.path.dirname(output_path)
         if output_dir:
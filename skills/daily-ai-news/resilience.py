@@ -0,0 +1,169 @@
+"""抓取容错模块 - 源健康度与熔断、按主机限速、瞬时错误的指数退避重试"""
+import json
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict
+from urllib.parse import urlsplit
+
+import config
+
+# 连续失败这么多次后熔断
+FAILURE_THRESHOLD = 3
+
+# 熔断冷却时间（秒）：首次 30 分钟，之后每次再熔断翻倍，最长 12 小时
+COOLDOWN = 30 * 60
+MAX_COOLDOWN = 12 * 3600
+
+# 视为瞬时错误、值得重试的 HTTP 状态码
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def is_transient(error: Exception) -> bool:
+    """连接失败、超时和 429/5xx 视为瞬时错误"""
+    import requests
+
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        return error.response.status_code in RETRY_STATUS
+    return False
+
+
+class RetryPolicy:
+    """
+    瞬时错误的重试策略（指数退避 + 全抖动）
+
+    第 n 次重试前等待 uniform(0, min(max_delay, base_delay × 2^n)) 秒；
+    服务端给出 Retry-After 时按其等待，但不超过 max_delay。
+    所有重试的等待总和不超过 budget，避免拖长 serverless 执行时间。
+    """
+
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 4.0, budget: float = 8.0):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    def delay(self, attempt: int, error: Exception) -> float:
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def call(self, func: Callable, on_retry: Callable[[int, Exception], None] = None):
+        import requests
+
+        waited = 0.0
+        for attempt in range(self.attempts):
+            try:
+                return func()
+            except requests.exceptions.RequestException as e:
+                if attempt + 1 >= self.attempts or not is_transient(e):
+                    raise
+                delay = self.delay(attempt, e)
+                if waited + delay > self.budget:
+                    raise
+                if on_retry:
+                    on_retry(attempt + 1, e)
+                time.sleep(delay)
+                waited += delay
+
+
+class HostRateLimiter:
+    """
+    按主机的令牌桶限速
+
+    每个主机最多连续发出 burst 个请求，之后每秒补充 rate 个；rate 为 0 表示不限速。
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 5):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> float:
+        """等到该主机有可用令牌，返回等待的秒数"""
+        if not self.rate:
+            return 0.0
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            delay = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            # 先扣除令牌再休眠，并发请求会依次排在后面
+            self._buckets[host] = (tokens - 1, now)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class SourceHealth:
+    """
+    各源（按 URL）的健康记录与熔断器
+
+    每个源记录:
+        failures: 连续失败次数
+        open_until: 熔断截止时间（Unix 时间戳），之前的请求直接跳过
+        trips: 连续熔断次数，决定下次冷却时长
+        last_error: 最近一次错误信息
+
+    冷却结束后放行一次请求（半开）：成功则恢复，失败则立即再次熔断。
+    """
+
+    STATE_FILE = "source_health.json"
+
+    def __init__(self, state: Dict[str, Dict] = None, path: str = None):
+        self.state = state or {}
+        self.path = path
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls) -> "SourceHealth":
+        path = config.state_path(cls.STATE_FILE)
+        state = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        return cls(state, path)
+
+    def allow(self, url: str, now: float = None) -> bool:
+        """源是否可以请求（未熔断或冷却已结束）"""
+        entry = self.state.get(url)
+        if not entry or not entry.get("open_until"):
+            return True
+        return (now or time.time()) >= entry["open_until"]
+
+    def record_success(self, url: str):
+        with self._lock:
+            self.state.pop(url, None)
+
+    def record_failure(self, url: str, error: Exception, now: float = None) -> bool:
+        """记录一次失败，返回是否因此熔断"""
+        now = now or time.time()
+        with self._lock:
+            entry = self.state.setdefault(url, {"failures": 0, "open_until": None, "trips": 0, "last_error": ""})
+            entry["failures"] += 1
+            entry["last_error"] = str(error)[:200]
+            # 半开状态下的失败直接重新熔断
+            half_open = entry["open_until"] is not None
+            if entry["failures"] < FAILURE_THRESHOLD and not half_open:
+                return False
+            cooldown = min(COOLDOWN * 2 ** entry["trips"], MAX_COOLDOWN)
+            entry["trips"] += 1
+            entry["open_until"] = now + cooldown
+            return True
+
+    def save(self):
+        """写回健康记录（先写临时文件再重命名）；未指定路径时只保存在内存中"""
+        if not self.path:
+            return
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
@@ -0,0 +1,173 @@
+"""轮询调度模块 - 按各源的更新频率自适应决定每次定时任务抓取哪些源"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import config
+
+# 轮询间隔上下限（秒）
+MIN_INTERVAL = 15 * 60
+MAX_INTERVAL = 24 * 3600
+DEFAULT_INTERVAL = 3600
+
+# 目标：平均每次轮询拿到这么多新条目
+TARGET_ITEMS_PER_POLL = 3
+
+# 发布速率（条/小时）指数滑动平均中新样本的权重
+RATE_ALPHA = 0.3
+
+# 源沉寂时（最新条目距今很久），间隔至少为沉寂时长的这个比例
+SILENCE_FRACTION = 0.25
+
+# 连续失败时的退避上限（秒）
+MAX_BACKOFF = 24 * 3600
+
+# 定时任务触发时刻有抖动，到期时间在这个范围内的源也视为到期（秒）
+TICK_SLACK = 5 * 60
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _format_time(value: Optional[datetime]) -> Optional[str]:
+    return value.astimezone(timezone.utc).isoformat(timespec="seconds") if value else None
+
+
+class PollScheduler:
+    """
+    按源自适应的轮询调度器
+
+    每个源（按名称）记录:
+        interval: 当前轮询间隔（秒）
+        next_due: 下次到期时间
+        last_polled: 上次成功抓取时间
+        rate: 发布速率的滑动平均（条/小时），首次抓取前为 None
+        latest_item: 最新条目的发布时间
+        errors: 连续失败次数
+    """
+
+    STATE_FILE = "poll_schedule.json"
+
+    def __init__(self, sources: List[Dict], state: Dict[str, Dict] = None, path: str = None):
+        self.sources = sources
+        self.state = state or {}
+        self.path = path
+
+    @classmethod
+    def load(cls, sources: List[Dict]) -> "PollScheduler":
+        path = config.state_path(cls.STATE_FILE)
+        state = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        return cls(sources, state, path)
+
+    def _entry(self, name: str) -> Dict:
+        return self.state.setdefault(name, {
+            "interval": DEFAULT_INTERVAL,
+            "next_due": None,
+            "last_polled": None,
+            "rate": None,
+            "latest_item": None,
+            "errors": 0
+        })
+
+    def due(self, now: datetime = None, limit: int = 0) -> List[Dict]:
+        """
+        本次应抓取的源（未抓取过的源立即到期），最早到期的排在前面
+
+        Args:
+            now: 当前时间
+            limit: 最多返回的源数量，0 表示不限制
+        """
+        now = now or _now()
+        cutoff = now + timedelta(seconds=TICK_SLACK)
+        due = []
+        for source in self.sources:
+            next_due = _parse_time(self.state.get(source["name"], {}).get("next_due"))
+            if next_due is None or next_due <= cutoff:
+                due.append((next_due or datetime.min.replace(tzinfo=timezone.utc), source))
+        due.sort(key=lambda pair: pair[0])
+        sources = [source for _, source in due]
+        return sources[:limit] if limit else sources
+
+    def next_due(self) -> Optional[datetime]:
+        """所有源中最早的到期时间"""
+        times = [_parse_time(self.state.get(s["name"], {}).get("next_due")) for s in self.sources]
+        if any(t is None for t in times):
+            return None
+        return min(times) if times else None
+
+    def record_success(self, name: str, new_items: int, latest: Optional[datetime] = None, now: datetime = None):
+        """
+        记录一次成功抓取并重新计算轮询间隔
+
+        间隔 = 目标条目数 / 发布速率，限制在 [MIN_INTERVAL, MAX_INTERVAL]；
+        首次抓取的条目是积压而不是新发布的，不参与速率估计。
+        """
+        now = now or _now()
+        entry = self._entry(name)
+        last_polled = _parse_time(entry["last_polled"])
+
+        if last_polled is not None:
+            hours = max((now - last_polled).total_seconds() / 3600, MIN_INTERVAL / 3600)
+            sample = new_items / hours
+            rate = entry["rate"]
+            entry["rate"] = sample if rate is None else RATE_ALPHA * sample + (1 - RATE_ALPHA) * rate
+
+        if latest is not None:
+            previous = _parse_time(entry["latest_item"])
+            if previous is None or latest > previous:
+                entry["latest_item"] = _format_time(latest)
+
+        entry["interval"] = self._interval(entry, now)
+        entry["errors"] = 0
+        entry["last_polled"] = _format_time(now)
+        entry["next_due"] = _format_time(now + timedelta(seconds=entry["interval"]))
+
+    def record_failure(self, name: str, now: datetime = None):
+        """记录一次失败：按连续失败次数指数退避，不改变正常间隔"""
+        now = now or _now()
+        entry = self._entry(name)
+        entry["errors"] += 1
+        backoff = min(entry["interval"] * 2 ** entry["errors"], MAX_BACKOFF)
+        entry["next_due"] = _format_time(now + timedelta(seconds=backoff))
+
+    def record(self, results: Dict[str, Dict], now: datetime = None):
+        """按 TechNewsFetcher.fetch_by_rss 的 results 更新各源状态"""
+        for name, result in results.items():
+            if result["ok"]:
+                self.record_success(name, result["new_items"], result["latest"], now)
+            else:
+                self.record_failure(name, now)
+
+    def _interval(self, entry: Dict, now: datetime) -> float:
+        rate = entry["rate"]
+        if rate is None:
+            interval = DEFAULT_INTERVAL
+        elif rate <= 0:
+            interval = MAX_INTERVAL
+        else:
+            interval = TARGET_ITEMS_PER_POLL / rate * 3600
+
+        # 周更类的源：很久没有新条目时没必要频繁查看
+        latest = _parse_time(entry["latest_item"])
+        if latest is not None:
+            interval = max(interval, (now - latest).total_seconds() * SILENCE_FRACTION)
+
+        return round(min(max(interval, MIN_INTERVAL), MAX_INTERVAL))
+
+    def save(self):
+        """写回调度状态（先写临时文件再重命名）"""
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
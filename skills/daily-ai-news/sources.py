@@ -0,0 +1,182 @@
+"""数据源注册表 - 从配置文件或环境变量加载 RSS 源，并为渲染准备查找表"""
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+# 未配置时使用的默认源
+DEFAULT_SOURCES = [
+    {
+        "name": "TechCrunch",
+        "url": "https://techcrunch.com/category/artificial-intelligence/feed/",
+        "category": "科技媒体"
+    },
+    {
+        "name": "The Verge",
+        "url": "https://www.theverge.com/rss/artificial-intelligence/index.xml",
+        "category": "科技媒体",
+        "parser": "atom"
+    },
+    {
+        "name": "VentureBeat",
+        "url": "https://venturebeat.com/category/ai/feed/",
+        "category": "科技媒体"
+    },
+    {
+        "name": "MIT Technology Review",
+        "url": "https://www.technologyreview.com/feed/",
+        "category": "科技媒体",
+        "label": "MIT Tech Review"
+    },
+    {
+        "name": "AI News",
+        "url": "https://artificialintelligence-news.com/feed/",
+        "category": "AI 专业"
+    }
+]
+
+# 解析方式：rss 只找 <item>，atom 只找 <entry>，auto 两者都试
+PARSERS = ("rss", "atom", "auto")
+
+# 各字段的默认值
+SOURCE_DEFAULTS = {
+    "category": "科技媒体",
+    "timeout": 20,
+    "priority": 0,
+    "parser": "auto",
+    "weight": 1.0,
+    "translate": True,
+    "enabled": True
+}
+
+
+class SourceRegistry:
+    """
+    RSS 源注册表
+
+    每个源是一个字典:
+        name: 名称（唯一，也是文章的 source 字段）
+        url: 源地址
+        category: 分类
+        label: 筛选标签上显示的短名称（默认同 name）
+        timeout: 读取超时（秒）
+        priority: 优先级，越大越先抓取、在筛选标签中越靠前
+        parser: rss / atom / auto
+        weight: 热度权重（乘到热度分数上）
+        translate: 是否需要生成中文翻译（中文源设为 false）
+        enabled: 为 false 时不加载
+
+    加载顺序: DAILY_AI_NEWS_SOURCES 指定的 YAML/JSON 文件 → RSS_FEEDS 环境变量 → 默认源
+    """
+
+    def __init__(self, sources: List[Dict]):
+        normalized = [self._normalize(source) for source in sources]
+        normalized = [s for s in normalized if s["enabled"]]
+
+        names = set()
+        for source in normalized:
+            if source["name"] in names:
+                raise ValueError(f"数据源名称重复: {source['name']}")
+            names.add(source["name"])
+
+        # 稳定排序：同优先级保持配置中的顺序
+        self.sources = sorted(normalized, key=lambda s: -s["priority"])
+
+        # 渲染用查找表（加载时计算一次）
+        self.by_name = {s["name"]: s for s in self.sources}
+        self.labels = {s["name"]: s["label"] for s in self.sources}
+        self.weights = {s["name"]: s["weight"] for s in self.sources}
+        self.chips = [{"name": s["name"], "label": s["label"]} for s in self.sources]
+        self.footer = ", ".join(s["name"] for s in self.sources)
+
+    @staticmethod
+    def _normalize(source: Dict) -> Dict:
+        if not source.get("name") or not source.get("url"):
+            raise ValueError(f"数据源缺少 name 或 url: {source}")
+        normalized = dict(SOURCE_DEFAULTS)
+        normalized.update(source)
+        normalized.setdefault("label", normalized["name"])
+        if normalized["parser"] not in PARSERS:
+            raise ValueError(f"数据源 {normalized['name']} 的 parser 必须是 {'/'.join(PARSERS)}")
+        normalized["timeout"] = float(normalized["timeout"])
+        normalized["priority"] = int(normalized["priority"])
+        normalized["weight"] = float(normalized["weight"])
+        return normalized
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def __iter__(self):
+        return iter(self.sources)
+
+    def get(self, name: str) -> Optional[Dict]:
+        return self.by_name.get(name)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SourceRegistry":
+        """
+        从 YAML 或 JSON 文件加载
+
+        文件内容为源列表，或 {"sources": [...]}；YAML 需要安装 PyYAML。
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith((".yaml", ".yml")):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ImportError("加载 YAML 数据源配置需要安装 PyYAML: pip install pyyaml")
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("sources", [])
+        return cls(data or [])
+
+    @classmethod
+    def from_env(cls, value: str) -> Optional["SourceRegistry"]:
+        """
+        从 RSS_FEEDS 环境变量加载
+
+        支持 JSON（同配置文件格式），或逗号分隔的 "名称|URL" / URL 列表；
+        没有有效的源时返回 None。
+        """
+        value = (value or "").strip()
+        if not value:
+            return None
+        if value[0] in "[{":
+            data = json.loads(value)
+            if isinstance(data, dict):
+                data = data.get("sources", [])
+            return cls(data) if data else None
+
+        sources = []
+        for entry in value.split(","):
+            name, _, url = entry.strip().rpartition("|")
+            url = url.strip()
+            # 忽略未展开的占位符等无效条目
+            if "://" not in url:
+                continue
+            sources.append({"name": name.strip() or url.split("://", 1)[1].split("/", 1)[0], "url": url})
+        return cls(sources) if sources else None
+
+    @classmethod
+    def load(cls) -> "SourceRegistry":
+        path = os.environ.get("DAILY_AI_NEWS_SOURCES")
+        if path:
+            return cls.from_file(path)
+        registry = cls.from_env(os.environ.get("RSS_FEEDS", ""))
+        return registry or cls(DEFAULT_SOURCES)
+
+
+_registry: Optional[SourceRegistry] = None
+_lock = threading.Lock()
+
+
+def get_registry() -> SourceRegistry:
+    """进程内共享的注册表（首次调用时加载）"""
+    global _registry
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                _registry = SourceRegistry.load()
+    return _registry
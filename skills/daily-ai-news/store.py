@@ -0,0 +1,359 @@
+"""文章存储模块 - 已保存数据的快照（缓存响应体和 ETag）、跨日期的查询索引与热度排序索引"""
+import base64
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from dates import parse_pub_date
+from dedup import StoryDeduplicator
+from identity import article_id
+from journal import ArticleJournal, dates
+from ranking import RankedIndex
+from records import Article
+
+# 每个快照最多缓存多少种 limit 的响应体
+MAX_CACHED_BODIES = 8
+
+# 查询接口单页的最大条数
+MAX_PAGE_SIZE = 200
+
+# 只在内部使用的字段，不出现在接口响应中：随文章保存的特征（见 features.FeatureExtractor）
+# 只在分析缓存未命中时写入，保留会使响应（及 ETag）随缓存状态变化
+INTERNAL_FIELDS = frozenset({"features"})
+
+
+def _version(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def public_article(article: Dict) -> Dict:
+    """接口响应中的文章（去掉内部字段）"""
+    return {key: value for key, value in article.items() if key not in INTERNAL_FIELDS}
+
+
+class Snapshot:
+    """
+    某一版本的文章数据（已分析、按热度排序）
+
+    响应体按 limit 序列化一次后缓存（同时缓存 gzip 压缩版本），
+    数据不变时重复请求只需查表；ETag 由数据版本和 limit 决定。
+    """
+
+    def __init__(self, articles: List[Dict], stats: Dict, version: str, generated_at: str):
+        self.articles = articles
+        self.stats = stats
+        self.version = version
+        self.generated_at = generated_at
+        self._bodies: "OrderedDict[int, Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_articles(cls, articles: List[Dict], analyzer, version: str = None, generated_at: str = None) -> "Snapshot":
+        """分析文章并生成快照（去掉内部字段）；未给出版本时用结果的哈希"""
+        result = analyzer.analyze_batch(articles)
+        articles = [public_article(article) for article in result["tweets"]]
+        if version is None:
+            version = _version(json.dumps(articles, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        return cls(articles, result["stats"], version, generated_at or datetime.utcnow().isoformat())
+
+    @staticmethod
+    def _limit(limit: int) -> int:
+        """limit 至少为 1（负数切片会从末尾截取）"""
+        return max(1, limit)
+
+    def etag(self, limit: int, compressed: bool = False) -> str:
+        """强校验 ETag（gzip 版本与原文的字节不同，使用不同的 ETag）"""
+        return f'"{self.version}-{self._limit(limit)}{"-gz" if compressed else ""}"'
+
+    def matches(self, if_none_match: str, limit: int) -> bool:
+        """If-None-Match 是否命中当前版本（按弱比较，任一编码的 ETag 都算命中）"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        current = {self.etag(limit), self.etag(limit, compressed=True)}
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            if tag in current:
+                return True
+        return False
+
+    def _serialize(self, limit: int) -> Tuple[str, str]:
+        body = json.dumps({
+            "success": True,
+            "data": {
+                "articles": self.articles[:limit],
+                "stats": self.stats,
+                "timestamp": self.generated_at
+            },
+            "count": len(self.articles)
+        }, ensure_ascii=False)
+        # mtime=0 保证同一内容压缩结果相同
+        compressed = gzip.compress(body.encode("utf-8"), compresslevel=6, mtime=0)
+        return body, base64.b64encode(compressed).decode("ascii")
+
+    def body(self, limit: int, compressed: bool = False) -> str:
+        """
+        响应体
+
+        Args:
+            limit: 返回的文章数（至少 1 篇）
+            compressed: True 时返回 gzip 压缩后的 base64 字符串
+        """
+        limit = self._limit(limit)
+        with self._lock:
+            cached = self._bodies.get(limit)
+            if cached is None:
+                cached = self._serialize(limit)
+                self._bodies[limit] = cached
+                if len(self._bodies) > MAX_CACHED_BODIES:
+                    self._bodies.popitem(last=False)
+            else:
+                self._bodies.move_to_end(limit)
+        return cached[1] if compressed else cached[0]
+
+
+def encode_cursor(key: Tuple[float, str]) -> str:
+    """分页游标：上一页最后一篇文章的排序键，对客户端不透明"""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Raises:
+        ValueError: 游标无效
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        neg_ts, article_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return float(neg_ts), str(article_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"无效的 cursor: {cursor}") from e
+
+
+class ArticleIndex:
+    """
+    所有已保存文章的查询索引（按发布时间从新到旧）
+
+    排序键为 (-发布时间戳, id)，时间范围和游标都通过二分查找定位；
+    按来源、分类筛选时使用各自的位置列表，不扫描无关文章。
+    """
+
+    def __init__(self, articles: Iterable[Dict], version: str):
+        records = []
+        for article in articles:
+            published = parse_pub_date(article.get("created_at", ""))
+            ts = published.timestamp() if published else 0.0
+            records.append(((-ts, article.get("id", "")), article))
+        records.sort(key=lambda record: record[0])
+
+        self.version = version
+        self.keys = [key for key, _ in records]
+        self.articles = [article for _, article in records]
+        self.by_source: Dict[str, List[int]] = {}
+        self.by_category: Dict[str, List[int]] = {}
+        for position, article in enumerate(self.articles):
+            self.by_source.setdefault(article.get("source", ""), []).append(position)
+            self.by_category.setdefault(article.get("category", ""), []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def _candidates(self, start: int, end: int, sources: Sequence[str], categories: Sequence[str]) -> Iterator[int]:
+        """[start, end) 范围内符合来源/分类条件的位置（升序）"""
+        if sources:
+            lists, other, field = [self.by_source.get(s, []) for s in sources], set(categories), "category"
+        elif categories:
+            lists, other, field = [self.by_category.get(c, []) for c in categories], set(), ""
+        else:
+            yield from range(start, end)
+            return
+
+        ranges = [positions[bisect_left(positions, start):bisect_left(positions, end)] for positions in lists]
+        for position in heapq.merge(*ranges):
+            if not other or self.articles[position].get(field, "") in other:
+                yield position
+
+    def query(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        sources: Sequence[str] = (),
+        categories: Sequence[str] = (),
+        cursor: Optional[str] = None,
+        limit: int = 50
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        按条件查询一页文章
+
+        Args:
+            since: 发布时间下限（含）
+            until: 发布时间上限（不含）
+            sources, categories: 来源、分类（任一匹配即可）
+            cursor: 上一页返回的游标
+            limit: 每页条数（不超过 MAX_PAGE_SIZE）
+
+        Returns:
+            (文章列表, 下一页游标)，没有更多时游标为 None
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        # 键按时间从新到旧排列：until 决定起点，since 决定终点
+        start = bisect_left(self.keys, (-until.timestamp(), "")) if until else 0
+        end = bisect_right(self.keys, (-since.timestamp(), "\uffff")) if since else len(self.keys)
+        if cursor:
+            start = max(start, bisect_right(self.keys, decode_cursor(cursor)))
+
+        page = []
+        last = None
+        for position in self._candidates(start, end, sources, categories):
+            if len(page) == limit:
+                return page, encode_cursor(self.keys[last])
+            page.append(self.articles[position])
+            last = position
+        return page, None
+
+
+class ArticleStore:
+    """
+    已保存文章的快照存储
+
+    每次请求只 stat 当天的数据文件（快照和追加日志）：文件未变化时直接返回内存中的快照，
+    变化后（定时任务写入新文章）才重新读取和分析。
+    """
+
+    def __init__(self, analyzer, deduplicator: Optional[StoryDeduplicator] = None):
+        self.analyzer = analyzer
+        # 每天的数据来自多次增量抓取，读取时再合并一次同一报道（已合并的来源保留）
+        self.deduplicator = deduplicator or StoryDeduplicator()
+        self._snapshots: Dict[str, Tuple[Tuple, Snapshot]] = {}
+        self._index: Optional[ArticleIndex] = None
+        # 日期 → (该天各文件的 (路径, mtime, size), 去重、分析后的紧凑记录)
+        self._days: Dict[str, Tuple[List[Tuple[str, int, int]], List[Article]]] = {}
+        self._ranked = RankedIndex(getattr(analyzer, "ranking", None))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat(journal: ArticleJournal) -> List[Tuple[str, int, int]]:
+        """某天的各个文件（快照和日志）及其 (mtime, size)"""
+        files = []
+        for path in journal.paths():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((path, stat.st_mtime_ns, stat.st_size))
+        return files
+
+    @staticmethod
+    def _digest(paths: Iterable[str]) -> str:
+        """文件内容的哈希（分块读取），用作快照版本"""
+        digest = hashlib.blake2b(digest_size=8)
+        for path in paths:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def _day_files(cls) -> Dict[str, List[Tuple[str, int, int]]]:
+        """每个日期的文件及其 (mtime, size)"""
+        return {date_str: cls._stat(ArticleJournal(date_str)) for date_str in dates()}
+
+    def _load_day(self, date_str: str) -> List[Article]:
+        """读取某天的文章：合并同一报道，转为紧凑记录后分析"""
+        articles = {}
+        for article in self.deduplicator.dedupe(list(ArticleJournal(date_str))):
+            # 早期保存的部分文章没有 ID，按链接补上（与抓取器的规则一致）
+            if not article.get("id") and article.get("url"):
+                article["id"] = article_id(article["url"])
+            if article.get("id") not in articles:
+                articles[article.get("id")] = Article.from_dict(article)
+        return self.analyzer.analyze_batch(list(articles.values()))["tweets"]
+
+    def index(self) -> ArticleIndex:
+        """
+        跨所有日期的查询索引
+
+        数据文件没有变化时直接复用；变化时只重新读取、分析文件有变化的日期（按各天文件的 mtime 和大小判断），
+        其余日期沿用上次的记录。同一篇文章出现在多天时保留最新一天的记录。
+        文章经分析器分析后再建索引（分类、热度等字段与快照一致）。
+        索引覆盖全部存档并常驻内存，文章保存为紧凑的 records.Article。
+        """
+        day_files = self._day_files()
+        version = _version(json.dumps(sorted(day_files.items())).encode("utf-8"))
+        if self._index is not None and self._index.version == version:
+            return self._index
+
+        with self._lock:
+            if self._index is not None and self._index.version == version:
+                return self._index
+            days = {}
+            for date_str, files in day_files.items():
+                cached = self._days.get(date_str)
+                days[date_str] = cached if cached and cached[0] == files else (files, self._load_day(date_str))
+            # 已删除的日期随之移出
+            self._days = days
+
+            articles = {}
+            for date_str in sorted(days, reverse=True):
+                for article in days[date_str][1]:
+                    if article.get("id") not in articles:
+                        articles[article.get("id")] = article
+            merged = list(articles.values())
+            # 热度以全部存档中最新的发布时间为参考时间，合并后统一重新计算（只计算热度，不重新分析）
+            for article, hot_score in zip(merged, self._ranked.engine.score_batch(merged)):
+                article["hot_score"] = hot_score
+            self._index = ArticleIndex(merged, version)
+            # 排序索引增量更新：只有新增或排序信号变化的文章重新计算排序键
+            self._ranked.sync(merged)
+            return self._index
+
+    def ranked(self) -> RankedIndex:
+        """跨所有日期的热度排序索引（与 index() 同步更新）"""
+        self.index()
+        return self._ranked
+
+    def _settings(self) -> str:
+        """影响快照内容的设置：分析器版本（特征、分类器）和热度参数"""
+        ranking = getattr(self.analyzer, "ranking", None)
+        return f"{getattr(self.analyzer, 'version', '')}-{ranking.fingerprint() if ranking else ''}"
+
+    def snapshot(self, date: datetime = None) -> Optional[Snapshot]:
+        """
+        某天的快照，没有保存的数据时返回 None
+
+        版本（ETag）由当天文件的内容和分析、热度设置共同决定：数据不变但分类器或热度参数变化时，
+        快照重新生成，客户端缓存的旧 ETag 不再命中。
+        """
+        journal = ArticleJournal.for_date(date)
+        date_str = journal.date
+        files = self._stat(journal)
+        if not files:
+            return None
+        settings = self._settings()
+        key = (settings, tuple(files))
+
+        cached = self._snapshots.get(date_str)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        with self._lock:
+            cached = self._snapshots.get(date_str)
+            if cached and cached[0] == key:
+                return cached[1]
+            snapshot = Snapshot.from_articles(
+                self.deduplicator.dedupe(list(journal)), self.analyzer,
+                version=_version(f"{self._digest(path for path, _, _ in files)}-{settings}".encode("utf-8")),
+                generated_at=datetime.utcfromtimestamp(max(mtime for _, mtime, _ in files) / 1e9).isoformat()
+            )
+            self._snapshots[date_str] = (key, snapshot)
+            return snapshot
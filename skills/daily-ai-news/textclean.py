@@ -0,0 +1,85 @@
+"""文本清理模块 - 流式去除 HTML 标签，得到摘要所需的纯文本"""
+import html as _html
+import re
+
+# 块级标签：前后视为词边界，避免相邻段落的文字粘连
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "figcaption", "figure", "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul"
+}
+
+# 内容不可见的标签
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+# 依次匹配：标签（组 1 为结束标记，组 2 为标签名）、注释、声明、文本（组 3，包括孤立的 "<"）
+_TOKEN = re.compile(
+    r"<(/?)([a-zA-Z][a-zA-Z0-9]*)[^>]*>|<!--.*?(?:-->|$)|<![^>]*>|([^<]+|<)",
+    re.S
+)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_whitespace(text: str) -> str:
+    """合并连续空白（包括 &nbsp; 解码出的不换行空格）"""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def html_to_text(html: str, max_chars: int = 500) -> str:
+    """
+    将 HTML 片段转换为纯文本
+
+    逐个扫描标签和文本片段，块级标签处插入空格（避免 "infrastructure.TQ Ventures" 式粘连），
+    解码 HTML 实体，收集到足够的可见文本后立即停止。
+
+    Args:
+        html: HTML 字符串（如 RSS 的 description）
+        max_chars: 需要的最大可见字符数；0 表示不限制
+
+    Returns:
+        合并空白后的文本，长度不超过 max_chars
+    """
+    if not html:
+        return ""
+
+    # 没有标签和实体时无需扫描
+    if "<" not in html and "&" not in html:
+        text = normalize_whitespace(html)
+        return text[:max_chars] if max_chars else text
+
+    parts = []
+    length = 0
+    # 合并空白后可见文本会变短，多收集一些余量
+    budget = max_chars * 2 if max_chars else 0
+    skipping = None
+
+    for match in _TOKEN.finditer(html):
+        text = match.group(3)
+        if text is not None:
+            if skipping:
+                continue
+            if "&" in text:
+                text = _html.unescape(text)
+            parts.append(text)
+            length += len(text)
+            if budget and length >= budget:
+                break
+            continue
+
+        tag = match.group(2)
+        if tag is None:
+            # 注释或声明
+            continue
+        tag = tag.lower()
+        closing = bool(match.group(1))
+
+        if skipping:
+            if closing and tag == skipping:
+                skipping = None
+        elif tag in SKIP_TAGS and not closing:
+            skipping = tag
+        elif tag in BLOCK_TAGS:
+            parts.append(" ")
+
+    text = normalize_whitespace("".join(parts))
+    return text[:max_chars].rstrip() if max_chars else text
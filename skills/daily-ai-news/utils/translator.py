@@ -2,9 +2,12 @@
 翻译模块 - 为英文标题和摘要提供中文翻译
 """
 import re
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional
 import time
 
+if TYPE_CHECKING:
+    from features import ArticleFeatures
+
 
 class SimpleTranslator:
     """简单翻译器（使用预设规则和词典）"""
@@ -112,10 +115,13 @@ class SimpleTranslator:
 
         return result.strip()
 
-    def translate_news_title(self, title: str) -> str:
-        """翻译新闻标题"""
+    def translate_news_title(self, title: str, features: Optional["ArticleFeatures"] = None) -> str:
+        """翻译新闻标题（传入文章特征时直接使用其中的汉字占比）"""
         # 如果标题主要是中文，不翻译
-        if len([c for c in title if '\u4e00' <= c <= '\u9fff']) > len(title) / 2:
+        if features is not None:
+            if features.mostly_chinese:
+                return title
+        elif len([c for c in title if '\u4e00' <= c <= '\u9fff']) > len(title) / 2:
             return title
 
         # 使用简单翻译
@@ -156,8 +162,14 @@ class MockTranslator:
     """模拟翻译服务 - 生成中文翻译内容用于演示"""
 
     @staticmethod
-    def generate_chinese_translation(title: str, summary: str) -> Dict[str, str]:
-        """生成中文翻译（模拟）"""
+    def generate_chinese_translation(
+        title: str,
+        summary: str,
+        features: Optional["ArticleFeatures"] = None
+    ) -> Dict[str, str]:
+        """生成中文翻译（模拟）；文章特征表明内容已是中文时直接返回原文"""
+        if features is not None and features.mostly_chinese:
+            return {"title_cn": title, "text_cn": summary}
 
         # 标题翻译映射
         title_translations = {
@@ -185,19 +197,20 @@ class MockTranslator:
 
         # 基于关键词生成摘要翻译
         summary_cn = ""
-        if "developer" in title.lower():
+        title_lower = title.lower()
+        if "developer" in title_lower:
             summary_cn = "开发者报告使用 Claude Sonnet 4.5 进行编码任务时生产力显著提升。该模型理解和编写复杂代码的能力大幅提升。"
-        elif "stable diffusion" in title.lower():
+        elif "stable diffusion" in title_lower:
             summary_cn = "Stability AI 发布了 Stable Diffusion 3.0，在图像质量和生成速度方面有显著改进。更新包括文本渲染和构图的新功能。"
-        elif "multimodal" in title.lower():
+        elif "multimodal" in title_lower:
             summary_cn = "最新的基准测试显示，最新的多模态 AI 模型可以在需要同时理解文本、图像和音频的复杂推理任务上匹配或超越人类表现。"
-        elif "cost optimization" in title.lower():
+        elif "cost optimization" in title_lower:
             summary_cn = "新的量化技术使小型语言模型能够达到更大规模模型的效果。这可能普及对强大 AI 的访问。"
-        elif "code execution" in title.lower():
+        elif "code execution" in title_lower:
             summary_cn = "Google 的最新 Gemini 模型现在可以直接执行 Python 代码，为开发者提供数据分析和原型设计的强大工具。"
-        elif "agentic" in title.lower():
+        elif "agentic" in title_lower:
             summary_cn = "研究表明，能够自主规划和执行的智能代理 AI 系统正变得越来越复杂。这种转变可能会改变企业自动化。"
-        elif "elon musk" in title.lower() or "moon" in title.lower():
+        elif "elon musk" in title_lower or "moon" in title_lower:
             summary_cn = "根据《纽约时报》报道，马斯克在内部会议上告诉员工，xAI 需要在月球上建立一个制造设施，在月球上建造 AI 卫星并通过巨型弹弓发射到太空。"
         else:
             summary_cn = "这是 AI 领域的重要进展，展示了人工智能技术的最新突破和发展方向。"